@@ -1,17 +1,45 @@
 """
-Admin endpoints — API key management.
+Admin endpoints — API key management and usage, the clone-detection corpus,
+index snapshots, live-worker profiling and slow-request traces.
 """
-from fastapi import APIRouter, Depends, Path
 
-from app.core.security import verify_admin_key
+import asyncio
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.core import profiling, tracing
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import NDJSON_MEDIA_TYPE, decode_cursor, iter_pages, ndjson, page_of
+from app.core.security import usage_meter, verify_admin_key
+from app.core.usage import period_of
 from app.models.schemas import (
+    AllocationStat,
     APIKeyInfo,
     CreateKeyRequest,
     CreateKeyResponse,
     DeleteKeyResponse,
+    KeyUsage,
+    KeyUsageHistoryResponse,
+    KnownContractInfo,
+    KnownContractRequest,
     ListKeysResponse,
+    ListKnownContractsResponse,
+    ListSnapshotsResponse,
+    MemoryProfileResponse,
+    PaginationMeta,
+    SetQuotaRequest,
+    SlowRequest,
+    SlowRequestsResponse,
+    SnapshotInfo,
+    SnapshotRequest,
+    UsageReportResponse,
 )
 from app.services.apikey_service import APIKeyService
+from app.services.similarity_service import get_similarity_service
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -28,22 +56,52 @@ async def create_key(
     req: CreateKeyRequest,
     _admin: str = Depends(verify_admin_key),
 ):
-    result = _service.create_key(req.name)
-    return CreateKeyResponse(key=result["key"], name=result["name"])
+    result = _service.create_key(req.name, req.monthly_quota)
+    return CreateKeyResponse(key=result["key"], name=result["name"], monthly_quota=result["monthly_quota"])
+
+
+def _key_seq(row: dict) -> int:
+    seq: int = row["seq"]
+    return seq
 
 
 @router.get(
     "/keys",
     response_model=ListKeysResponse,
-    summary="List all API keys",
+    summary="List API keys, one page at a time",
 )
-async def list_keys(_admin: str = Depends(verify_admin_key)):
-    rows = _service.list_keys()
+async def list_keys(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    prefix: str = Query("", max_length=64, description="Only keys starting with this (as logged in key_prefix)"),
+    limit: int = Query(100, ge=1, le=1000),
+    _admin: str = Depends(verify_admin_key),
+):
+    rows = _service.list_keys(decode_cursor(cursor, int), prefix, limit + 1)
+    rows, next_cursor = page_of(rows, limit, _key_seq)
     keys = [
-        APIKeyInfo(key=r["key"], name=r.get("name"), created_at=r.get("created_at"))
+        APIKeyInfo(
+            key=r["key"], name=r.get("name"), created_at=r.get("created_at"), monthly_quota=r.get("monthly_quota")
+        )
         for r in rows
     ]
-    return ListKeysResponse(keys=keys)
+    return ListKeysResponse(keys=keys, pagination=PaginationMeta(limit=limit, next_cursor=next_cursor))
+
+
+@router.get(
+    "/keys/export",
+    summary="Stream every API key as NDJSON",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_keys(
+    prefix: str = Query("", max_length=64, description="Only keys starting with this"),
+    _admin: str = Depends(verify_admin_key),
+):
+    pages = iter_pages(lambda after, n: _service.list_keys(after, prefix, n), _key_seq)
+    return StreamingResponse(
+        ndjson([{k: r[k] for k in ("key", "name", "created_at", "monthly_quota")} for r in page] for page in pages),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
 
 
 @router.delete(
@@ -57,3 +115,231 @@ async def delete_key(
 ):
     ok = _service.delete_key(key)
     return DeleteKeyResponse(deleted=ok)
+
+
+# ── usage & quotas ──
+
+_PERIOD = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _usage_key(row: dict) -> str:
+    key: str = row["key"]
+    return key
+
+
+@router.get(
+    "/usage",
+    response_model=UsageReportResponse,
+    summary="Requests per API key in one month, one page at a time",
+)
+async def usage_report(
+    period: Optional[str] = Query(None, pattern=_PERIOD, description="YYYY-MM (UTC); default the current month"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    _admin: str = Depends(verify_admin_key),
+):
+    # this worker's unflushed counts first; other workers' arrive within USAGE_FLUSH_INTERVAL
+    await asyncio.to_thread(usage_meter.flush)
+    period = period or period_of(time.time())
+    rows, next_cursor = page_of(_service.usage_page(period, decode_cursor(cursor, str), limit + 1), limit, _usage_key)
+    return UsageReportResponse(
+        period=period,
+        usage=[KeyUsage(**r) for r in rows],
+        pagination=PaginationMeta(limit=limit, next_cursor=next_cursor),
+    )
+
+
+@router.get(
+    "/keys/{key}/usage",
+    response_model=KeyUsageHistoryResponse,
+    summary="Monthly usage of one API key",
+)
+async def key_usage(
+    key: str = Path(..., min_length=1),
+    _admin: str = Depends(verify_admin_key),
+):
+    await asyncio.to_thread(usage_meter.flush)
+    return KeyUsageHistoryResponse(**_service.usage_history(key))
+
+
+@router.put(
+    "/keys/{key}/quota",
+    response_model=APIKeyInfo,
+    summary="Set or clear an API key's monthly quota",
+)
+async def set_key_quota(
+    req: SetQuotaRequest,
+    key: str = Path(..., min_length=1),
+    _admin: str = Depends(verify_admin_key),
+):
+    row = _service.set_quota(key, req.monthly_quota)
+    usage_meter.set_quota(key, req.monthly_quota)
+    return APIKeyInfo(**row)
+
+
+# ── clone corpus ──
+
+
+@router.post(
+    "/similarity",
+    response_model=KnownContractInfo,
+    status_code=201,
+    summary="Add a known contract to the clone-detection corpus",
+)
+async def add_known_contract(
+    req: KnownContractRequest,
+    _admin: str = Depends(verify_admin_key),
+):
+    entry = await asyncio.to_thread(get_similarity_service().add, req.kind, req.label, req.content, req.address)
+    return KnownContractInfo(**entry)
+
+
+@router.get(
+    "/similarity",
+    response_model=ListKnownContractsResponse,
+    summary="List the clone-detection corpus",
+)
+async def list_known_contracts(_admin: str = Depends(verify_admin_key)):
+    rows = get_similarity_service().list_all()
+    return ListKnownContractsResponse(contracts=[KnownContractInfo(**r) for r in rows], total=len(rows))
+
+
+@router.delete(
+    "/similarity/{entry_id}",
+    status_code=204,
+    summary="Remove a contract from the clone-detection corpus",
+)
+async def delete_known_contract(
+    entry_id: str = Path(..., min_length=1),
+    _admin: str = Depends(verify_admin_key),
+):
+    if not get_similarity_service().remove(entry_id):
+        raise NotFoundError("Known contract", entry_id)
+
+
+# ── index snapshots ──
+
+
+@router.get(
+    "/index/snapshots",
+    response_model=ListSnapshotsResponse,
+    summary="List index snapshots and the one being served",
+)
+async def list_snapshots(request: Request, _admin: str = Depends(verify_admin_key)):
+    snapshots = await asyncio.to_thread(request.app.state.snapshots.list_snapshots)
+    indexer = getattr(request.app.state, "indexer", None)
+    live = await asyncio.to_thread(lambda: indexer.snapshot_id) if indexer is not None else None
+    return ListSnapshotsResponse(live=live, snapshots=[SnapshotInfo(**m) for m in snapshots])
+
+
+@router.post(
+    "/index/snapshots",
+    response_model=SnapshotInfo,
+    status_code=201,
+    summary="Export a point-in-time snapshot of the live index",
+)
+async def export_snapshot(
+    request: Request,
+    req: Optional[SnapshotRequest] = None,
+    _admin: str = Depends(verify_admin_key),
+):
+    name = req.name if req is not None else None
+    manifest = await asyncio.to_thread(request.app.state.snapshots.export_snapshot, name)
+    return SnapshotInfo(**manifest)
+
+
+@router.post(
+    "/index/snapshots/{name}/load",
+    response_model=SnapshotInfo,
+    summary="Validate a snapshot and swap it in as the live index",
+    description=(
+        "Loads next to the live index, checks checksums, document count, dimension and a smoke query, "
+        "then swaps. Searches already running finish on the old index. 422 if validation fails, "
+        "409 if another load is running."
+    ),
+)
+async def load_snapshot(
+    request: Request,
+    name: str = Path(..., min_length=1, max_length=128),
+    _admin: str = Depends(verify_admin_key),
+):
+    manifest = await asyncio.to_thread(request.app.state.snapshots.load_snapshot, name)
+    return SnapshotInfo(**manifest)
+
+
+# ── profiling ──
+
+
+def _check_duration(seconds: float) -> None:
+    limit = get_settings().PROFILE_MAX_SECONDS
+    if seconds > limit:
+        raise ValidationError(f"seconds must be <= {limit}")
+
+
+@router.get(
+    "/profile/cpu",
+    summary="Capture a time-boxed CPU profile of this worker",
+    description=(
+        "`sampling` samples every thread and returns collapsed stacks (flamegraph.pl / speedscope). "
+        "`cprofile` traces the event-loop thread and returns pstats text, or marshalled stats with `raw=true`."
+    ),
+    response_class=PlainTextResponse,
+)
+async def profile_cpu(
+    seconds: float = Query(5.0, gt=0),
+    mode: Literal["sampling", "cprofile"] = Query("sampling"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Sampling interval"),
+    raw: bool = Query(False, description="cprofile only: return marshalled pstats data"),
+    _admin: str = Depends(verify_admin_key),
+):
+    _check_duration(seconds)
+    if mode == "sampling":
+        return PlainTextResponse(await profiling.capture_sampling(seconds, interval_ms / 1000))
+    body = await profiling.capture_cprofile(seconds, raw=raw)
+    if raw:
+        return Response(body, media_type="application/octet-stream")
+    return PlainTextResponse(body)
+
+
+@router.get(
+    "/profile/memory",
+    response_model=MemoryProfileResponse,
+    summary="Allocations made by this worker during a time window (tracemalloc)",
+)
+async def profile_memory(
+    seconds: float = Query(5.0, gt=0),
+    top: int = Query(50, ge=1, le=1000),
+    frames: int = Query(1, ge=1, le=50, description="Stack depth recorded per allocation"),
+    _admin: str = Depends(verify_admin_key),
+):
+    _check_duration(seconds)
+    stats = await profiling.capture_allocations(seconds, top=top, frames=frames)
+    return MemoryProfileResponse(seconds=seconds, allocations=[AllocationStat(**s) for s in stats])
+
+
+@router.get(
+    "/profile/requests/{request_id}",
+    summary="Fetch the profile of a request sent with `X-Profile: 1`",
+    response_class=PlainTextResponse,
+)
+async def get_request_profile(
+    request_id: str = Path(..., min_length=1),
+    _admin: str = Depends(verify_admin_key),
+):
+    text = profiling.get_request_profile(request_id)
+    if text is None:
+        raise NotFoundError("profile", request_id)
+    return PlainTextResponse(text)
+
+
+@router.get(
+    "/traces/slow",
+    response_model=SlowRequestsResponse,
+    summary="Span trees of this worker's recent requests slower than TRACE_SLOW_MS",
+)
+async def slow_traces(
+    limit: int = Query(50, ge=1, le=1000),
+    _admin: str = Depends(verify_admin_key),
+):
+    requests = [SlowRequest(**r) for r in tracing.slow_requests(limit)]
+    return SlowRequestsResponse(threshold_ms=get_settings().TRACE_SLOW_MS, requests=requests)
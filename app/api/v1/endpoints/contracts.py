@@ -1,24 +1,53 @@
 """
 Contract analysis endpoints.
 """
-from fastapi import APIRouter, Depends, Query
 
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.core.config import get_settings
+from app.core.http_cache import cache_headers, etag, fresh, if_none_match, not_modified, weak
+from app.core.profiling import profiled
+from app.core.responses import trusted
 from app.core.security import verify_api_key
-from app.models.schemas import ContractAnalyzeResponse, ContractRiskAnalysis
+from app.models.schemas import ContractAnalyzeResponse, ContractRiskAnalysis, ImplementationAnalysis
 from app.services.contract_service import ContractService
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
-_service = ContractService()
+
+def _contracts(request: Request) -> ContractService:
+    service: ContractService = request.app.state.contracts
+    return service
+
+
+def _risk(analysis: dict) -> ContractRiskAnalysis:
+    return ContractRiskAnalysis(
+        score=analysis.get("score", 0),
+        findings=analysis.get("findings", []),
+        error=analysis.get("error"),
+        files_scanned=analysis.get("files_scanned", 0),
+        files_skipped=analysis.get("files_skipped", []),
+        cached=analysis.get("cached", False),
+        bytecode=analysis.get("bytecode"),
+        similar=analysis.get("similar", []),
+    )
 
 
 @router.get(
     "/analyze",
     response_model=ContractAnalyzeResponse,
     summary="Analyze a smart contract",
-    description="Fetches source code from Etherscan and runs heuristic risk analysis.",
+    description=(
+        "Fetches source code from Etherscan and runs heuristic risk analysis. "
+        "Unverified contracts fall back to bytecode analysis when RPC_URL is set. "
+        "Send the ETag back in If-None-Match to get a 304 — for verified "
+        "contracts without re-running the analysis."
+    ),
 )
 async def analyze_contract(
+    request: Request,
     address: str = Query(
         ...,
         min_length=42,
@@ -27,14 +56,36 @@ async def analyze_contract(
         examples=["0xdAC17F958D2ee523a2206206994597C13D831ec7"],
     ),
 ):
-    raw = _service.analyze_contract(address)
-    analysis = raw.get("analysis", {})
-    return ContractAnalyzeResponse(
+    cache_control = get_settings().CACHE_CONTROL_ANALYSIS
+    raw = await asyncio.to_thread(profiled(_contracts(request).analyze_contract), address, if_none_match(request) or ())
+    if raw.get("unchanged"):
+        return not_modified(cache_headers(weak(raw["validator"]), cache_control))
+    impl = raw.get("implementation")
+    # built (and validated) once here; FastAPI would validate it again
+    body = ContractAnalyzeResponse(
         address=raw["address"],
         source_available=raw["source_available"],
-        analysis=ContractRiskAnalysis(
-            score=analysis.get("score", 0),
-            findings=analysis.get("findings", []),
-            error=analysis.get("error"),
-        ),
+        analysis=_risk(raw.get("analysis", {})),
+        implementation=ImplementationAnalysis(
+            address=impl["address"],
+            source_available=impl["source_available"],
+            analysis=_risk(impl["analysis"]),
+        )
+        if impl
+        else None,
+    )
+    if body.analysis.error or (body.implementation and body.implementation.analysis.error):
+        return trusted(body)  # not cacheable; a retry may well succeed
+    # unverified contracts have no validator until their bytecode is read — fall back to the body
+    tag = (
+        weak(raw["validator"])
+        if raw.get("validator")
+        else etag(
+            "analysis",
+            body.model_dump(mode="json", exclude={"analysis": {"cached"}, "implementation": {"analysis": {"cached"}}}),
+        )
     )
+    headers = cache_headers(tag, cache_control)
+    if fresh(request, tag):
+        return not_modified(headers)
+    return trusted(body, headers=headers)
@@ -1,28 +1,42 @@
 """
 RAG / document indexing endpoints.
 """
+
+import asyncio
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
+from app.core.config import get_settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.http_cache import cache_headers, etag, fresh, not_modified
+from app.core.pagination import NDJSON_MEDIA_TYPE, decode_cursor, iter_pages, ndjson, page_of
+from app.core.profiling import profiled
+from app.core.responses import trusted
 from app.core.security import verify_api_key
 from app.models.schemas import (
     IndexDocsRequest,
     IndexDocsResponse,
     ListDocsResponse,
     RAGQueryResponse,
-    RAGResult,
 )
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 
 def _get_indexer(request: Request):
-    return request.app.state.indexer
+    indexer = getattr(request.app.state, "indexer", None)
+    if indexer is None:
+        raise ServiceUnavailableError("Document index is warming up", retry_after=5)
+    return indexer
 
 
 @router.get(
     "/search",
     response_model=RAGQueryResponse,
     summary="Semantic search over indexed documents",
+    description="The ETag changes whenever the index does; a matching If-None-Match gets a 304 without searching.",
 )
 async def rag_query(
     request: Request,
@@ -30,9 +44,17 @@ async def rag_query(
     k: int = Query(5, ge=1, le=100, description="Number of results"),
 ):
     indexer = _get_indexer(request)
-    raw = indexer.search(q, k=k)
-    results = [RAGResult(doc_id=doc_id, score=score) for doc_id, score in raw]
-    return RAGQueryResponse(query=q, results=results)
+    # read in a thread: in remote mode every index attribute is a socket round trip
+    version = await asyncio.to_thread(getattr, indexer, "version")
+    headers = cache_headers(etag("search", version, q, k), get_settings().CACHE_CONTROL_SEARCH)
+    if fresh(request, headers["ETag"]):
+        return not_modified(headers)
+    # off the event loop, so cheap routes keep being served while a search embeds and scans
+    raw = await asyncio.to_thread(profiled(indexer.search), q, k)
+    # (str, float) pairs from the index — encoded directly, without a RAGResult per hit
+    return trusted(
+        {"query": q, "results": [{"doc_id": doc_id, "score": score} for doc_id, score in raw]}, headers=headers
+    )
 
 
 @router.post(
@@ -47,18 +69,43 @@ async def index_docs(
     _key: str = Depends(verify_api_key),
 ):
     indexer = _get_indexer(request)
-    count = indexer.add_texts(req.docs, req.ids)
-    return IndexDocsResponse(indexed=count, total_docs=indexer.doc_count)
+    count = await asyncio.to_thread(profiled(indexer.add_texts), req.docs, req.ids)
+    total = await asyncio.to_thread(getattr, indexer, "doc_count")
+    return IndexDocsResponse(indexed=count, total_docs=total)
 
 
 @router.get(
     "/",
     response_model=ListDocsResponse,
-    summary="List all indexed document IDs",
+    summary="List indexed document IDs, one page at a time",
 )
 async def list_docs(
     request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    prefix: str = Query("", max_length=256, description="Only ids starting with this"),
+    limit: int = Query(100, ge=1, le=1000),
+    _key: str = Depends(verify_api_key),
+):
+    indexer = _get_indexer(request)
+    # in a thread: a socket call in remote mode, and the first call after a write may sort the id list
+    rows = await asyncio.to_thread(indexer.list_ids, decode_cursor(cursor, str), prefix, limit + 1)
+    ids, next_cursor = page_of(rows, limit, str)
+    return trusted({"docs": ids, "pagination": {"limit": limit, "next_cursor": next_cursor}})
+
+
+@router.get(
+    "/export",
+    summary="Stream every indexed document ID as NDJSON",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_docs(
+    request: Request,
+    prefix: str = Query("", max_length=256, description="Only ids starting with this"),
     _key: str = Depends(verify_api_key),
 ):
     indexer = _get_indexer(request)
-    return ListDocsResponse(docs=indexer.ids)
+    pages = iter_pages(lambda after, n: indexer.list_ids(after, prefix, n), str)
+    return StreamingResponse(
+        ndjson([{"doc_id": doc_id} for doc_id in page] for page in pages), media_type=NDJSON_MEDIA_TYPE
+    )
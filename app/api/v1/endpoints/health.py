@@ -1,15 +1,16 @@
 """
 Health & readiness probes.
 """
-import time
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 
 from app.core.config import get_settings
 from app.models.schemas import HealthResponse, ReadinessCheck, ReadinessResponse
 
 router = APIRouter(tags=["health"])
 
+HEALTHY = ("ok", "disabled")
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health():
@@ -19,26 +20,30 @@ async def health():
 
 
 @router.get("/readiness", response_model=ReadinessResponse)
-async def readiness(request: Request):
-    """Readiness probe — checks downstream dependencies."""
-    checks = []
-
-    # check indexer is loaded
-    indexer = getattr(request.app.state, "indexer", None)
-    if indexer and indexer.doc_count >= 0:
-        checks.append(ReadinessCheck(name="indexer", status="ok"))
+async def readiness(request: Request, response: Response):
+    """Readiness probe — the health monitor's last round of dependency checks.
+
+    Does no I/O itself. Returns 503 with status "warming" while the index
+    loads in the background or before the first round has finished.
+    """
+    state = request.app.state
+    checks = state.health.snapshot()
+    indexer = getattr(state, "indexer", None)
+    warmup = getattr(state, "warmup_task", None)
+    for check in checks:
+        if check["name"] != "indexer":
+            continue
+        # presence is known here without I/O — don't wait a round for the monitor to notice
+        if indexer is None and warmup is not None and not warmup.done():
+            check["status"] = "warming"
+        elif indexer is not None and check["status"] in ("warming", "unknown"):
+            check["status"] = "ok"
+
+    if any(c["status"] in ("warming", "unknown") for c in checks):
+        overall = "warming"
+        response.status_code = 503
+    elif all(c["status"] in HEALTHY and not c["stale"] for c in checks):
+        overall = "ok"
     else:
-        checks.append(ReadinessCheck(name="indexer", status="down"))
-
-    # check DB connectivity
-    try:
-        from app.repositories.apikey_repository import APIKeyRepository
-        t0 = time.perf_counter()
-        APIKeyRepository().list_all()
-        latency = round((time.perf_counter() - t0) * 1000, 2)
-        checks.append(ReadinessCheck(name="database", status="ok", latency_ms=latency))
-    except Exception:
-        checks.append(ReadinessCheck(name="database", status="down"))
-
-    overall = "ok" if all(c.status == "ok" for c in checks) else "degraded"
-    return ReadinessResponse(status=overall, checks=checks)
+        overall = "degraded"
+    return ReadinessResponse(status=overall, checks=[ReadinessCheck(**c) for c in checks])
@@ -0,0 +1,94 @@
+"""
+Background job endpoints — submit long ingests / batch analyses, then poll.
+"""
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.core.exceptions import ConflictError, NotFoundError
+from app.core.responses import trusted
+from app.core.security import is_admin_key, key_owner, verify_api_key
+from app.models.schemas import (
+    AnalyzeJobRequest,
+    IngestJobRequest,
+    JobResultResponse,
+    JobStatusResponse,
+    JobSubmitResponse,
+)
+from app.services.job_service import JobManager
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _jobs(request: Request) -> JobManager:
+    jobs: JobManager = request.app.state.jobs
+    return jobs
+
+
+def _owned_job(request: Request, job_id: str, key: str) -> dict:
+    job = _jobs(request).get(job_id)
+    # other callers' jobs are indistinguishable from missing ones
+    if job is None or (job["owner"] != key_owner(key) and not is_admin_key(key)):
+        raise NotFoundError("Job", job_id)
+    return job
+
+
+def _submitted(request: Request, response: Response, job: dict) -> JobSubmitResponse:
+    url = str(request.url_for("job_status", job_id=job["id"]).path)
+    response.headers["Location"] = url
+    return JobSubmitResponse(job_id=job["id"], status=job["status"], status_url=url)
+
+
+@router.post(
+    "/ingest",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Queue a document ingest",
+)
+async def submit_ingest(
+    req: IngestJobRequest,
+    request: Request,
+    response: Response,
+    key: str = Depends(verify_api_key),
+):
+    job = _jobs(request).submit("ingest", {"docs": req.docs, "ids": req.ids}, req.priority, key_owner(key))
+    return _submitted(request, response, job)
+
+
+@router.post(
+    "/analyze",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Queue a batch contract analysis",
+)
+async def submit_analyze(
+    req: AnalyzeJobRequest,
+    request: Request,
+    response: Response,
+    key: str = Depends(verify_api_key),
+):
+    job = _jobs(request).submit("analyze", {"addresses": req.addresses}, req.priority, key_owner(key))
+    return _submitted(request, response, job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobStatusResponse,
+    summary="Job status and progress",
+    name="job_status",
+)
+async def job_status(job_id: str, request: Request, key: str = Depends(verify_api_key)):
+    job = _owned_job(request, job_id, key)
+    return JobStatusResponse(job_id=job["id"], **{k: job[k] for k in JobStatusResponse.model_fields if k in job})
+
+
+@router.get(
+    "/{job_id}/result",
+    response_model=JobResultResponse,
+    summary="Result of a finished job",
+)
+async def job_result(job_id: str, request: Request, key: str = Depends(verify_api_key)):
+    job = _owned_job(request, job_id, key)
+    if job["status"] not in ("succeeded", "failed"):
+        raise ConflictError(f"Job is {job['status']}")
+    # batch results can be large; encode the stored JSON as is
+    return trusted({"job_id": job["id"], "status": job["status"], "result": job["result"], "error": job["error"]})
@@ -0,0 +1,77 @@
+"""
+Watchlist endpoints — monitored contracts are re-checked in the background
+and their score changes recorded as events.
+"""
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.security import key_owner, verify_api_key
+from app.models.schemas import (
+    WatchEvent,
+    WatchEventsResponse,
+    WatchlistAddRequest,
+    WatchlistEntry,
+    WatchlistResponse,
+)
+from app.repositories.watchlist_repository import WatchlistRepository
+
+router = APIRouter(prefix="/watchlist", tags=["watchlist"])
+
+
+def _repo(request: Request) -> WatchlistRepository:
+    repo: WatchlistRepository = request.app.state.watchlist_repo
+    return repo
+
+
+@router.post(
+    "",
+    response_model=WatchlistEntry,
+    status_code=201,
+    summary="Watch a contract",
+)
+async def add_entry(req: WatchlistAddRequest, request: Request, key: str = Depends(verify_api_key)):
+    settings = get_settings()
+    interval = req.interval_s or settings.WATCHLIST_DEFAULT_INTERVAL
+    if interval < settings.WATCHLIST_MIN_INTERVAL:
+        raise ValidationError(f"interval_s must be at least {settings.WATCHLIST_MIN_INTERVAL:g}")
+    entry = _repo(request).add(key_owner(key), req.address, req.label, interval)
+    return WatchlistEntry(**entry)
+
+
+@router.get(
+    "",
+    response_model=WatchlistResponse,
+    summary="List watched contracts",
+)
+async def list_entries(request: Request, key: str = Depends(verify_api_key)):
+    return WatchlistResponse(entries=[WatchlistEntry(**e) for e in _repo(request).list_for(key_owner(key))])
+
+
+@router.get(
+    "/events",
+    response_model=WatchEventsResponse,
+    summary="Score changes of watched contracts",
+)
+async def list_events(
+    request: Request,
+    after: int = Query(0, ge=0, description="Return events with a larger id"),
+    limit: int = Query(100, ge=1, le=1000),
+    key: str = Depends(verify_api_key),
+):
+    events = _repo(request).events_for(key_owner(key), after, limit)
+    return WatchEventsResponse(
+        events=[WatchEvent(**e) for e in events],
+        next_after=events[-1]["id"] if events else after,
+    )
+
+
+@router.delete(
+    "/{address}",
+    status_code=204,
+    summary="Stop watching a contract",
+)
+async def remove_entry(address: str, request: Request, key: str = Depends(verify_api_key)):
+    if not _repo(request).remove(key_owner(key), address):
+        raise NotFoundError("Watchlist entry", address)
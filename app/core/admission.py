@@ -0,0 +1,111 @@
+"""
+Admission control — per-route concurrency limits with bounded wait queues.
+
+Routes listed in ADMISSION_LIMITS (by path prefix, longest match wins) get
+a gate: at most ``limit`` of their requests run at once, and at most
+ADMISSION_QUEUE_SIZE more wait for a slot. A request waits no longer than
+its deadline — ``X-Request-Timeout`` seconds if the client sent one, capped
+at ADMISSION_TIMEOUT, which is also the default. Requests that cannot start
+in time get 503 with a Retry-After estimated from the gate's recent service
+time, so a burst of expensive work sheds its own excess instead of
+starving every other route. Unlisted routes (health, metrics, ...) are
+never held.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTIONS, ADMISSION_WAIT
+from app.core.tracing import span
+
+_EWMA = 0.2  # weight of the newest service time in the running estimate
+
+
+class Gate:
+    """``limit`` concurrent requests, ``queue`` more waiting; FIFO."""
+
+    def __init__(self, route: str, limit: int, queue: int) -> None:
+        if limit < 1:
+            raise ValueError(f"admission limit for {route} must be at least 1")
+        self.route = route
+        self.limit = limit
+        self.queue = queue
+        self.running = 0
+        self.waiting = 0
+        self.service_time = 0.0  # EWMA of seconds per admitted request
+        self._slots = asyncio.Semaphore(limit)
+        self._in_flight = ADMISSION_IN_FLIGHT.labels(route)
+        self._queued = ADMISSION_QUEUED.labels(route)
+        self._wait = ADMISSION_WAIT.labels(route)
+
+    def retry_after(self) -> int:
+        """Seconds until the requests ahead of a new one have likely drained."""
+        return max(1, math.ceil(self.service_time * (self.waiting + 1) / self.limit))
+
+    def _shed(self, reason: str) -> ServiceUnavailableError:
+        ADMISSION_REJECTIONS.labels(self.route, reason).inc()
+        return ServiceUnavailableError(
+            f"Too many concurrent requests for {self.route}; try again later", retry_after=self.retry_after()
+        )
+
+    async def _acquire(self, timeout: float) -> None:
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return
+        if self.waiting >= self.queue:
+            raise self._shed("queue_full")
+        self.waiting += 1
+        self._queued.inc()
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except TimeoutError:
+            raise self._shed("deadline") from None
+        finally:
+            self.waiting -= 1
+            self._queued.dec()
+            self._wait.observe(time.perf_counter() - t0)
+
+    @asynccontextmanager
+    async def admit(self, timeout: float) -> AsyncIterator[None]:
+        """Hold a slot for the block; raises ServiceUnavailableError if none frees up within ``timeout``."""
+        with span("admission_wait"):
+            await self._acquire(timeout)
+        self.running += 1
+        self._in_flight.inc()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self.service_time = (
+                elapsed if not self.service_time else (_EWMA * elapsed + (1 - _EWMA) * self.service_time)
+            )
+            self.running -= 1
+            self._in_flight.dec()
+            self._slots.release()
+
+
+class AdmissionController:
+    """The gates for one app, looked up by request path."""
+
+    def __init__(self, limits: Dict[str, int], queue: int = 16, timeout: float = 5.0) -> None:
+        self.timeout = timeout
+        self.gates = {route: Gate(route, limit, queue) for route, limit in limits.items()}
+        self._order = sorted(self.gates, key=len, reverse=True)
+
+    def gate_for(self, path: str) -> Optional[Gate]:
+        for route in self._order:
+            if path.startswith(route):
+                return self.gates[route]
+        return None
+
+    def deadline(self, requested: Optional[float]) -> float:
+        """Longest a request may wait: the client's timeout, never more than the server's."""
+        if requested is None:
+            return self.timeout
+        return max(0.0, min(requested, self.timeout))
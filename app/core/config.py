@@ -2,8 +2,9 @@
 Centralized configuration via pydantic-settings.
 All env vars are validated at startup — fail fast on misconfiguration.
 """
+
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -40,21 +41,126 @@ class Settings(BaseSettings):
     RATE_LIMIT_CALLS: int = 120
     RATE_LIMIT_PERIOD: int = 60
 
+    # --- API-key usage ---
+    # requests per key per calendar month (UTC) for keys without their own quota; 0 is unlimited
+    API_KEY_MONTHLY_QUOTA: int = 0
+    USAGE_FLUSH_INTERVAL: float = 5.0  # seconds between write-behind flushes of the usage counters
+
+    # --- Admission control ---
+    # concurrent requests per route (path prefix, longest match wins); unlisted routes are never held
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: Dict[str, int] = {"/api/v1/contracts/analyze": 2, "/api/v1/documents/search": 4}
+    ADMISSION_QUEUE_SIZE: int = 16  # requests waiting per gated route before new ones are shed
+    ADMISSION_TIMEOUT: float = 5.0  # longest wait for a slot; X-Request-Timeout may shorten it
+
+    # --- HTTP caching ---
+    # Cache-Control for responses that carry an ETag; everything else, and all
+    # of /api/v1/admin, is sent with no-store
+    CACHE_CONTROL_ANALYSIS: str = "public, max-age=300"
+    CACHE_CONTROL_SEARCH: str = "public, max-age=60"
+
     # --- Database ---
     APIKEY_DB_PATH: str = "./data/apikeys.db"
 
     # --- External APIs ---
     ETHERSCAN_API_KEY: Optional[str] = None
-    RPC_URL: str = "https://mainnet.infura.io/v3/YOUR_INFURA_KEY"
+    ETHERSCAN_API_URL: str = "https://api.etherscan.io/api"
+    RPC_URL: Optional[str] = None  # JSON-RPC endpoint; enables bytecode analysis of unverified contracts
+    RPC_TIMEOUT: float = 10.0
+    PROXY_CACHE_TTL: float = 300.0  # proxy → implementation lookups; upgrades are rare
     OPENAI_API_KEY: Optional[str] = None
 
+    # --- Analysis cache ---
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_DB_PATH: str = "./data/analysis_cache.db"
+    ANALYSIS_CACHE_MEMORY_SIZE: int = 1024  # per-worker LRU entries in front of SQLite
+    KNOWN_LIBRARIES_PATH: Optional[str] = None  # library file hashes to skip; None = bundled table
+    SELECTOR_TABLE_PATH: Optional[str] = None  # selector → signature table; None = bundled table
+
+    # --- Clone detection ---
+    SIMILARITY_ENABLED: bool = True
+    SIMILARITY_DB_PATH: str = "./data/similarity.db"
+    SIMILARITY_NUM_PERM: int = 128  # MinHash bins; power of two
+    SIMILARITY_BANDS: int = 32  # LSH bands; 32 × 4 rows finds pairs above ~0.42 Jaccard
+    SIMILARITY_SHINGLE_SIZE: int = 5  # words (sources) or opcodes (bytecode) per shingle
+    SIMILARITY_THRESHOLD: float = 0.5  # smallest estimated Jaccard reported as a match
+    SIMILARITY_TOP_K: int = 3
+    SIMILARITY_REFRESH_SECONDS: float = 30.0  # how often workers look for corpus changes
+
+    # --- Background jobs ---
+    JOB_DB_PATH: str = "./data/jobs.db"
+    JOB_INGEST_CONCURRENCY: int = 1  # index writes serialise anyway
+    JOB_ANALYZE_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL: float = 1.0  # picks up jobs queued by other worker processes
+    JOB_STALE_SECONDS: float = 60.0  # running jobs without a heartbeat this long are requeued
+    JOB_MAX_ATTEMPTS: int = 3  # a job whose worker died this many times is failed, not requeued; 0 = no limit
+    JOB_INGEST_BATCH: int = 10000  # docs per ingest checkpoint; each batch persists the index once
+
+    # --- Watchlist ---
+    WATCHLIST_ENABLED: bool = True
+    WATCHLIST_DB_PATH: str = "./data/watchlist.db"
+    WATCHLIST_DEFAULT_INTERVAL: float = 3600.0  # seconds between re-checks of one contract
+    WATCHLIST_MIN_INTERVAL: float = 300.0
+    WATCHLIST_JITTER: float = 0.2  # ± fraction of the interval, spreads re-checks over time
+    WATCHLIST_RATE: float = 1.0  # re-check budget across all entries and WORKERS (checks/s)
+    WATCHLIST_BATCH: int = 50  # entries fingerprinted per RPC batch
+    WATCHLIST_VERIFY_INTERVAL: float = 86400.0  # how often unverified contracts are re-checked on Etherscan
+    WATCHLIST_WEBHOOK_URL: Optional[str] = None  # POST target for score-change events
+
     # --- Embeddings / Vector Store ---
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "auto"  # auto | openai | sentence | onnx | int8 | tfidf | hash
+    EMBEDDING_HASH_DIM: int = 256  # dimension of the feature-hashing backend
+    EMBEDDING_MODEL_DIR: Optional[str] = (
+        None  # local model directory; replaces EMBEDDING_MODEL for sentence / onnx / int8
+    )
+    EMBEDDING_THREADS: int = 0  # inference threads; 0 = sized to the container's CPU quota
+    EMBEDDING_BATCH_SIZE: int = 32  # onnx / int8: max texts per forward pass
+    EMBEDDING_BATCH_TOKENS: int = 8192  # onnx / int8: max padded tokens per forward pass
+    # new indexes only — an index keeps the projection it was built with
+    EMBEDDING_PROJECTION: str = "none"  # none | pca | truncate (Matryoshka models)
+    EMBEDDING_PROJECTION_DIM: int = 256
+    EMBEDDING_PROJECTION_FIT_MIN: int = 1000  # pca: vectors stored full-size until this many exist
+    EMBEDDING_PROJECTION_SAMPLE: int = 20000  # pca: max vectors the fit uses
+    EMBEDDING_POOL_WORKERS: int = 0  # bulk-ingest embedding processes; 0 = one per whole CPU of quota, 1 = off
+    EMBEDDING_POOL_MIN_TEXTS: int = 1024  # smallest add_texts call that is spread over the pool
+    EMBEDDING_POOL_CHUNK: int = 256  # texts per pool task
     FAISS_INDEX_PATH: str = "./data/faiss.index"
+    INDEX_MODE: str = "local"  # local | remote (shared index-server process)
+    INDEX_SERVER_SOCKET: str = "./data/index.sock"
+    INDEX_SERVER_TIMEOUT: float = 30.0  # per-call socket timeout (s)
+    INDEX_SERVER_WAIT: float = 120.0  # how long workers wait for the server at startup (s)
+    INDEX_SNAPSHOT_DIR: str = "./data/snapshots"
+    INDEX_SNAPSHOT_WATCH: bool = False  # hot-load the newest snapshot dropped into INDEX_SNAPSHOT_DIR
+    INDEX_SNAPSHOT_POLL: float = 10.0  # seconds between checks for a new snapshot
 
     # --- Logging ---
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"  # json | text
+    LOG_ASYNC: bool = False  # format + write on a background thread
+    LOG_QUEUE_SIZE: int = 10_000  # records buffered before dropping
+    LOG_SAMPLE_RATE: float = 1.0  # fraction of INFO/DEBUG records kept
+
+    # --- Request tracing ---
+    TRACE_ENABLED: bool = True  # per-request spans for Server-Timing and slow-request capture
+    SERVER_TIMING_ENABLED: bool = True  # send the span breakdown to clients in Server-Timing
+    TRACE_SLOW_MS: float = 1000.0  # requests at least this slow keep their span tree
+    TRACE_BUFFER_SIZE: int = 200  # slow requests kept per worker, oldest dropped first
+
+    # --- Health monitor ---
+    HEALTH_CHECK_INTERVAL: float = 10.0  # seconds between rounds of dependency checks
+    HEALTH_CHECK_TIMEOUT: float = 2.0  # per-probe timeout (SQLite busy wait, HTTP)
+    HEALTH_STALE_AFTER: float = 30.0  # results older than this are reported stale
+    HEALTH_HISTORY_SIZE: int = 20  # latencies kept per check
+
+    # --- Metrics ---
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # shared dir when running >1 worker
+
+    # --- Profiling ---
+    PROFILING_ENABLED: bool = False  # X-Profile per-request capture (admin-only); idle cost is one header check
+    PROFILE_MAX_SECONDS: float = 60.0
+    PROFILE_STORE_SIZE: int = 20  # per-request profiles kept for retrieval
 
     @field_validator("ENVIRONMENT")
     @classmethod
@@ -64,6 +170,30 @@ class Settings(BaseSettings):
             raise ValueError(f"ENVIRONMENT must be one of {allowed}")
         return v
 
+    @field_validator("EMBEDDING_BACKEND")
+    @classmethod
+    def validate_embedding_backend(cls, v: str) -> str:
+        allowed = {"auto", "openai", "sentence", "onnx", "int8", "tfidf", "hash"}
+        if v not in allowed:
+            raise ValueError(f"EMBEDDING_BACKEND must be one of {allowed}")
+        return v
+
+    @field_validator("EMBEDDING_PROJECTION")
+    @classmethod
+    def validate_embedding_projection(cls, v: str) -> str:
+        allowed = {"none", "pca", "truncate"}
+        if v not in allowed:
+            raise ValueError(f"EMBEDDING_PROJECTION must be one of {allowed}")
+        return v
+
+    @field_validator("INDEX_MODE")
+    @classmethod
+    def validate_index_mode(cls, v: str) -> str:
+        allowed = {"local", "remote"}
+        if v not in allowed:
+            raise ValueError(f"INDEX_MODE must be one of {allowed}")
+        return v
+
     @field_validator("LOG_LEVEL")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -73,6 +203,20 @@ class Settings(BaseSettings):
             raise ValueError(f"LOG_LEVEL must be one of {allowed}")
         return v
 
+    @field_validator("SIMILARITY_NUM_PERM")
+    @classmethod
+    def validate_similarity_num_perm(cls, v: int) -> int:
+        if v < 2 or v & (v - 1):
+            raise ValueError("SIMILARITY_NUM_PERM must be a power of two")
+        return v
+
+    @field_validator("LOG_SAMPLE_RATE")
+    @classmethod
+    def validate_log_sample_rate(cls, v: float) -> float:
+        if not 0.0 < v <= 1.0:
+            raise ValueError("LOG_SAMPLE_RATE must be in (0, 1]")
+        return v
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -3,7 +3,8 @@ Structured exception hierarchy for the API.
 All business exceptions inherit from AstraBlockError so they can be caught
 by the global error handler and serialised into a consistent envelope.
 """
-from typing import Any, Optional
+
+from typing import Any, Dict, Optional
 
 
 class AstraBlockError(Exception):
@@ -15,11 +16,13 @@ class AstraBlockError(Exception):
         status_code: int = 500,
         error_code: str = "INTERNAL_ERROR",
         details: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
         self.details = details
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -60,6 +63,15 @@ class AuthorizationError(AstraBlockError):
         )
 
 
+class ConflictError(AstraBlockError):
+    def __init__(self, message: str = "Resource is busy or in a conflicting state"):
+        super().__init__(
+            message=message,
+            status_code=409,
+            error_code="CONFLICT",
+        )
+
+
 class RateLimitError(AstraBlockError):
     def __init__(self, message: str = "Rate limit exceeded"):
         super().__init__(
@@ -69,6 +81,16 @@ class RateLimitError(AstraBlockError):
         )
 
 
+class QuotaExceededError(AstraBlockError):
+    def __init__(self, message: str = "Monthly request quota exhausted", retry_after: Optional[int] = None):
+        super().__init__(
+            message=message,
+            status_code=429,
+            error_code="QUOTA_EXCEEDED",
+            headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+        )
+
+
 class ExternalServiceError(AstraBlockError):
     def __init__(self, service: str = "external service", message: str = ""):
         super().__init__(
@@ -76,3 +98,13 @@ class ExternalServiceError(AstraBlockError):
             status_code=502,
             error_code="EXTERNAL_SERVICE_ERROR",
         )
+
+
+class ServiceUnavailableError(AstraBlockError):
+    def __init__(self, message: str = "Service temporarily unavailable", retry_after: Optional[int] = None):
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code="SERVICE_UNAVAILABLE",
+            headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+        )
@@ -0,0 +1,53 @@
+"""
+HTTP caching — ETags, conditional requests and per-route Cache-Control.
+
+Responses are ``no-store`` unless an endpoint opts in (see
+SecurityHeadersMiddleware). Endpoints that do derive a weak ETag from what
+determines their result — source hashes and rule set for analysis, the
+index version for search — so a matching ``If-None-Match`` is answered with
+a bodiless 304 before any of the expensive work runs.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Set
+
+from fastapi import Request, Response
+
+
+def weak(value: str) -> str:
+    """Weak ETag for ``value``; equal results may differ byte-for-byte (e.g. the ``cached`` flag)."""
+    return f'W/"{value}"'
+
+
+def etag(*parts: Any) -> str:
+    """Weak ETag over ``parts``."""
+    return weak(hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()[:32])
+
+
+def opaque(tag: str) -> str:
+    """The quoted value of an ETag without its weakness prefix — what weak comparison compares."""
+    return tag.strip().removeprefix("W/").strip('"')
+
+
+def if_none_match(request: Request) -> Optional[Set[str]]:
+    """Opaque tags from If-None-Match; None without the header, ``{"*"}`` for a wildcard."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    return {opaque(tag) for tag in header.split(",") if tag.strip()}
+
+
+def fresh(request: Request, tag: str) -> bool:
+    """True when the client's copy matches ``tag`` (RFC 9110 weak comparison)."""
+    tags = if_none_match(request)
+    return tags is not None and ("*" in tags or opaque(tag) in tags)
+
+
+def cache_headers(tag: str, cache_control: str) -> Dict[str, str]:
+    return {"ETag": tag, "Cache-Control": cache_control}
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """304 carrying the validator and caching policy a 200 would have had."""
+    return Response(status_code=304, headers=headers)
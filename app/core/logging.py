@@ -1,19 +1,56 @@
 """
 Structured JSON logging with correlation/request IDs.
+
+Optionally runs formatting and stream I/O on a background thread
+(QueueHandler → QueueListener) so a slow stdout never stalls the event loop.
 """
-import logging
+
+import copy
 import json
+import logging
+import queue
+import random
 import sys
-from datetime import datetime, timezone
+import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from app.core.tracing import REQUEST_ID_CTX
+
+# Optional fast JSON encoder — falls back to the stdlib
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: dict) -> str:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """Outputs each log record as a single JSON line — 12-factor friendly."""
 
+    def __init__(self):
+        super().__init__()
+        self._ts_second = -1
+        self._ts_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        # strftime once per second; the fraction is cheap string formatting
+        sec = int(created)
+        if sec != self._ts_second:
+            self._ts_second = sec
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        return f"{self._ts_prefix}.{int((created - sec) * 1_000_000):06d}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -22,8 +59,9 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
         # attach request_id if present
-        if hasattr(record, "request_id"):
-            log_entry["request_id"] = record.request_id
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            log_entry["request_id"] = request_id
         # attach extra fields
         if hasattr(record, "extra_data"):
             log_entry["data"] = record.extra_data
@@ -33,7 +71,7 @@ class JSONFormatter(logging.Formatter):
                 "type": type(record.exc_info[1]).__name__,
                 "message": str(record.exc_info[1]),
             }
-        return json.dumps(log_entry, default=str)
+        return _dumps(log_entry)
 
 
 class TextFormatter(logging.Formatter):
@@ -43,8 +81,68 @@ class TextFormatter(logging.Formatter):
         super().__init__(fmt=self.FMT)
 
 
-def configure_logging(level: str = "INFO", fmt: str = "json") -> None:
+class RequestContextFilter(logging.Filter):
+    """Stamps the current request ID onto every record.
+
+    Must run on the emitting thread — the context var is not visible from
+    the queue listener thread.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "request_id", None):
+            record.request_id = REQUEST_ID_CTX.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO-and-below records; WARNING+ always pass."""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Non-blocking QueueHandler: drops (and counts) records when the queue is full."""
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]"):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args here; the listener thread does the real formatting.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "json",
+    async_queue: bool = False,
+    queue_size: int = 10_000,
+    sample_rate: float = 1.0,
+) -> None:
     """Configure root logger. Call once at startup."""
+    global _listener, _queue_handler
+
+    shutdown_logging()
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
@@ -56,12 +154,45 @@ def configure_logging(level: str = "INFO", fmt: str = "json") -> None:
         handler.setFormatter(JSONFormatter())
     else:
         handler.setFormatter(TextFormatter())
-    root.addHandler(handler)
+
+    if async_queue:
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = QueueListener(_queue_handler.queue, handler, respect_handler_level=True)
+        _listener.start()
+        front: logging.Handler = _queue_handler
+    else:
+        front = handler
+
+    front.addFilter(SamplingFilter(sample_rate))
+    front.addFilter(RequestContextFilter())
+    root.addHandler(front)
 
     # silence noisy libraries
     for name in ("uvicorn.access", "uvicorn.error", "asyncio", "httpcore", "httpx"):
         logging.getLogger(name).setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush and stop the background listener, falling back to synchronous output."""
+    global _listener, _queue_handler
+    if _listener is None or _queue_handler is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    if _queue_handler in root.handlers:
+        handler = _listener.handlers[0]
+        for f in _queue_handler.filters:
+            handler.addFilter(f)
+        root.removeHandler(_queue_handler)
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
+
+
+def dropped_log_records() -> int:
+    """Number of records discarded because the log queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"astra.{name}")
@@ -0,0 +1,199 @@
+"""
+Prometheus metrics — request / stage latency histograms, cache and limiter counters.
+
+Multi-worker deployments set METRICS_MULTIPROC_DIR: it is exported as
+PROMETHEUS_MULTIPROC_DIR before prometheus_client is imported, so every
+worker writes its samples to per-PID mmap files that /metrics aggregates.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from app.core.config import get_settings
+from app.core.logging import dropped_log_records
+from app.core.tracing import span
+
+_settings = get_settings()
+MULTIPROC_DIR = _settings.METRICS_MULTIPROC_DIR
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily  # noqa: E402
+
+# CONTENT_TYPE_LATEST is re-exported so callers never import prometheus_client before this module does
+__all__ = [
+    "ADMISSION_IN_FLIGHT",
+    "ADMISSION_QUEUED",
+    "ADMISSION_REJECTIONS",
+    "ADMISSION_WAIT",
+    "CACHE_REQUESTS",
+    "CONTENT_TYPE_LATEST",
+    "INDEX_DOCUMENTS",
+    "INDEX_MEMORY_BYTES",
+    "MULTIPROC_DIR",
+    "RATE_LIMIT_REJECTIONS",
+    "REQUEST_COUNT",
+    "REQUEST_LATENCY",
+    "STAGE_LATENCY",
+    "mark_worker_dead",
+    "record_cache",
+    "render_metrics",
+    "stage_timer",
+]
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ── HTTP ──
+
+REQUEST_COUNT = Counter(
+    "astra_http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "astra_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+# ── internal stages ──
+
+STAGE_LATENCY = Histogram(
+    "astra_stage_duration_seconds",
+    "Latency of internal stages (embed, faiss_search, persist, etherscan_fetch, ...)",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+# ── caches / limiter ──
+
+CACHE_REQUESTS = Counter(
+    "astra_cache_requests_total",
+    "Cache lookups by cache name and result (hit | miss)",
+    ["cache", "result"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "astra_rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+)
+
+# ── admission control ──
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "astra_admission_in_flight",
+    "Requests holding an admission slot, by gated route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "astra_admission_queued",
+    "Requests waiting for an admission slot, by gated route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "astra_admission_wait_seconds",
+    "Time queued requests waited for an admission slot",
+    ["route"],
+    buckets=_LATENCY_BUCKETS,
+)
+ADMISSION_REJECTIONS = Counter(
+    "astra_admission_rejections_total",
+    "Requests shed by admission control, by gated route and reason (queue_full | deadline)",
+    ["route", "reason"],
+)
+
+# ── index ──
+
+INDEX_DOCUMENTS = Gauge(
+    "astra_index_documents",
+    "Documents held by the vector index",
+    multiprocess_mode="livemax",
+)
+INDEX_MEMORY_BYTES = Gauge(
+    "astra_index_memory_bytes",
+    "Approximate memory held by stored vectors",
+    multiprocess_mode="livemax",
+)
+
+# labelled children are cached so the hot path skips the labels() lock
+_stage_children: Dict[str, Histogram] = {}
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time a block and record it under ``astra_stage_duration_seconds{stage=...}`` and as a request span."""
+    child = _stage_children.get(stage)
+    if child is None:
+        child = _stage_children.setdefault(stage, STAGE_LATENCY.labels(stage))
+    t0 = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    finally:
+        child.observe(time.perf_counter() - t0)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class _DerivedCollector:
+    """Scrape-time values: cache hit ratios and process-local log drops."""
+
+    def __init__(self, source) -> None:
+        self._source = source
+
+    def collect(self):
+        hits: Dict[str, float] = {}
+        totals: Dict[str, float] = {}
+        for family in self._source.collect():
+            if family.name != "astra_cache_requests":
+                continue
+            for sample in family.samples:
+                if not sample.name.endswith("_total"):
+                    continue
+                cache = sample.labels["cache"]
+                totals[cache] = totals.get(cache, 0.0) + sample.value
+                if sample.labels["result"] == "hit":
+                    hits[cache] = hits.get(cache, 0.0) + sample.value
+        ratio = GaugeMetricFamily("astra_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for cache, total in totals.items():
+            ratio.add_metric([cache], hits.get(cache, 0.0) / total if total else 0.0)
+        yield ratio
+
+        dropped = CounterMetricFamily("astra_log_records_dropped", "Log records dropped because the log queue was full")
+        dropped.add_metric([], dropped_log_records())
+        yield dropped
+
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition for this process (or all workers in multiprocess mode)."""
+    if MULTIPROC_DIR:
+        source = CollectorRegistry()
+        multiprocess.MultiProcessCollector(source)
+    else:
+        source = REGISTRY
+    derived = CollectorRegistry()
+    derived.register(_DerivedCollector(source))
+    return generate_latest(source) + generate_latest(derived)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,224 @@
+"""
+On-demand profiling of the live worker.
+
+Nothing here runs until an admin asks for it: a time-boxed sampling or
+cProfile capture, a tracemalloc allocation snapshot, or a single request
+profiled via the X-Profile header. Only one session runs at a time.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from app.core.exceptions import ConflictError
+
+_session_lock = threading.Lock()
+
+# request_id → pstats text, oldest evicted first
+_request_profiles: "OrderedDict[str, str]" = OrderedDict()
+_request_profiles_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})".replace(";", ":")
+
+
+def _acquire_session() -> None:
+    if not _session_lock.acquire(blocking=False):
+        raise ConflictError("A profiling session is already running")
+
+
+# ── CPU ──
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> str:
+    """Sample every thread's stack for ``seconds``; returns collapsed stacks.
+
+    Output is one ``thread;outer;...;inner count`` line per unique stack —
+    the input format of flamegraph.pl / speedscope.
+    """
+    me = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack: List[str] = []
+            f: Optional[FrameType] = frame
+            while f is not None:
+                stack.append(_frame_label(f))
+                f = f.f_back
+            stack.append(names.get(ident, str(ident)).replace(";", ":"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return "\n".join(f"{stack} {n}" for stack, n in counts.most_common()) + "\n"
+
+
+async def capture_sampling(seconds: float, interval: float = 0.005) -> str:
+    _acquire_session()
+    try:
+        return await asyncio.to_thread(sample_stacks, seconds, interval)
+    finally:
+        _session_lock.release()
+
+
+def _pstats_text(source: "cProfile.Profile | pstats.Stats", limit: int = 80) -> str:
+    buf = io.StringIO()
+    pstats.Stats(stream=buf).add(source).sort_stats("cumulative").print_stats(limit)
+    return buf.getvalue()
+
+
+async def capture_cprofile(seconds: float, raw: bool = False) -> bytes:
+    """cProfile the event-loop thread for ``seconds``.
+
+    Covers every async handler served meanwhile; sync handlers running in
+    the threadpool are only visible to the sampling mode. ``raw`` returns
+    marshalled stats loadable by pstats / snakeviz / flameprof.
+    """
+    _acquire_session()
+    try:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            prof.disable()
+    finally:
+        _session_lock.release()
+    if raw:
+        prof.create_stats()
+        return marshal.dumps(prof.stats)
+    return _pstats_text(prof).encode()
+
+
+# ── memory ──
+
+
+async def capture_allocations(seconds: float, top: int = 50, frames: int = 1) -> List[Dict]:
+    """Allocations made during the window, largest first.
+
+    Starts tracemalloc for the window unless it is already tracing, so the
+    tracing overhead only exists while a capture is running.
+    """
+    _acquire_session()
+    started = False
+    try:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            started = True
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+        _session_lock.release()
+
+    key = "traceback" if frames > 1 else "lineno"
+    stats = after.compare_to(before, key)[:top]
+    return [
+        {
+            "traceback": [f"{fr.filename}:{fr.lineno}" for fr in s.traceback],
+            "size_kb": round(s.size_diff / 1024, 2),
+            "count": s.count_diff,
+        }
+        for s in stats
+    ]
+
+
+# ── per-request ──
+
+
+def _store_request_profile(request_id: str, text: str, limit: int) -> None:
+    with _request_profiles_lock:
+        _request_profiles[request_id] = text
+        while len(_request_profiles) > limit:
+            _request_profiles.popitem(last=False)
+
+
+def get_request_profile(request_id: str) -> Optional[str]:
+    with _request_profiles_lock:
+        return _request_profiles.get(request_id)
+
+
+T = TypeVar("T")  # not PEP 695 syntax (UP047): requires-python still includes 3.11
+
+
+class RequestProfiler:
+    """cProfile the worker-thread calls of one request; a no-op if another session is running.
+
+    Only calls wrapped with ``profiled`` are recorded, each under a profiler
+    enabled in the thread that runs it, so coroutines of other requests
+    interleaving on the event loop stay out of the result. On Python 3.12+
+    cProfile hooks every thread while it is enabled, so work other threads
+    do during those calls can show up as well.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Optional[pstats.Stats] = None
+        self._stats_lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def start(self) -> bool:
+        if not _session_lock.acquire(blocking=False):
+            return False
+        self._token = _REQUEST_PROFILER.set(self)
+        return True
+
+    def runcall(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # 3.12+: another call of this request is already being profiled
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.disable()
+            with self._stats_lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(prof)
+                else:
+                    self._stats.add(prof)
+
+    def stop(self, request_id: str, store_size: int) -> None:
+        if self._token is None:
+            return
+        _REQUEST_PROFILER.reset(self._token)
+        self._token = None
+        _session_lock.release()
+        if self._stats is None:
+            text = "No worker-thread work was recorded for this request.\n"
+        else:
+            text = _pstats_text(self._stats)
+        _store_request_profile(request_id, text, store_size)
+
+
+_REQUEST_PROFILER: contextvars.ContextVar[Optional[RequestProfiler]] = contextvars.ContextVar(
+    "request_profiler", default=None
+)
+
+
+def profiled(fn: Callable[..., T]) -> Callable[..., T]:  # noqa: UP047
+    """``fn``, recorded into the current request's profile when one is being taken.
+
+    Wrap the calls a request hands to worker threads; outside a profiled
+    request this is one context-variable lookup.
+    """
+    profiler = _REQUEST_PROFILER.get()
+    return fn if profiler is None else functools.partial(profiler.runcall, fn)
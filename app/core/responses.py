@@ -0,0 +1,69 @@
+"""
+JSON responses serialised in one pass.
+
+FastAPI validates whatever an endpoint returns against its
+``response_model`` before serialising it — for models the endpoint just
+built from internal data that is a second validation of the same values.
+``trusted()`` wraps such a model in a ready-rendered response, which FastAPI
+passes through untouched; ``response_model`` still documents the schema.
+Large results can skip model construction altogether and pass plain dicts
+shaped like the response model, which orjson encodes directly.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.tracing import span
+
+# Optional fast JSON encoder — falls back to the stdlib
+try:
+    import orjson
+
+    def _dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+except Exception:
+
+    def _dumps(content: Any) -> bytes:
+        return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return str(obj)  # datetimes (stdlib path), Decimal, UUID, ...
+
+
+@lru_cache(maxsize=256)
+def _adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def dump_json(content: Any) -> bytes:
+    """Models go through their pre-built pydantic serializer; anything else through orjson."""
+    if isinstance(content, BaseModel):
+        return _adapter(type(content)).dump_json(content)
+    return _dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class — same output as ``JSONResponse``, rendered by pydantic-core/orjson."""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return dump_json(content)
+
+
+def trusted(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """Response for content built from trusted internal data; skips response_model validation.
+
+    ``content`` is a model or a dict with exactly the response model's
+    fields. Returning a Response bypasses the route's ``status_code``, so
+    pass it here.
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -2,29 +2,44 @@
 Authentication & authorization utilities.
 Provides FastAPI dependency functions for API-key verification.
 """
+
+import hashlib
 import secrets
 from typing import Optional
 
 from fastapi import Header
 
 from app.core.config import get_settings
-from app.core.exceptions import AuthenticationError, AuthorizationError
+from app.core.exceptions import AuthenticationError, AuthorizationError, QuotaExceededError
+from app.core.metrics import stage_timer
+from app.core.tracing import span
+from app.core.usage import UsageMeter
 from app.repositories.apikey_repository import APIKeyRepository
 
 
 _repo = APIKeyRepository()
+usage_meter = UsageMeter(_repo)
 
 
 def verify_api_key(x_api_key: Optional[str] = Header(None, alias="X-API-Key")) -> str:
     """Dependency: validates user or admin API key. Returns the key."""
+    with span("auth"):
+        return _verify_api_key(x_api_key)
+
+
+def _verify_api_key(x_api_key: Optional[str]) -> str:
     settings = get_settings()
     if not x_api_key:
         raise AuthenticationError("Missing API key in X-API-Key header")
     # admin bypass
     if settings.ADMIN_API_KEY and secrets.compare_digest(x_api_key, settings.ADMIN_API_KEY):
         return x_api_key
-    if not _repo.verify(x_api_key):
+    with stage_timer("apikey_verify"):
+        valid = _repo.verify(x_api_key)
+    if not valid:
         raise AuthenticationError("Invalid API key")
+    if not usage_meter.record(x_api_key):
+        raise QuotaExceededError(retry_after=usage_meter.retry_after())
     return x_api_key
 
 
@@ -36,3 +51,15 @@ def verify_admin_key(x_api_key: Optional[str] = Header(None, alias="X-API-Key"))
     if not x_api_key or not secrets.compare_digest(x_api_key, settings.ADMIN_API_KEY):
         raise AuthorizationError("Admin API key required")
     return x_api_key
+
+
+def key_owner(key: str) -> str:
+    """Stable, non-reversible owner id for resources created with ``key``."""
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def is_admin_key(key: Optional[str]) -> bool:
+    admin = get_settings().ADMIN_API_KEY
+    if not admin or not key:
+        return False
+    return secrets.compare_digest(key, admin)
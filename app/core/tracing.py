@@ -0,0 +1,140 @@
+"""
+Per-request span recording — Server-Timing headers and slow-request capture.
+
+RequestIDMiddleware opens a ``Trace`` for every request under its request
+id. ``span(name)`` (and every ``stage_timer``) records into the current
+trace through a context variable. ``asyncio.to_thread`` carries the trace
+into worker threads; ``carry_context`` does the same for other executors.
+Outside a request, or with TRACE_ENABLED off, a span costs one context
+variable lookup.
+
+When the response is sent, its spans are summed per name into a
+``Server-Timing`` header. Requests slower than TRACE_SLOW_MS have their
+span tree kept in a bounded per-worker ring buffer, newest first, for
+``GET /api/v1/admin/traces/slow``.
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+MAX_SPANS = 512  # per request; later spans are counted but not kept
+
+
+class Trace:
+    """Spans of one request; each is ``[name, parent span or None, start, end]`` in perf_counter seconds."""
+
+    __slots__ = ("request_id", "method", "path", "start", "wall", "spans", "dropped")
+
+    def __init__(self, request_id: str, method: str, path: str) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.wall = time.time()
+        self.spans: List[list] = []
+        self.dropped = 0
+
+    def server_timing(self, total_ms: float) -> str:
+        """``name;dur=ms`` per span name, in order of first start, then ``total``."""
+        durations: Dict[str, float] = {}
+        for name, _, start, end in list(self.spans):
+            if end is not None:
+                durations[name] = durations.get(name, 0.0) + (end - start) * 1000
+        parts = [f"{name};dur={ms:.2f}" for name, ms in durations.items()]
+        parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+    def tree(self) -> List[Dict[str, Any]]:
+        """Spans as nested ``{name, start_ms, duration_ms, children}``, offsets relative to the request start."""
+        nodes: Dict[int, Dict[str, Any]] = {}
+        roots: List[Dict[str, Any]] = []
+        for rec in list(self.spans):
+            name, parent, start, end = rec
+            node = {
+                "name": name,
+                "start_ms": round((start - self.start) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3) if end is not None else None,
+                "children": [],
+            }
+            nodes[id(rec)] = node
+            siblings = nodes[id(parent)]["children"] if parent is not None and id(parent) in nodes else roots
+            siblings.append(node)
+        return roots
+
+
+# set by RequestIDMiddleware; lives in core so logging can read it without importing middleware
+REQUEST_ID_CTX: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+TRACE_CTX: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+_PARENT: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("trace_parent", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the block as a span of the current request, nested under the enclosing span."""
+    trace = TRACE_CTX.get()
+    if trace is None:
+        yield
+        return
+    if len(trace.spans) >= MAX_SPANS:
+        trace.dropped += 1
+        yield
+        return
+    rec = [name, _PARENT.get(), time.perf_counter(), None]
+    trace.spans.append(rec)
+    token = _PARENT.set(rec)
+    try:
+        yield
+    finally:
+        rec[3] = time.perf_counter()
+        _PARENT.reset(token)
+
+
+def carry_context(fn: Callable) -> Callable:
+    """``fn`` bound to a copy of the caller's context, for executors that do not copy it themselves."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+# ── slow requests ──
+
+_slow: Deque[Dict[str, Any]] = deque(maxlen=200)
+_slow_lock = threading.Lock()
+
+
+def configure(buffer_size: int) -> None:
+    global _slow
+    with _slow_lock:
+        _slow = deque(_slow, maxlen=buffer_size)
+
+
+def capture(trace: Trace, status: int, total_ms: float) -> None:
+    """Keep ``trace``'s span tree in the slow-request buffer."""
+    entry = {
+        "request_id": trace.request_id,
+        "method": trace.method,
+        "path": trace.path,
+        "status": status,
+        "duration_ms": round(total_ms, 3),
+        "started_at": datetime.fromtimestamp(trace.wall, timezone.utc),
+        "dropped_spans": trace.dropped,
+        "spans": trace.tree(),
+    }
+    with _slow_lock:
+        _slow.append(entry)
+
+
+def slow_requests(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Captured slow requests, newest first."""
+    with _slow_lock:
+        entries = list(reversed(_slow))
+    return entries[:limit] if limit is not None else entries
+
+
+def clear_slow_requests() -> None:
+    with _slow_lock:
+        _slow.clear()
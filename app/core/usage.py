@@ -0,0 +1,163 @@
+"""
+API-key usage metering — request counts, last use and monthly quotas.
+
+Every authenticated request bumps an in-memory counter; the request path
+never writes to the database. A background task adds the pending counts to
+``apikey_usage`` in one transaction every USAGE_FLUSH_INTERVAL seconds and
+once more at shutdown, then re-reads the month's totals so each worker's
+view includes what the other workers have flushed.
+
+Quotas are checked against that view. With several workers a key can
+overshoot its quota by what the others admitted since their last flush.
+Periods are calendar months in UTC (``YYYY-MM``).
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.repositories.apikey_repository import APIKeyRepository
+
+logger = get_logger("core.usage")
+
+
+def period_of(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+
+def period_end(ts: float) -> float:
+    """Timestamp at which the period holding ``ts`` ends."""
+    d = datetime.fromtimestamp(ts, timezone.utc)
+    year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+    return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+
+
+def effective_quota(quota: Optional[int]) -> int:
+    """A key's own quota, else API_KEY_MONTHLY_QUOTA; 0 is unlimited."""
+    return get_settings().API_KEY_MONTHLY_QUOTA if quota is None else quota
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class UsageMeter:
+    """Per-key request counters for the current period, written behind to the API-key database."""
+
+    def __init__(self, repo: Optional[APIKeyRepository] = None, flush_every: Optional[float] = None) -> None:
+        self._repo = repo or APIKeyRepository()
+        self._flush_every = flush_every or get_settings().USAGE_FLUSH_INTERVAL
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        self._period = ""
+        self._period_end = 0.0
+        self._used: Dict[str, int] = {}  # key → requests this period, flushed or not
+        self._quota: Dict[str, Optional[int]] = {}  # key → its own quota; None follows API_KEY_MONTHLY_QUOTA
+        self._pending: Dict[Tuple[str, str], List] = {}  # (key, period) → [requests, last used] not yet written
+        self._task: Optional[asyncio.Task] = None
+
+    # ── internal ──
+
+    def _prime(self, key: str, now: float) -> None:
+        """Roll over to a new period if one started, and load ``key``'s totals on first sight."""
+        with self._lock:
+            if now >= self._period_end:
+                self._period, self._period_end = period_of(now), period_end(now)
+                self._used.clear()
+            if key in self._used:
+                return
+            period = self._period
+        requests, quota = self._repo.quota_state([key], period).get(key, (0, None))
+        with self._lock:
+            if self._period == period and key not in self._used:
+                pending = self._pending.get((key, period))
+                self._used[key] = requests + (pending[0] if pending else 0)
+                self._quota[key] = quota
+
+    # ── public ──
+
+    def record(self, key: str, now: Optional[float] = None) -> bool:
+        """Count one request by ``key``; False, and not counted, when its quota for the period is used up."""
+        now = time.time() if now is None else now
+        if now >= self._period_end or key not in self._used:
+            self._prime(key, now)
+        with self._lock:
+            used = self._used.get(key, 0)
+            limit = effective_quota(self._quota.get(key))
+            if limit and used >= limit:
+                return False
+            self._used[key] = used + 1
+            slot = (key, self._period)
+            pending = self._pending.get(slot)
+            if pending is None:
+                self._pending[slot] = [1, now]
+            else:
+                pending[0] += 1
+                pending[1] = now
+        return True
+
+    def retry_after(self, now: Optional[float] = None) -> int:
+        """Seconds until the current period, and with it every quota, resets."""
+        return max(1, int(self._period_end - (time.time() if now is None else now)))
+
+    def set_quota(self, key: str, monthly_quota: Optional[int]) -> None:
+        """Apply a quota change here at once; other workers pick it up on their next flush."""
+        with self._lock:
+            if key in self._quota or key in self._used:
+                self._quota[key] = monthly_quota
+
+    def flush(self) -> int:
+        """Write pending counts and refresh the totals of every key seen this period; returns rows written."""
+        with self._flushing:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                period, keys = self._period, list(self._used)
+            if batch:
+                try:
+                    self._repo.add_usage((key, p, requests, _iso(last)) for (key, p), (requests, last) in batch.items())
+                except Exception:
+                    with self._lock:
+                        for slot, (requests, last) in batch.items():
+                            pending = self._pending.setdefault(slot, [0, last])
+                            pending[0] += requests
+                            pending[1] = max(pending[1], last)
+                    raise
+            if keys:
+                state = self._repo.quota_state(keys, period)
+                with self._lock:
+                    if self._period == period:
+                        for key in keys:
+                            if key not in state:  # revoked — forget it
+                                self._used.pop(key, None)
+                                self._quota.pop(key, None)
+                                continue
+                            requests, quota = state[key]
+                            unwritten = self._pending.get((key, period))
+                            self._used[key] = requests + (unwritten[0] if unwritten else 0)
+                            self._quota[key] = quota
+            return len(batch)
+
+    # ── background flush ──
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Usage meter started", extra={"extra_data": {"flush_every": self._flush_every}})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_every)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Usage flush failed; counts kept for the next one")
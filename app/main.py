@@ -9,30 +9,126 @@ Architecture:
   app/middleware/    → cross-cutting concerns
   app/models/       → Pydantic schemas
 """
-from contextlib import asynccontextmanager
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+from typing import Dict, Iterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.core import tracing
+from app.core.admission import AdmissionController
 from app.core.config import get_settings
-from app.core.logging import configure_logging, get_logger
+from app.core.logging import configure_logging, get_logger, shutdown_logging
+from app.core.metrics import CONTENT_TYPE_LATEST, mark_worker_dead, render_metrics
+from app.core.responses import FastJSONResponse
+from app.core.security import usage_meter
 from app.api.v1.router import api_router
+from app.middleware.admission import AdmissionControlMiddleware
 from app.middleware.error_handler import register_error_handlers
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.rate_limiter import RateLimitMiddleware, SlidingWindowRateLimiter
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.models.schemas import RootResponse
+from app.repositories.watchlist_repository import WatchlistRepository
+from app.services.contract_service import ContractService
+from app.services.embedding_pool import shutdown_pools
+from app.services.health_monitor import HealthMonitor
+from app.services.index_snapshot import SnapshotManager
 from app.services.indexer_service import build_default_index
+from app.services.job_handlers import analyze_handler, ingest_handler
+from app.services.job_service import JobManager
+from app.services.watchlist_service import WatchlistScheduler
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str) -> Iterator[None]:
+    """Record a startup phase's wall time (ms) into ``timings``."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+
+def _load_indexer():
+    """Local IndexerService, or a client for the shared index server (INDEX_MODE=remote)."""
+    if get_settings().INDEX_MODE == "remote":
+        from app.services.index_client import RemoteIndexer
+
+        return RemoteIndexer()
+    return build_default_index()
+
+
+async def _warm_up_index(app: FastAPI, started: float) -> None:
+    """Load model + index off the event loop; publish the indexer once it is warm."""
+    logger = get_logger("main")
+    timings: Dict[str, float] = {}
+    try:
+        with _phase(timings, "index_load"):
+            indexer = await asyncio.to_thread(_load_indexer)
+        with _phase(timings, "model_warmup"):
+            await asyncio.to_thread(indexer.warm_up)
+    except Exception:
+        logger.exception("Index warm-up failed")
+        return
+    app.state.indexer = indexer
+    app.state.health.poke()
+    timings["total_since_start"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Index warm-up complete", extra={"extra_data": {"phases_ms": timings, "docs": indexer.doc_count}})
+
+
+def _snapshot_manager(app: FastAPI):
+    """Snapshot exports and hot reloads; the index server owns them in remote mode."""
+    if get_settings().INDEX_MODE == "remote":
+        from app.services.index_client import RemoteIndexer
+
+        return RemoteIndexer()
+    return SnapshotManager(lambda: app.state.indexer, lambda indexer: setattr(app.state, "indexer", indexer))
+
+
+def _job_manager(app: FastAPI) -> JobManager:
+    settings = get_settings()
+    manager = JobManager()
+
+    async def index_ready() -> None:
+        await asyncio.shield(app.state.warmup_task)
+
+    manager.register(
+        "ingest",
+        ingest_handler(lambda: app.state.indexer),
+        concurrency=settings.JOB_INGEST_CONCURRENCY,
+        ready=index_ready,
+    )
+    manager.register("analyze", analyze_handler(app.state.contracts), concurrency=settings.JOB_ANALYZE_CONCURRENCY)
+    return manager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup / shutdown lifecycle."""
+    """Startup / shutdown lifecycle.
+
+    Only cheap setup happens before the worker accepts traffic; the model
+    and vector index load in a background task (readiness reports "warming").
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
     settings = get_settings()
-    configure_logging(level=settings.LOG_LEVEL, fmt=settings.LOG_FORMAT)
+    with _phase(timings, "logging"):
+        configure_logging(
+            level=settings.LOG_LEVEL,
+            fmt=settings.LOG_FORMAT,
+            async_queue=settings.LOG_ASYNC,
+            queue_size=settings.LOG_QUEUE_SIZE,
+            sample_rate=settings.LOG_SAMPLE_RATE,
+        )
     logger = get_logger("main")
 
     # -- startup --
@@ -42,22 +138,79 @@ async def lifespan(app: FastAPI):
     )
 
     # rate limiter
-    app.state.rate_limiter = SlidingWindowRateLimiter(
-        calls=settings.RATE_LIMIT_CALLS,
-        period=settings.RATE_LIMIT_PERIOD,
+    with _phase(timings, "rate_limiter"):
+        app.state.rate_limiter = SlidingWindowRateLimiter(
+            calls=settings.RATE_LIMIT_CALLS,
+            period=settings.RATE_LIMIT_PERIOD,
+        )
+
+    # admission control — per-route concurrency limits for expensive endpoints
+    app.state.admission = (
+        AdmissionController(
+            settings.ADMISSION_LIMITS,
+            queue=settings.ADMISSION_QUEUE_SIZE,
+            timeout=settings.ADMISSION_TIMEOUT,
+        )
+        if settings.ADMISSION_ENABLED
+        else None
     )
 
-    # vector index
-    app.state.indexer = build_default_index()
+    # API-key usage — counted in memory, written behind
+    usage_meter.start()
+
+    # vector index — warmed in the background
+    app.state.indexer = None
+    app.state.warmup_task = asyncio.create_task(_warm_up_index(app, started))
 
-    logger.info("AstraBlock startup complete")
+    # dependency checks — run in the background, served by /readiness
+    app.state.health = HealthMonitor.for_app(lambda: app.state.indexer, lambda: not app.state.warmup_task.done())
+    app.state.health.start()
+
+    # index snapshots — swapped in place of app.state.indexer, never restarting the worker
+    app.state.snapshots = _snapshot_manager(app)
+    watch_snapshots = settings.INDEX_SNAPSHOT_WATCH and isinstance(app.state.snapshots, SnapshotManager)
+    if watch_snapshots:
+        app.state.snapshots.start()
+
+    # contract analysis — one service, so the endpoint, jobs and watchlist share its HTTP
+    # session, fetch pool and proxy / analysis caches
+    with _phase(timings, "contracts"):
+        app.state.contracts = await asyncio.to_thread(ContractService)
+
+    # background jobs — queued / interrupted jobs from a previous run resume here
+    with _phase(timings, "jobs"):
+        app.state.jobs = _job_manager(app)
+        await app.state.jobs.start()
+
+    # watchlist — entries can be edited even when the re-check scheduler is off
+    app.state.watchlist = None
+    with _phase(timings, "watchlist"):
+        app.state.watchlist_repo = await asyncio.to_thread(WatchlistRepository)
+        if settings.WATCHLIST_ENABLED:
+            app.state.watchlist = WatchlistScheduler(app.state.contracts, app.state.watchlist_repo)
+            app.state.watchlist.start()
+
+    logger.info("AstraBlock accepting traffic", extra={"extra_data": {"phases_ms": timings}})
     yield
     # -- shutdown --
     logger.info("AstraBlock shutting down")
+    if app.state.watchlist is not None:
+        await app.state.watchlist.stop()
+    await app.state.jobs.stop()
+    if watch_snapshots:
+        await app.state.snapshots.stop()
+    await usage_meter.stop()
+    await app.state.health.stop()
+    if not app.state.warmup_task.done():
+        app.state.warmup_task.cancel()
+    shutdown_pools()
+    mark_worker_dead()
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
+    tracing.configure(settings.TRACE_BUFFER_SIZE)
 
     app = FastAPI(
         title=settings.APP_NAME,
@@ -71,9 +224,13 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
         openapi_url="/openapi.json" if settings.ENVIRONMENT != "production" else None,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     # ── middleware (order matters: outermost runs first) ──
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(AdmissionControlMiddleware)
     app.add_middleware(SecurityHeadersMiddleware)
     app.add_middleware(RateLimitMiddleware)
     app.add_middleware(RequestIDMiddleware)
@@ -84,6 +241,8 @@ def create_app() -> FastAPI:
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
     )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     # ── error handlers ──
     register_error_handlers(app)
@@ -103,6 +262,13 @@ def create_app() -> FastAPI:
             media_type="image/svg+xml",
         )
 
+    # ── metrics ──
+    if settings.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
     # ── root ──
     @app.get("/", response_model=RootResponse, tags=["root"])
     async def root():
@@ -0,0 +1,44 @@
+"""
+Admission-control middleware — holds gated routes to their concurrency limits.
+"""
+
+import math
+from typing import Optional
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from app.core.admission import AdmissionController
+from app.core.exceptions import AstraBlockError, ValidationError
+from app.middleware.error_handler import error_response
+
+TIMEOUT_HEADER = "x-request-timeout"
+
+
+def _requested_timeout(request: Request) -> Optional[float]:
+    raw = request.headers.get(TIMEOUT_HEADER)
+    if raw is None:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValidationError("X-Request-Timeout must be a number of seconds") from None
+    if not math.isfinite(value):
+        raise ValidationError("X-Request-Timeout must be a number of seconds")
+    return value
+
+
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        admission: Optional[AdmissionController] = getattr(request.app.state, "admission", None)
+        if admission is None:
+            return await call_next(request)
+        gate = admission.gate_for(request.url.path)
+        if gate is None:
+            return await call_next(request)
+        try:
+            timeout = admission.deadline(_requested_timeout(request))
+            async with gate.admit(timeout):
+                return await call_next(request)
+        except AstraBlockError as exc:
+            return error_response(request, exc)
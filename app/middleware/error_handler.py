@@ -2,32 +2,42 @@
 Global exception handler — catches all AstraBlockError subclasses and
 unhandled exceptions, returning a consistent JSON error envelope.
 """
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
 from app.core.exceptions import AstraBlockError
 from app.core.logging import get_logger
+from app.core.responses import FastJSONResponse
 from app.models.schemas import ErrorResponse
 
 logger = get_logger("middleware.errors")
 
 
+def error_response(request: Request, exc: AstraBlockError) -> FastJSONResponse:
+    """Render an AstraBlockError as the standard envelope.
+
+    Middleware uses this directly: exceptions raised outside the router never
+    reach the registered handlers and would otherwise surface as a 500.
+    """
+    rid = getattr(request.state, "request_id", None)
+    logger.warning(
+        exc.message,
+        extra={"extra_data": {"error_code": exc.error_code, "request_id": rid}},
+    )
+    body = ErrorResponse(
+        error_code=exc.error_code,
+        message=exc.message,
+        details=exc.details,
+        request_id=rid,
+    )
+    return FastJSONResponse(status_code=exc.status_code, content=body.model_dump(), headers=exc.headers)
+
+
 def register_error_handlers(app: FastAPI) -> None:
     @app.exception_handler(AstraBlockError)
     async def astra_error_handler(request: Request, exc: AstraBlockError):
-        rid = getattr(request.state, "request_id", None)
-        logger.warning(
-            exc.message,
-            extra={"extra_data": {"error_code": exc.error_code, "request_id": rid}},
-        )
-        body = ErrorResponse(
-            error_code=exc.error_code,
-            message=exc.message,
-            details=exc.details,
-            request_id=rid,
-        )
-        return JSONResponse(status_code=exc.status_code, content=body.model_dump())
+        return error_response(request, exc)
 
     @app.exception_handler(RequestValidationError)
     async def validation_error_handler(request: Request, exc: RequestValidationError):
@@ -38,7 +48,7 @@ def register_error_handlers(app: FastAPI) -> None:
             details=exc.errors(),
             request_id=rid,
         )
-        return JSONResponse(status_code=422, content=body.model_dump())
+        return FastJSONResponse(status_code=422, content=body.model_dump())
 
     @app.exception_handler(Exception)
     async def unhandled_error_handler(request: Request, exc: Exception):
@@ -49,4 +59,4 @@ def register_error_handlers(app: FastAPI) -> None:
             message="An unexpected error occurred",
             request_id=rid,
         )
-        return JSONResponse(status_code=500, content=body.model_dump())
+        return FastJSONResponse(status_code=500, content=body.model_dump())
@@ -0,0 +1,42 @@
+"""
+Metrics middleware — request count and latency by route template and status.
+"""
+
+import time
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY
+
+
+def _route_label(request: Request) -> str:
+    """Route template (/admin/keys/{key}), never the raw path — bounded cardinality.
+
+    A route in an included router may carry only its path below the router's
+    prefix; the prefix is then the leading segments of the request path that
+    the template does not cover.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    template: str = route.path
+    path: str = request.scope.get("path", "")
+    extra = path.rstrip("/").count("/") - template.rstrip("/").count("/")
+    if extra <= 0:
+        return template
+    return "/".join(path.split("/")[: extra + 1]) + template
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        t0 = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = _route_label(request)
+            REQUEST_LATENCY.labels(request.method, route).observe(time.perf_counter() - t0)
+            REQUEST_COUNT.labels(request.method, route, str(status)).inc()
@@ -0,0 +1,58 @@
+"""
+Per-request profiling — `X-Profile: 1` plus the admin key profiles one request.
+
+What gets profiled is the work the request hands to worker threads (see
+``app.core.profiling.profiled``), where its time is actually spent; the
+event loop is shared with every other request and is left out.
+
+Plain ASGI (not BaseHTTPMiddleware) so a request without the header costs
+one header scan and nothing else.
+"""
+
+import secrets
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.profiling import RequestProfiler
+from app.core.tracing import REQUEST_ID_CTX
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) not in (b"1", b"true") or not self._is_admin(headers):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = REQUEST_ID_CTX.get() or str(uuid.uuid4())
+        profiler = RequestProfiler()
+        if not profiler.start():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop(request_id, get_settings().PROFILE_STORE_SIZE)
+
+    @staticmethod
+    def _is_admin(headers: dict) -> bool:
+        admin = get_settings().ADMIN_API_KEY
+        key = headers.get(b"x-api-key", b"").decode("latin-1")
+        return bool(admin and key and secrets.compare_digest(key, admin))
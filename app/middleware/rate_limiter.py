@@ -2,6 +2,7 @@
 In-memory sliding-window rate limiter middleware.
 Production: swap for Redis-backed (e.g. via fastapi-limiter).
 """
+
 import time
 from collections import defaultdict
 from typing import Dict, Tuple
@@ -12,6 +13,9 @@ from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoin
 from app.core.config import get_settings
 from app.core.exceptions import RateLimitError
 from app.core.logging import get_logger
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.core.tracing import span
+from app.middleware.error_handler import error_response
 
 logger = get_logger("middleware.ratelimit")
 
@@ -40,16 +44,18 @@ class SlidingWindowRateLimiter:
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # skip health probes
-        if request.url.path in ("/api/v1/health", "/api/v1/readiness"):
+        # skip health probes and metric scrapes
+        if request.url.path in ("/api/v1/health", "/api/v1/readiness", "/metrics"):
             return await call_next(request)
 
         limiter: SlidingWindowRateLimiter = request.app.state.rate_limiter
         identity = request.headers.get("x-api-key") or (request.client.host if request.client else "unknown")
-        allowed, remaining = limiter.check(identity)
+        with span("rate_limit"):
+            allowed, remaining = limiter.check(identity)
 
         if not allowed:
-            raise RateLimitError()
+            RATE_LIMIT_REJECTIONS.inc()
+            return error_response(request, RateLimitError())
 
         response = await call_next(request)
         settings = get_settings()
@@ -1,14 +1,17 @@
 """
 Request-ID middleware — attaches a unique correlation ID to every request.
-Propagates it in logs and response headers.
+Propagates it in logs and response headers, and opens the request's trace
+(see app.core.tracing) for the Server-Timing header and slow-request capture.
 """
+
+import time
 import uuid
-from contextvars import ContextVar
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
-REQUEST_ID_CTX: ContextVar[str] = ContextVar("request_id", default="")
+from app.core.config import get_settings
+from app.core.tracing import REQUEST_ID_CTX, TRACE_CTX, Trace, capture
 
 HEADER = "X-Request-ID"
 
@@ -19,6 +22,18 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         REQUEST_ID_CTX.set(rid)
         request.state.request_id = rid
 
-        response = await call_next(request)
+        settings = get_settings()
+        trace = Trace(rid, request.method, request.url.path) if settings.TRACE_ENABLED else None
+        token = TRACE_CTX.set(trace)
+        try:
+            response = await call_next(request)
+        finally:
+            TRACE_CTX.reset(token)
         response.headers[HEADER] = rid
+        if trace is not None:
+            total_ms = (time.perf_counter() - trace.start) * 1000
+            if settings.SERVER_TIMING_ENABLED:
+                response.headers["Server-Timing"] = trace.server_timing(total_ms)
+            if total_ms >= settings.TRACE_SLOW_MS:
+                capture(trace, response.status_code, total_ms)
         return response
@@ -2,8 +2,9 @@
 Pydantic v2 request / response schemas.
 Every API boundary uses explicit models — no raw dicts escape to the client.
 """
+
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -13,6 +14,7 @@ from pydantic import BaseModel, Field, field_validator
 
 class APIResponse(BaseModel):
     """Standard API response wrapper."""
+
     success: bool = True
     message: str = "ok"
     data: Any = None
@@ -20,6 +22,7 @@ class APIResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Standard error envelope returned by the global error handler."""
+
     success: bool = False
     error_code: str
     message: str
@@ -28,10 +31,8 @@ class ErrorResponse(BaseModel):
 
 
 class PaginationMeta(BaseModel):
-    total: int
-    page: int
-    per_page: int
-    pages: int
+    limit: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; None on the last page
 
 
 class PaginatedResponse(BaseModel):
@@ -57,20 +58,54 @@ class ContractAnalyzeRequest(BaseModel):
 class Finding(BaseModel):
     pattern: str
     snippet: str
+    file: Optional[str] = None  # source file, or contract address for bytecode findings
+    line: Optional[int] = None
+
+
+class ProxyDetails(BaseModel):
+    kind: str  # "eip1167" | "eip1967" | "eip1967-beacon"
+    implementation: Optional[str] = None
+    beacon: Optional[str] = None
+
+
+class BytecodeInfo(BaseModel):
+    code_size: int
+    selectors: int
+    functions: List[str] = []  # signatures resolved from the selector table
+    proxy: Optional[ProxyDetails] = None
+
+
+class SimilarMatch(BaseModel):
+    id: str
+    label: str
+    address: Optional[str] = None
+    similarity: float  # estimated Jaccard similarity, 0–1
 
 
 class ContractRiskAnalysis(BaseModel):
     score: int = Field(0, ge=0, le=100)
     findings: List[Finding] = []
     error: Optional[str] = None
+    files_scanned: int = 0
+    files_skipped: List[str] = []  # known library files, matched by content hash
+    cached: bool = False  # served from the analysis cache
+    bytecode: Optional[BytecodeInfo] = None  # set when analysed from deployed code
+    similar: List[SimilarMatch] = []  # closest known contracts (clone detection)
 
 
-class ContractAnalyzeResponse(BaseModel):
+class ImplementationAnalysis(BaseModel):
     address: str
     source_available: bool
     analysis: ContractRiskAnalysis
 
 
+class ContractAnalyzeResponse(BaseModel):
+    address: str
+    source_available: bool
+    analysis: ContractRiskAnalysis  # for proxies, score is the max of proxy and implementation
+    implementation: Optional[ImplementationAnalysis] = None
+
+
 # ──────────────────────────── RAG / Documents ──────────────────────────────
 
 
@@ -108,7 +143,8 @@ class IndexDocsResponse(BaseModel):
 
 
 class ListDocsResponse(BaseModel):
-    docs: List[str]
+    docs: List[str]  # sorted by id
+    pagination: PaginationMeta
 
 
 # ──────────────────────────── Admin / API Keys ─────────────────────────────
@@ -116,27 +152,222 @@ class ListDocsResponse(BaseModel):
 
 class CreateKeyRequest(BaseModel):
     name: Optional[str] = Field(None, max_length=128)
+    monthly_quota: Optional[int] = Field(None, ge=0, description="Requests per month; 0 unlimited, unset the default")
 
 
 class APIKeyInfo(BaseModel):
     key: str
     name: Optional[str]
     created_at: Optional[datetime] = None
+    monthly_quota: Optional[int] = None
 
 
 class CreateKeyResponse(BaseModel):
     key: str
     name: Optional[str]
+    monthly_quota: Optional[int] = None
 
 
 class ListKeysResponse(BaseModel):
-    keys: List[APIKeyInfo]
+    keys: List[APIKeyInfo]  # in creation order
+    pagination: PaginationMeta
 
 
 class DeleteKeyResponse(BaseModel):
     deleted: bool
 
 
+class SetQuotaRequest(BaseModel):
+    monthly_quota: Optional[int] = Field(..., ge=0, description="Requests per month; 0 unlimited, null the default")
+
+
+class KeyUsage(BaseModel):
+    key: str
+    period: str  # YYYY-MM, UTC
+    requests: int
+    last_used_at: Optional[datetime] = None
+    monthly_quota: int  # effective quota; 0 is unlimited
+    remaining: Optional[int] = None  # None when unlimited
+
+
+class UsageReportResponse(BaseModel):
+    period: str
+    usage: List[KeyUsage]  # by key
+    pagination: PaginationMeta
+
+
+class KeyUsageHistoryResponse(BaseModel):
+    key: str
+    monthly_quota: int
+    periods: List[KeyUsage]  # newest first
+
+
+# ──────────────────────────── Admin / Clone corpus ─────────────────────────
+
+
+class KnownContractRequest(BaseModel):
+    kind: Literal["source", "bytecode"] = "source"
+    label: str = Field(..., min_length=1, max_length=200, examples=["rugpull-honeypot"])
+    content: str = Field(..., min_length=1, description="Etherscan SourceCode, or hex runtime bytecode")
+    address: Optional[str] = Field(None, min_length=42, max_length=42)
+
+
+class KnownContractInfo(BaseModel):
+    id: str
+    kind: str
+    label: str
+    address: Optional[str] = None
+    created_at: datetime
+
+
+class ListKnownContractsResponse(BaseModel):
+    contracts: List[KnownContractInfo]
+    total: int
+
+
+# ──────────────────────────── Admin / Index snapshots ──────────────────────
+
+
+class SnapshotRequest(BaseModel):
+    name: Optional[str] = Field(None, max_length=128, description="Default: <UTC time>-<doc count>")
+
+
+class SnapshotInfo(BaseModel):
+    name: str
+    created_at: datetime
+    backend: str  # embedding backend; a snapshot only loads into an index with the same one
+    dim: Optional[int] = None
+    doc_count: int
+    files: Dict[str, str]  # file name → SHA-256
+
+
+class ListSnapshotsResponse(BaseModel):
+    live: Optional[str] = None  # snapshot the serving index was loaded from, if any
+    snapshots: List[SnapshotInfo]  # newest first
+
+
+# ──────────────────────────── Admin / Profiling ────────────────────────────
+
+
+class AllocationStat(BaseModel):
+    traceback: List[str]
+    size_kb: float
+    count: int
+
+
+class MemoryProfileResponse(BaseModel):
+    seconds: float
+    allocations: List[AllocationStat]
+
+
+class TraceSpan(BaseModel):
+    name: str
+    start_ms: float  # from the start of the request
+    duration_ms: Optional[float] = None  # None if still open when the response was sent
+    children: List["TraceSpan"] = []
+
+
+class SlowRequest(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    started_at: datetime
+    dropped_spans: int = 0
+    spans: List[TraceSpan]
+
+
+class SlowRequestsResponse(BaseModel):
+    threshold_ms: float
+    requests: List[SlowRequest]  # newest first, this worker only
+
+
+# ──────────────────────────── Jobs ─────────────────────────────────────────
+
+
+class IngestJobRequest(IndexDocsRequest):
+    docs: List[str] = Field(..., min_length=1, max_length=100_000)
+    priority: int = Field(0, ge=-10, le=10, description="Higher runs first")
+
+
+class AnalyzeJobRequest(BaseModel):
+    addresses: List[str] = Field(..., min_length=1, max_length=1000)
+    priority: int = Field(0, ge=-10, le=10, description="Higher runs first")
+
+    @field_validator("addresses")
+    @classmethod
+    def must_be_addresses(cls, v: List[str]) -> List[str]:
+        bad = [a for a in v if not (a.startswith("0x") and len(a) == 42)]
+        if bad:
+            raise ValueError(f"invalid addresses: {bad[:5]}")
+        return v
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    type: str
+    status: str  # "queued" | "running" | "succeeded" | "failed"
+    priority: int
+    progress: float
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class JobResultResponse(BaseModel):
+    job_id: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+
+
+# ──────────────────────────── Watchlist ────────────────────────────────────
+
+
+class WatchlistAddRequest(ContractAnalyzeRequest):
+    label: Optional[str] = Field(None, max_length=200)
+    interval_s: Optional[float] = Field(
+        None, gt=0, description="Seconds between re-checks; default WATCHLIST_DEFAULT_INTERVAL"
+    )
+
+
+class WatchlistEntry(BaseModel):
+    address: str
+    label: Optional[str] = None
+    interval_s: float
+    next_check_at: datetime
+    last_checked_at: Optional[datetime] = None
+    last_score: Optional[int] = None
+    created_at: datetime
+
+
+class WatchlistResponse(BaseModel):
+    entries: List[WatchlistEntry]
+
+
+class WatchEvent(BaseModel):
+    id: int
+    address: str
+    old_score: Optional[int] = None
+    new_score: Optional[int] = None
+    changes: List[str]
+    created_at: datetime
+
+
+class WatchEventsResponse(BaseModel):
+    events: List[WatchEvent]
+    next_after: int  # pass as ``after`` to continue
+
+
 # ──────────────────────────── Health ───────────────────────────────────────
 
 
@@ -148,12 +379,16 @@ class HealthResponse(BaseModel):
 
 class ReadinessCheck(BaseModel):
     name: str
-    status: str  # "ok" | "degraded" | "down"
+    status: str  # "ok" | "warming" | "degraded" | "down" | "disabled" | "unknown"
     latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    stale: bool = False  # no result within HEALTH_STALE_AFTER
+    error: Optional[str] = None
+    latency_history_ms: List[float] = []  # oldest first
 
 
 class ReadinessResponse(BaseModel):
-    status: str  # "ok" | "degraded" | "down"
+    status: str  # "ok" | "warming" | "degraded" | "down"
     checks: List[ReadinessCheck]
 
 
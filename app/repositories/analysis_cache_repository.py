@@ -0,0 +1,98 @@
+"""
+Repository for memoised contract analysis results.
+Rows are keyed by (source hash, rule-set version); the SQLite file is
+shared by every worker on the host.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("repository.analysis_cache")
+
+
+class AnalysisCacheRepository:
+    """Thread-safe SQLite repository for analysis results."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path or get_settings().ANALYSIS_CACHE_DB_PATH
+        self._ensure_schema()
+
+    # ── internal ──
+
+    def _conn(self) -> sqlite3.Connection:
+        d = os.path.dirname(self._db_path)
+        if d and not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_schema(self) -> None:
+        conn = self._conn()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    source_hash TEXT NOT NULL,
+                    ruleset     TEXT NOT NULL,
+                    result      TEXT NOT NULL,
+                    created_at  TEXT NOT NULL,
+                    PRIMARY KEY (source_hash, ruleset)
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("Analysis cache schema ensured")
+
+    # ── public ──
+
+    def get(self, source_hash: str, ruleset: str) -> Optional[dict]:
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT result FROM analysis_cache WHERE source_hash = ? AND ruleset = ?",
+                (source_hash, ruleset),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row["result"]) if row is not None else None
+
+    def put(self, source_hash: str, ruleset: str, result: dict) -> None:
+        conn = self._conn()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (source_hash, ruleset, result, created_at) VALUES (?, ?, ?, ?)",
+                (source_hash, ruleset, json.dumps(result), datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def purge_stale(self, ruleset: str) -> int:
+        """Delete rows produced by any other rule-set version."""
+        conn = self._conn()
+        try:
+            cur = conn.execute("DELETE FROM analysis_cache WHERE ruleset != ?", (ruleset,))
+            conn.commit()
+            purged = cur.rowcount
+        finally:
+            conn.close()
+        if purged:
+            logger.info("Purged stale analysis results", extra={"extra_data": {"rows": purged, "ruleset": ruleset}})
+        return purged
+
+    def count(self) -> int:
+        conn = self._conn()
+        try:
+            return int(conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0])
+        finally:
+            conn.close()
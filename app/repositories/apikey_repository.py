@@ -2,11 +2,12 @@
 Repository pattern for API key persistence.
 Encapsulates all SQLite access — the rest of the app never touches the DB directly.
 """
+
 import os
-import sqlite3
 import secrets
+import sqlite3
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
@@ -45,6 +46,21 @@ class APIKeyRepository:
                 )
                 """
             )
+            # monthly_quota: NULL follows API_KEY_MONTHLY_QUOTA, 0 is unlimited
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(apikeys)")}
+            if "monthly_quota" not in columns:
+                conn.execute("ALTER TABLE apikeys ADD COLUMN monthly_quota INTEGER")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS apikey_usage (
+                    key          TEXT NOT NULL,
+                    period       TEXT NOT NULL,
+                    requests     INTEGER NOT NULL,
+                    last_used_at TEXT NOT NULL,
+                    PRIMARY KEY (key, period)
+                )
+                """
+            )
             conn.commit()
         finally:
             conn.close()
@@ -52,26 +68,40 @@ class APIKeyRepository:
 
     # ── public ──
 
-    def create(self, name: Optional[str] = None) -> dict:
+    def create(self, name: Optional[str] = None, monthly_quota: Optional[int] = None) -> dict:
         key = secrets.token_urlsafe(32)
         now = datetime.now(timezone.utc).isoformat()
         conn = self._conn()
         try:
             conn.execute(
-                "INSERT INTO apikeys (key, name, created_at) VALUES (?, ?, ?)",
-                (key, name, now),
+                "INSERT INTO apikeys (key, name, created_at, monthly_quota) VALUES (?, ?, ?, ?)",
+                (key, name, now, monthly_quota),
             )
             conn.commit()
         finally:
             conn.close()
         logger.info("API key created", extra={"extra_data": {"name": name}})
-        return {"key": key, "name": name, "created_at": now}
+        return {"key": key, "name": name, "created_at": now, "monthly_quota": monthly_quota}
 
     def list_all(self) -> List[dict]:
+        conn = self._conn()
+        try:
+            rows = conn.execute("SELECT key, name, created_at FROM apikeys ORDER BY created_at DESC").fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def page(self, after: Optional[int] = None, prefix: str = "", limit: int = 100) -> List[dict]:
+        """Keys in creation (rowid) order after row ``after``; ``seq`` is the cursor position of each row."""
         conn = self._conn()
         try:
             rows = conn.execute(
-                "SELECT key, name, created_at FROM apikeys ORDER BY created_at DESC"
+                """
+                SELECT rowid AS seq, key, name, created_at, monthly_quota FROM apikeys
+                WHERE rowid > ? AND substr(key, 1, ?) = ?
+                ORDER BY rowid LIMIT ?
+                """,
+                (after or 0, len(prefix), prefix, limit),
             ).fetchall()
         finally:
             conn.close()
@@ -89,14 +119,102 @@ class APIKeyRepository:
             logger.info("API key deleted", extra={"extra_data": {"key_prefix": key[:8]}})
         return deleted
 
+    def get(self, key: str) -> Optional[dict]:
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT key, name, created_at, monthly_quota FROM apikeys WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
     def verify(self, key: str) -> bool:
         if not key:
             return False
         conn = self._conn()
         try:
-            row = conn.execute(
-                "SELECT 1 FROM apikeys WHERE key = ? LIMIT 1", (key,)
-            ).fetchone()
+            row = conn.execute("SELECT 1 FROM apikeys WHERE key = ? LIMIT 1", (key,)).fetchone()
         finally:
             conn.close()
         return row is not None
+
+    # ── usage & quotas ──
+
+    def set_quota(self, key: str, monthly_quota: Optional[int]) -> bool:
+        conn = self._conn()
+        try:
+            cur = conn.execute("UPDATE apikeys SET monthly_quota = ? WHERE key = ?", (monthly_quota, key))
+            conn.commit()
+            updated = cur.rowcount > 0
+        finally:
+            conn.close()
+        if updated:
+            logger.info("API key quota set", extra={"extra_data": {"key_prefix": key[:8], "quota": monthly_quota}})
+        return updated
+
+    def add_usage(self, rows: Iterable[Tuple[str, str, int, str]]) -> None:
+        """Add ``(key, period, requests, last_used_at)`` rows to the usage totals in one transaction."""
+        conn = self._conn()
+        try:
+            conn.executemany(
+                """
+                INSERT INTO apikey_usage (key, period, requests, last_used_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (key, period) DO UPDATE SET
+                    requests = requests + excluded.requests,
+                    last_used_at = max(last_used_at, excluded.last_used_at)
+                """,
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def quota_state(self, keys: List[str], period: str) -> Dict[str, Tuple[int, Optional[int]]]:
+        """``key → (requests in period, monthly_quota)`` for those of ``keys`` that still exist."""
+        state: Dict[str, Tuple[int, Optional[int]]] = {}
+        conn = self._conn()
+        try:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = conn.execute(
+                    f"""
+                    SELECT a.key, a.monthly_quota, COALESCE(u.requests, 0) AS requests
+                    FROM apikeys a LEFT JOIN apikey_usage u ON u.key = a.key AND u.period = ?
+                    WHERE a.key IN ({",".join("?" * len(chunk))})
+                    """,
+                    (period, *chunk),
+                ).fetchall()
+                state.update({r["key"]: (r["requests"], r["monthly_quota"]) for r in rows})
+        finally:
+            conn.close()
+        return state
+
+    def usage_page(self, period: str, after: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """Usage rows for ``period`` in key order after key ``after``, with each key's quota."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                """
+                SELECT u.key, u.period, u.requests, u.last_used_at, a.monthly_quota
+                FROM apikey_usage u LEFT JOIN apikeys a ON a.key = u.key
+                WHERE u.period = ? AND u.key > ?
+                ORDER BY u.key LIMIT ?
+                """,
+                (period, after or "", limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def usage_of(self, key: str) -> List[dict]:
+        """Every period ``key`` was used in, newest first."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT key, period, requests, last_used_at FROM apikey_usage WHERE key = ? ORDER BY period DESC",
+                (key,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
@@ -0,0 +1,203 @@
+"""
+Repository for background jobs.
+One SQLite table shared by every worker process; a job is claimed with a
+single atomic UPDATE so two workers never run it twice.
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("repository.jobs")
+
+_COLUMNS = (
+    "id, type, status, priority, owner, payload, result, error, progress, checkpoint, attempts, "
+    "created_at, started_at, finished_at, heartbeat_at, worker"
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobRepository:
+    """Thread-safe SQLite repository for jobs."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path or get_settings().JOB_DB_PATH
+        self._ensure_schema()
+
+    # ── internal ──
+
+    def _conn(self) -> sqlite3.Connection:
+        d = os.path.dirname(self._db_path)
+        if d and not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_schema(self) -> None:
+        conn = self._conn()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id           TEXT PRIMARY KEY,
+                    type         TEXT NOT NULL,
+                    status       TEXT NOT NULL,
+                    priority     INTEGER NOT NULL DEFAULT 0,
+                    owner        TEXT,
+                    payload      TEXT NOT NULL,
+                    result       TEXT,
+                    error        TEXT,
+                    progress     REAL NOT NULL DEFAULT 0,
+                    checkpoint   TEXT,
+                    attempts     INTEGER NOT NULL DEFAULT 0,
+                    created_at   TEXT NOT NULL,
+                    started_at   TEXT,
+                    finished_at  TEXT,
+                    heartbeat_at TEXT,
+                    worker       TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_queue ON jobs (status, type, priority DESC, created_at)")
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("Job schema ensured")
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        for col in ("result", "checkpoint"):
+            job[col] = json.loads(job[col]) if job[col] is not None else None
+        return job
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        conn = self._conn()
+        try:
+            cur = conn.execute(sql, params)
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    # ── public ──
+
+    def create(self, job_type: str, payload: Any, priority: int = 0, owner: Optional[str] = None) -> dict:
+        job_id = uuid.uuid4().hex
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "INSERT INTO jobs (id, type, status, priority, owner, payload, created_at) "
+                f"VALUES (?, ?, 'queued', ?, ?, ?, ?) RETURNING {_COLUMNS}",
+                (job_id, job_type, priority, owner, json.dumps(payload), _now()),
+            ).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("Job queued", extra={"extra_data": {"job_id": job_id, "type": job_type}})
+        return self._row(row)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        conn = self._conn()
+        try:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._row(row) if row is not None else None
+
+    def claim(self, job_type: str, worker: str) -> Optional[dict]:
+        """Atomically move the highest-priority queued job of ``job_type`` to running."""
+        now = _now()
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                f"""
+                UPDATE jobs
+                   SET status = 'running', started_at = ?, heartbeat_at = ?, worker = ?, attempts = attempts + 1
+                 WHERE id = (
+                       SELECT id FROM jobs WHERE status = 'queued' AND type = ?
+                        ORDER BY priority DESC, created_at LIMIT 1)
+                   AND status = 'queued'
+                RETURNING {_COLUMNS}
+                """,
+                (now, now, worker, job_type),
+            ).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        return self._row(row) if row is not None else None
+
+    def set_progress(self, job_id: str, progress: float, checkpoint: Any = None) -> None:
+        if checkpoint is None:
+            self._execute(
+                "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (progress, _now(), job_id),
+            )
+        else:
+            self._execute(
+                "UPDATE jobs SET progress = ?, checkpoint = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (progress, json.dumps(checkpoint), _now(), job_id),
+            )
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        if not job_ids:
+            return
+        marks = ",".join("?" * len(job_ids))
+        self._execute(f"UPDATE jobs SET heartbeat_at = ? WHERE id IN ({marks})", (_now(), *job_ids))
+
+    def succeed(self, job_id: str, result: Any) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'succeeded', result = ?, progress = 1, finished_at = ? WHERE id = ?",
+            (json.dumps(result), _now(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+            (error, _now(), job_id),
+        )
+
+    def release(self, job_ids: List[str]) -> int:
+        """Put jobs interrupted by a graceful shutdown straight back on the queue."""
+        if not job_ids:
+            return 0
+        marks = ",".join("?" * len(job_ids))
+        return self._execute(
+            f"UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running' AND id IN ({marks})",
+            tuple(job_ids),
+        )
+
+    def requeue_stale(self, stale_after: float, max_attempts: int = 0) -> int:
+        """Return running jobs whose worker stopped heart-beating (crash, restart) to the queue.
+
+        Jobs that already had ``max_attempts`` attempts (0 = no limit) are
+        failed instead, so a job that kills its worker is not requeued forever.
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=stale_after)).isoformat()
+        if max_attempts > 0:
+            failed = self._execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, worker = NULL "
+                "WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?",
+                (f"worker lost {max_attempts} times; giving up", _now(), cutoff, max_attempts),
+            )
+            if failed:
+                logger.error("Failed jobs that exhausted their attempts", extra={"extra_data": {"count": failed}})
+        n = self._execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running' AND heartbeat_at < ?",
+            (cutoff,),
+        )
+        if n:
+            logger.warning("Requeued stale jobs", extra={"extra_data": {"count": n}})
+        return n
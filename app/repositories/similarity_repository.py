@@ -0,0 +1,161 @@
+"""
+Repository for the known-contract corpus used by clone detection.
+Each row keeps the MinHash signature and the compressed original, so
+signatures can be rebuilt when the signature scheme changes. A generation
+counter lets every worker notice writes made by the others.
+"""
+
+import os
+import sqlite3
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("repository.similarity")
+
+_INFO_COLUMNS = "id, kind, label, address, created_at"
+
+
+class SimilarityRepository:
+    """Thread-safe SQLite repository for known contracts."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path or get_settings().SIMILARITY_DB_PATH
+        self._ensure_schema()
+
+    # ── internal ──
+
+    def _conn(self) -> sqlite3.Connection:
+        d = os.path.dirname(self._db_path)
+        if d and not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_schema(self) -> None:
+        conn = self._conn()
+        try:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS known_contracts (
+                    id         TEXT PRIMARY KEY,
+                    kind       TEXT NOT NULL,
+                    label      TEXT NOT NULL,
+                    address    TEXT,
+                    scheme     TEXT NOT NULL,
+                    signature  BLOB NOT NULL,
+                    content    BLOB NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS similarity_meta (
+                    key   TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO similarity_meta (key, value) VALUES ('generation', 0);
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("Similarity schema ensured")
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE similarity_meta SET value = value + 1 WHERE key = 'generation'")
+
+    # ── public ──
+
+    def add(
+        self,
+        kind: str,
+        label: str,
+        content: bytes,
+        scheme: str,
+        signature: bytes,
+        address: Optional[str] = None,
+        entry_id: Optional[str] = None,
+    ) -> dict:
+        entry = {
+            "id": entry_id or uuid.uuid4().hex,
+            "kind": kind,
+            "label": label,
+            "address": address.lower() if address else None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        conn = self._conn()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO known_contracts
+                    (id, kind, label, address, scheme, signature, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    entry["id"],
+                    kind,
+                    label,
+                    entry["address"],
+                    scheme,
+                    signature,
+                    zlib.compress(content),
+                    entry["created_at"],
+                ),
+            )
+            self._bump(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        return entry
+
+    def remove(self, entry_id: str) -> bool:
+        conn = self._conn()
+        try:
+            cur = conn.execute("DELETE FROM known_contracts WHERE id = ?", (entry_id,))
+            if cur.rowcount:
+                self._bump(conn)
+            conn.commit()
+            return cur.rowcount > 0
+        finally:
+            conn.close()
+
+    def list_all(self) -> List[dict]:
+        conn = self._conn()
+        try:
+            rows = conn.execute(f"SELECT {_INFO_COLUMNS} FROM known_contracts ORDER BY created_at").fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def signatures(self) -> List[dict]:
+        """Every row with its signature; ``content`` is left compressed."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(f"SELECT {_INFO_COLUMNS}, scheme, signature, content FROM known_contracts").fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def update_signature(self, entry_id: str, scheme: str, signature: bytes) -> None:
+        """Re-signed under a new scheme; other workers rebuild the same way, so no generation bump."""
+        conn = self._conn()
+        try:
+            conn.execute(
+                "UPDATE known_contracts SET scheme = ?, signature = ? WHERE id = ?", (scheme, signature, entry_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def generation(self) -> int:
+        conn = self._conn()
+        try:
+            generation: int = conn.execute("SELECT value FROM similarity_meta WHERE key = 'generation'").fetchone()[0]
+            return generation
+        finally:
+            conn.close()
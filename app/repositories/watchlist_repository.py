@@ -0,0 +1,242 @@
+"""
+Repository for monitored contracts and the score-change events they emit.
+Due entries and undelivered events are claimed with a lease so several
+worker processes can run the scheduler without checking the same contract
+or posting the same event twice.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("repository.watchlist")
+
+_ENTRY_COLUMNS = (
+    "owner, address, label, interval_s, next_check_at, last_checked_at, fingerprint, last_score, created_at"
+)
+
+
+class WatchlistRepository:
+    """Thread-safe SQLite repository for the watchlist."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path or get_settings().WATCHLIST_DB_PATH
+        self._ensure_schema()
+
+    # ── internal ──
+
+    def _conn(self) -> sqlite3.Connection:
+        d = os.path.dirname(self._db_path)
+        if d and not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_schema(self) -> None:
+        conn = self._conn()
+        try:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS watchlist (
+                    owner           TEXT NOT NULL,
+                    address         TEXT NOT NULL,
+                    label           TEXT,
+                    interval_s      REAL NOT NULL,
+                    next_check_at   REAL NOT NULL,
+                    last_checked_at REAL,
+                    fingerprint     TEXT,
+                    last_score      INTEGER,
+                    created_at      TEXT NOT NULL,
+                    PRIMARY KEY (owner, address)
+                );
+                CREATE INDEX IF NOT EXISTS ix_watchlist_due ON watchlist (next_check_at);
+                CREATE TABLE IF NOT EXISTS watch_events (
+                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                    owner      TEXT NOT NULL,
+                    address    TEXT NOT NULL,
+                    old_score  INTEGER,
+                    new_score  INTEGER,
+                    changes    TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    delivered  INTEGER NOT NULL DEFAULT 0,
+                    delivering_until REAL
+                );
+                CREATE INDEX IF NOT EXISTS ix_watch_events_owner ON watch_events (owner, id);
+                """
+            )
+            # delivering_until: webhook lease of a claimed event, NULL if never claimed
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(watch_events)")}
+            if "delivering_until" not in columns:
+                conn.execute("ALTER TABLE watch_events ADD COLUMN delivering_until REAL")
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("Watchlist schema ensured")
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> dict:
+        entry = dict(row)
+        entry["fingerprint"] = json.loads(entry["fingerprint"]) if entry["fingerprint"] else None
+        return entry
+
+    @staticmethod
+    def _event(row: sqlite3.Row) -> dict:
+        event = dict(row)
+        event["changes"] = json.loads(event["changes"])
+        event["delivered"] = bool(event["delivered"])
+        event.pop("delivering_until", None)
+        return event
+
+    # ── entries ──
+
+    def add(self, owner: str, address: str, label: Optional[str], interval_s: float) -> dict:
+        """Insert or update; a new entry is due immediately."""
+        conn = self._conn()
+        try:
+            conn.execute(
+                """
+                INSERT INTO watchlist (owner, address, label, interval_s, next_check_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (owner, address) DO UPDATE SET label = excluded.label, interval_s = excluded.interval_s
+                """,
+                (owner, address.lower(), label, interval_s, time.time(), datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+            row = conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM watchlist WHERE owner = ? AND address = ?", (owner, address.lower())
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._entry(row)
+
+    def list_for(self, owner: str) -> List[dict]:
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM watchlist WHERE owner = ? ORDER BY created_at", (owner,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._entry(r) for r in rows]
+
+    def remove(self, owner: str, address: str) -> bool:
+        conn = self._conn()
+        try:
+            cur = conn.execute("DELETE FROM watchlist WHERE owner = ? AND address = ?", (owner, address.lower()))
+            conn.commit()
+            return cur.rowcount > 0
+        finally:
+            conn.close()
+
+    def claim_due(self, now: float, limit: int, lease: float) -> List[dict]:
+        """Entries due at ``now``, most overdue first, leased for ``lease`` seconds."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                f"""
+                UPDATE watchlist SET next_check_at = ?
+                 WHERE rowid IN (
+                       SELECT rowid FROM watchlist WHERE next_check_at <= ? ORDER BY next_check_at LIMIT ?)
+                RETURNING {_ENTRY_COLUMNS}
+                """,
+                (now + lease, now, limit),
+            ).fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+        return [self._entry(r) for r in rows]
+
+    def record_check(
+        self, owner: str, address: str, fingerprint: Dict[str, Any], score: Optional[int], next_check_at: float
+    ) -> None:
+        conn = self._conn()
+        try:
+            conn.execute(
+                """
+                UPDATE watchlist SET fingerprint = ?, last_score = ?, last_checked_at = ?, next_check_at = ?
+                 WHERE owner = ? AND address = ?
+                """,
+                (json.dumps(fingerprint), score, time.time(), next_check_at, owner, address),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ── events ──
+
+    def add_event(
+        self, owner: str, address: str, old_score: Optional[int], new_score: Optional[int], changes: List[str]
+    ) -> dict:
+        conn = self._conn()
+        try:
+            cur = conn.execute(
+                """
+                INSERT INTO watch_events (owner, address, old_score, new_score, changes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (owner, address, old_score, new_score, json.dumps(changes), datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+            row = conn.execute("SELECT * FROM watch_events WHERE id = ?", (cur.lastrowid,)).fetchone()
+        finally:
+            conn.close()
+        return self._event(row)
+
+    def events_for(self, owner: str, after: int = 0, limit: int = 100) -> List[dict]:
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM watch_events WHERE owner = ? AND id > ? ORDER BY id LIMIT ?", (owner, after, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._event(r) for r in rows]
+
+    def undelivered(self, limit: int = 100) -> List[dict]:
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM watch_events WHERE delivered = 0 ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._event(r) for r in rows]
+
+    def claim_undelivered(self, now: float, limit: int, lease: float) -> List[dict]:
+        """Undelivered events no other process is posting, oldest first, leased for ``lease`` seconds."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                """
+                UPDATE watch_events SET delivering_until = ?
+                 WHERE id IN (
+                       SELECT id FROM watch_events
+                        WHERE delivered = 0 AND (delivering_until IS NULL OR delivering_until <= ?)
+                        ORDER BY id LIMIT ?)
+                RETURNING *
+                """,
+                (now + lease, now, limit),
+            ).fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+        return sorted((self._event(r) for r in rows), key=lambda e: e["id"])
+
+    def mark_delivered(self, event_ids: List[int]) -> None:
+        if not event_ids:
+            return
+        marks = ",".join("?" * len(event_ids))
+        conn = self._conn()
+        try:
+            conn.execute(f"UPDATE watch_events SET delivered = 1 WHERE id IN ({marks})", tuple(event_ids))
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,52 @@
+"""
+Two-tier memo for contract analysis: a per-worker LRU in front of the
+shared SQLite repository.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import record_cache
+from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+
+
+class AnalysisCache:
+    """Results for one rule-set version; rows from older versions are purged on start."""
+
+    def __init__(
+        self,
+        ruleset: str,
+        repo: Optional[AnalysisCacheRepository] = None,
+        memory_size: Optional[int] = None,
+    ) -> None:
+        self.ruleset = ruleset
+        self._repo = repo or AnalysisCacheRepository()
+        self._memory_size = memory_size if memory_size is not None else get_settings().ANALYSIS_CACHE_MEMORY_SIZE
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._repo.purge_stale(ruleset)
+
+    def _remember(self, source_hash: str, result: dict) -> None:
+        with self._lock:
+            self._memory[source_hash] = result
+            self._memory.move_to_end(source_hash)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, source_hash: str) -> Optional[dict]:
+        with self._lock:
+            result = self._memory.get(source_hash)
+            if result is not None:
+                self._memory.move_to_end(source_hash)
+        if result is None:
+            result = self._repo.get(source_hash, self.ruleset)
+            if result is not None:
+                self._remember(source_hash, result)
+        record_cache("analysis", result is not None)
+        return result
+
+    def put(self, source_hash: str, result: dict) -> None:
+        self._repo.put(source_hash, self.ruleset, result)
+        self._remember(source_hash, result)
@@ -1,9 +1,12 @@
 """
 API-key management service layer.
 """
+
 from typing import List, Optional
 
+from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.usage import effective_quota
 from app.repositories.apikey_repository import APIKeyRepository
 
 logger = get_logger("service.apikeys")
@@ -13,14 +16,45 @@ class APIKeyService:
     def __init__(self, repo: Optional[APIKeyRepository] = None) -> None:
         self._repo = repo or APIKeyRepository()
 
-    def create_key(self, name: Optional[str] = None) -> dict:
-        return self._repo.create(name)
+    def create_key(self, name: Optional[str] = None, monthly_quota: Optional[int] = None) -> dict:
+        return self._repo.create(name, monthly_quota)
 
-    def list_keys(self) -> List[dict]:
-        return self._repo.list_all()
+    def list_keys(self, after: Optional[int] = None, prefix: str = "", limit: int = 100) -> List[dict]:
+        return self._repo.page(after, prefix, limit)
 
     def delete_key(self, key: str) -> bool:
         return self._repo.delete(key)
 
     def verify_key(self, key: str) -> bool:
         return self._repo.verify(key)
+
+    # ── usage & quotas ──
+
+    def get_key(self, key: str) -> dict:
+        row = self._repo.get(key)
+        if row is None:
+            raise NotFoundError("API key", key[:8])
+        return row
+
+    def set_quota(self, key: str, monthly_quota: Optional[int]) -> dict:
+        if not self._repo.set_quota(key, monthly_quota):
+            raise NotFoundError("API key", key[:8])
+        return self.get_key(key)
+
+    def usage_page(self, period: str, after: Optional[str] = None, limit: int = 100) -> List[dict]:
+        return [_with_quota(r) for r in self._repo.usage_page(period, after, limit)]
+
+    def usage_history(self, key: str) -> dict:
+        quota = self.get_key(key)["monthly_quota"]
+        return {
+            "key": key,
+            "monthly_quota": effective_quota(quota),
+            "periods": [_with_quota({**r, "monthly_quota": quota}) for r in self._repo.usage_of(key)],
+        }
+
+
+def _with_quota(row: dict) -> dict:
+    """Usage row with its effective quota and what is left of it."""
+    quota = effective_quota(row.get("monthly_quota"))
+    remaining = max(0, quota - row["requests"]) if quota else None
+    return {**row, "monthly_quota": quota, "remaining": remaining}
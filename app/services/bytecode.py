@@ -0,0 +1,96 @@
+"""
+EVM bytecode inspection: disassembly, dispatcher selectors and proxy patterns.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional, Set, Tuple
+
+PUSH1, PUSH32 = 0x60, 0x7F
+PUSH4 = 0x63
+EQ = 0x14
+DELEGATECALL = 0xF4
+SELFDESTRUCT = 0xFF
+
+# keccak256("eip1967.proxy.implementation") - 1, and the beacon counterpart
+EIP1967_IMPLEMENTATION_SLOT = "0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc"
+EIP1967_BEACON_SLOT = "0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50"
+# implementation() on an EIP-1967 beacon
+BEACON_IMPLEMENTATION_CALL = "0x5c60da1b"
+
+# EIP-1167 minimal proxy: prefix, 20-byte implementation address, suffix
+_EIP1167_PREFIX = bytes.fromhex("363d3d373d3d3d363d73")
+_EIP1167_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+
+class Instruction(NamedTuple):
+    pc: int
+    op: int
+    arg: bytes
+
+
+class ProxyInfo(NamedTuple):
+    kind: str  # "eip1167" | "eip1967" | "eip1967-beacon"
+    implementation: Optional[str]
+    beacon: Optional[str] = None
+
+
+def hex_to_bytes(value: Optional[str]) -> bytes:
+    if not value:
+        return b""
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+
+def slot_to_address(value: Optional[str]) -> Optional[str]:
+    """Low 20 bytes of a storage word, or None when the slot is empty."""
+    raw = hex_to_bytes(value)[-20:]
+    if not raw or not any(raw):
+        return None
+    return "0x" + raw.rjust(20, b"\0").hex()
+
+
+def strip_metadata(code: bytes) -> bytes:
+    """Drop the trailing solc CBOR metadata so its bytes are not read as opcodes."""
+    if len(code) < 2:
+        return code
+    size = int.from_bytes(code[-2:], "big")
+    start = len(code) - 2 - size
+    # CBOR map header (a1..a5) — solc emits ipfs/bzzr + solc version keys
+    if size > 0 and start >= 0 and 0xA1 <= code[start] <= 0xA5:
+        return code[:start]
+    return code
+
+
+def disassemble(code: bytes) -> Iterator[Instruction]:
+    """Linear sweep; PUSH immediates are skipped so their bytes are never read as opcodes."""
+    pc, n = 0, len(code)
+    while pc < n:
+        op = code[pc]
+        if PUSH1 <= op <= PUSH32:
+            size = op - PUSH1 + 1
+            yield Instruction(pc, op, code[pc + 1 : pc + 1 + size])
+            pc += 1 + size
+        else:
+            yield Instruction(pc, op, b"")
+            pc += 1
+
+
+def scan(code: bytes) -> Tuple[List[str], Set[int]]:
+    """Dispatcher selectors (``PUSH4 x; EQ``) in code order, plus the set of opcodes present."""
+    selectors: List[str] = []
+    seen: Set[str] = set()
+    ops: Set[int] = set()
+    prev: Optional[Instruction] = None
+    for ins in disassemble(code):
+        ops.add(ins.op)
+        if ins.op == EQ and prev is not None and prev.op == PUSH4 and len(prev.arg) == 4:
+            sel = "0x" + prev.arg.hex()
+            if sel not in seen:
+                seen.add(sel)
+                selectors.append(sel)
+        prev = ins
+    return selectors, ops
+
+
+def eip1167_implementation(code: bytes) -> Optional[str]:
+    if len(code) == 45 and code.startswith(_EIP1167_PREFIX) and code.endswith(_EIP1167_SUFFIX):
+        return "0x" + code[10:30].hex()
+    return None
@@ -1,14 +1,41 @@
 """
 Contract analysis service — isolates business logic from HTTP layer.
 """
+
+import hashlib
+import json
 import re
-from typing import Any, Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 
 import requests
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError, ValidationError
 from app.core.logging import get_logger
+from app.core.metrics import record_cache, stage_timer
+from app.core.tracing import carry_context, span
+from app.services.analysis_cache import AnalysisCache
+from app.services.bytecode import (
+    BEACON_IMPLEMENTATION_CALL,
+    DELEGATECALL,
+    EIP1967_BEACON_SLOT,
+    EIP1967_IMPLEMENTATION_SLOT,
+    SELFDESTRUCT,
+    ProxyInfo,
+    eip1167_implementation,
+    hex_to_bytes,
+    scan,
+    slot_to_address,
+    strip_metadata,
+)
+from app.services.known_libraries import KnownLibraries, get_known_libraries
+from app.services.rpc_client import RPCCall, RPCClient
+from app.services.selectors import SelectorTable, get_selector_table
+from app.services.similarity_service import SimilarityService, get_similarity_service
+from app.services.source_files import SINGLE_FILE, file_hash, normalize_source, split_sources
 
 logger = get_logger("service.contract")
 
@@ -23,50 +50,391 @@ SUSPICIOUS_PATTERNS: List[str] = [
     r"unlimited",
 ]
 
+# Bump when detection or scoring logic changes without touching the patterns;
+# either change yields a new RULESET_VERSION and so invalidates cached results.
+RULES_REVISION = 2
+RULESET_VERSION = hashlib.sha256(json.dumps([RULES_REVISION, SUSPICIOUS_PATTERNS]).encode()).hexdigest()[:16]
+
+_COMPILED = [(pat, re.compile(pat)) for pat in SUSPICIOUS_PATTERNS]
+
 
-def _grab_snippet(src: str, pattern: str, width: int = 120) -> str:
-    m = re.search(pattern, src)
-    if not m:
-        return ""
+def source_key(file_hashes: Dict[str, str]) -> str:
+    """Cache key for a whole source: its file paths and per-file content hashes."""
+    return hashlib.sha256(json.dumps(sorted(file_hashes.items())).encode()).hexdigest()
+
+
+def _snippet(src: str, m: "re.Match[str]", width: int = 120) -> str:
     start = max(0, m.start() - 30)
     end = min(len(src), m.end() + 90)
     return src[start:end].strip().replace("\n", " ")[:width]
 
 
+class _ImplementationCache:
+    """proxy address → implementation address (None = not a proxy), kept for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._entries: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, address: str) -> Tuple[bool, Optional[str]]:
+        key = address.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+        record_cache("proxy_implementation", entry is not None)
+        return (True, entry[0]) if entry is not None else (False, None)
+
+    def put(self, address: str, implementation: Optional[str]) -> None:
+        with self._lock:
+            self._entries[address.lower()] = (implementation, time.monotonic() + self._ttl)
+
+
+def _is_address(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("0x") and len(value) == 42
+
+
 class ContractService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[AnalysisCache] = None,
+        libraries: Optional[KnownLibraries] = None,
+        rpc: Optional[RPCClient] = None,
+        selectors: Optional[SelectorTable] = None,
+        similarity: Optional[SimilarityService] = None,
+    ) -> None:
         self._settings = get_settings()
+        self._libraries = libraries if libraries is not None else get_known_libraries()
+        self._selectors = selectors if selectors is not None else get_selector_table()
+        if rpc is None and self._settings.RPC_URL:
+            rpc = RPCClient()
+        self._rpc = rpc
+        self._http = requests.Session()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="contract-fetch")
+        self._implementations = _ImplementationCache(self._settings.PROXY_CACHE_TTL)
+        if cache is None and self._settings.ANALYSIS_CACHE_ENABLED:
+            # skipping depends on the library table, so it is part of the rule set
+            cache = AnalysisCache(f"{RULESET_VERSION}.{self._libraries.digest}")
+        self._cache = cache
+        if similarity is None and self._settings.SIMILARITY_ENABLED:
+            similarity = get_similarity_service()
+        self._similarity = similarity
+
+    @property
+    def rpc(self) -> Optional[RPCClient]:
+        return self._rpc
 
     def fetch_source(self, address: str) -> Dict[str, Any]:
         api_key = self._settings.ETHERSCAN_API_KEY
         if not api_key:
             return {}
         url = (
-            "https://api.etherscan.io/api"
+            f"{self._settings.ETHERSCAN_API_URL}"
             f"?module=contract&action=getsourcecode&address={address}&apikey={api_key}"
         )
         try:
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
+            with stage_timer("etherscan_fetch"):
+                resp = self._http.get(url, timeout=15)
+                resp.raise_for_status()
         except requests.RequestException as exc:
-            raise ExternalServiceError("Etherscan", str(exc))
+            raise ExternalServiceError("Etherscan", str(exc)) from exc
         data = resp.json()
         if data.get("status") != "1":
             return {}
         return data.get("result", [{}])[0]
 
-    def analyze_source(self, source: str) -> Dict[str, Any]:
-        findings = []
-        lower = source.lower()
-        for pat in SUSPICIOUS_PATTERNS:
-            if re.search(pat, lower):
-                findings.append({"pattern": pat, "snippet": _grab_snippet(lower, pat)})
-        if "mint" in lower and ("onlyowner" in lower or "owner" in lower):
-            findings.append({"pattern": "owner-mint", "snippet": "owner-only mint functions detected"})
-        score = min(100, 10 * len(findings))
+    def _scan(self, files: Dict[str, str]) -> Dict[str, Any]:
+        """Scan lower-cased files; one finding per (file, pattern), scored on distinct patterns."""
+        findings: List[Dict[str, Any]] = []
+        matched = set()
+        with stage_timer("regex_scan"):
+            for path, lower in files.items():
+                for pat, rx in _COMPILED:
+                    m = rx.search(lower)
+                    if m:
+                        matched.add(pat)
+                        findings.append(
+                            {
+                                "pattern": pat,
+                                "snippet": _snippet(lower, m),
+                                "file": path if path != SINGLE_FILE else None,
+                                "line": lower.count("\n", 0, m.start()) + 1,
+                            }
+                        )
+            texts = files.values()
+            if any("mint" in lower for lower in texts) and any("owner" in lower for lower in texts):
+                matched.add("owner-mint")
+                findings.append({"pattern": "owner-mint", "snippet": "owner-only mint functions detected"})
+        score = min(100, 10 * len(matched))
         return {"score": score, "findings": findings}
 
-    def analyze_contract(self, address: str) -> Dict[str, Any]:
+    def analyze_source(self, source: str) -> Dict[str, Any]:
+        """Split ``source`` into files, skip known library files and scan the rest.
+
+        Results are cached per (file hashes, rule-set version), so clones are scanned once.
+        """
+        files = split_sources(source)
+        hashes = {path: file_hash(content) for path, content in files.items()}
+        skipped = sorted(path for path, h in hashes.items() if h in self._libraries.hashes)
+
+        def project() -> Dict[str, str]:
+            return {path: normalize_source(content) for path, content in files.items() if path not in skipped}
+
+        cache = self._cache
+        key = source_key(hashes) if cache is not None else ""
+        if cache is not None:
+            result = cache.get(key)
+            if result is not None:
+                return self._with_similar(
+                    {**result, "cached": True}, "source", lambda sim: sim.source_signature(project().values())
+                )
+
+        lowered = project()
+        result = {**self._scan(lowered), "files_scanned": len(lowered), "files_skipped": skipped}
+        if self._similarity is not None:
+            # kept with the cached result so a hit never re-shingles the source
+            result["signature"] = self._similarity.encode(self._similarity.source_signature(lowered.values()))
+        if cache is not None:
+            cache.put(key, result)
+        return self._with_similar(
+            {**result, "cached": False}, "source", lambda sim: sim.source_signature(lowered.values())
+        )
+
+    def _with_similar(
+        self, result: Dict[str, Any], kind: str, sign: Callable[[SimilarityService], Any]
+    ) -> Dict[str, Any]:
+        """Swap the stored signature for the closest known contracts; ``sign`` runs only if it is missing or stale."""
+        encoded = result.pop("signature", None)
+        similarity = self._similarity
+        if similarity is None:
+            return result
+        sig = similarity.decode(encoded)
+        if sig is None:
+            sig = sign(similarity)
+        with stage_timer("similarity_lookup"):
+            result["similar"] = similarity.match(kind, sig)
+        return result
+
+    # ── bytecode ──
+
+    def _analyze_code(self, code: bytes) -> Dict[str, Any]:
+        """Selector and opcode facts for one code blob; cached by code hash like sources."""
+        key = "code:" + hashlib.sha256(code).hexdigest()
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        with stage_timer("bytecode_scan"):
+            selectors, ops = scan(strip_metadata(code))
+        functions: List[str] = []
+        findings: List[Dict[str, Any]] = []
+        for sel in selectors:
+            entry = self._selectors.lookup(sel)
+            if entry is None:
+                continue
+            functions.append(entry["signature"])
+            if entry["category"] != "erc20":
+                findings.append({"pattern": entry["category"], "snippet": entry["signature"]})
+        if SELFDESTRUCT in ops:
+            findings.append({"pattern": "selfdestruct", "snippet": "SELFDESTRUCT opcode present"})
+        result = {
+            "selectors": len(selectors),
+            "functions": functions,
+            "findings": findings,
+            "delegatecall": DELEGATECALL in ops,
+        }
+        if self._similarity is not None:
+            result["signature"] = self._similarity.encode(self._similarity.code_signature(code))
+        if self._cache is not None:
+            self._cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _detect_proxy(
+        rpc: RPCClient, code: bytes, impl_slot: Optional[str], beacon_slot: Optional[str]
+    ) -> Optional[ProxyInfo]:
+        impl = eip1167_implementation(code)
+        if impl:
+            return ProxyInfo("eip1167", impl)
+        impl = slot_to_address(impl_slot)
+        if impl:
+            return ProxyInfo("eip1967", impl)
+        beacon = slot_to_address(beacon_slot)
+        if beacon:
+            ret = rpc.call("eth_call", [{"to": beacon, "data": BEACON_IMPLEMENTATION_CALL}, "latest"])
+            return ProxyInfo("eip1967-beacon", slot_to_address(ret), beacon)
+        return None
+
+    def analyze_bytecode(
+        self, address: str, implementation: Optional[str] = None, follow: bool = True
+    ) -> Dict[str, Any]:
+        """Analyse deployed code via JSON-RPC; proxies are followed one hop to their implementation.
+
+        An ``implementation`` the caller already resolved is used as-is and
+        both codes arrive in one batch, without reading the proxy slots again.
+        With ``follow=False`` the implementation's code is left to the caller.
+        """
+        rpc = self._rpc
+        if rpc is None:
+            return {"error": "Bytecode analysis needs RPC_URL"}
+        impl_hex: Optional[str] = None
+        if implementation is None:
+            code_hex, impl_slot, beacon_slot = rpc.batch(
+                [
+                    ("eth_getCode", [address, "latest"]),
+                    ("eth_getStorageAt", [address, EIP1967_IMPLEMENTATION_SLOT, "latest"]),
+                    ("eth_getStorageAt", [address, EIP1967_BEACON_SLOT, "latest"]),
+                ]
+            )
+        else:
+            calls: List[RPCCall] = [("eth_getCode", [address, "latest"])]
+            if follow:
+                calls.append(("eth_getCode", [implementation, "latest"]))
+            code_hex, *rest = rpc.batch(calls)
+            impl_hex = rest[0] if rest else None
+        code = hex_to_bytes(code_hex)
+        if not code:
+            return {"error": "No contract code at address"}
+
+        if implementation is None:
+            proxy = self._detect_proxy(rpc, code, impl_slot, beacon_slot)
+        else:
+            # resolved from Etherscan's Proxy fields or the EIP-1967 slot
+            kind = "eip1167" if eip1167_implementation(code) else "eip1967"
+            proxy = ProxyInfo(kind, implementation)
+        contracts = [(address, code)]
+        if follow and proxy is not None and proxy.implementation:
+            if impl_hex is None:
+                impl_hex = rpc.call("eth_getCode", [proxy.implementation, "latest"])
+            impl_code = hex_to_bytes(impl_hex)
+            if impl_code:
+                contracts.append((proxy.implementation, impl_code))
+
+        findings: List[Dict[str, Any]] = []
+        functions: List[str] = []
+        similar: Dict[str, Dict[str, Any]] = {}
+        selectors = 0
+        parts = [(addr, blob, self._analyze_code(blob)) for addr, blob in contracts]
+        for addr, blob, part in parts:
+            selectors += part["selectors"]
+            functions.extend(part["functions"])
+            findings.extend({**f, "file": addr} for f in part["findings"])
+            if self._similarity is not None:
+                # an implementation's clone matches count for the proxy too
+                sig = self._similarity.decode(part.get("signature"))
+                if sig is None:
+                    sig = self._similarity.code_signature(blob)
+                for match in self._similarity.match("bytecode", sig):
+                    if match["similarity"] > similar.get(match["id"], {}).get("similarity", -1):
+                        similar[match["id"]] = match
+        if proxy is not None and proxy.kind != "eip1167":
+            findings.append({"pattern": "upgradeable-proxy", "snippet": f"{proxy.kind} proxy", "file": address})
+        elif proxy is None and parts[0][2]["delegatecall"]:
+            findings.append(
+                {"pattern": "delegatecall", "snippet": "DELEGATECALL outside a known proxy pattern", "file": address}
+            )
+
+        score = min(100, 10 * len({f["pattern"] for f in findings}))
+        result = {
+            "score": score,
+            "findings": findings,
+            "bytecode": {
+                "code_size": len(code),
+                "selectors": selectors,
+                "functions": functions,
+                "proxy": proxy._asdict() if proxy is not None else None,
+            },
+        }
+        if self._similarity is not None:
+            result["similar"] = sorted(similar.values(), key=lambda m: -m["similarity"])
+        return result
+
+    # ── proxies ──
+
+    def _implementation_from_slot(self, address: str) -> Optional[str]:
+        if self._rpc is None:
+            return None
+        try:
+            return slot_to_address(self._rpc.call("eth_getStorageAt", [address, EIP1967_IMPLEMENTATION_SLOT, "latest"]))
+        except ExternalServiceError:
+            # best effort — Etherscan's Proxy fields still apply
+            logger.warning("EIP-1967 slot lookup failed", extra={"extra_data": {"address": address}})
+            return None
+
+    def fetch_with_implementation(self, address: str) -> Tuple[Dict[str, Any], Optional[str], Dict[str, Any]]:
+        """Proxy source, implementation address and implementation source.
+
+        With a cached implementation both sources are fetched concurrently, so
+        a known proxy costs one round trip. Otherwise the proxy source and the
+        EIP-1967 slot are read concurrently, then the implementation is fetched.
+        """
+        hit, impl = self._implementations.get(address)
+        if hit:
+            if impl is None:
+                return self.fetch_source(address), None, {}
+            proxy_f = self._pool.submit(carry_context(self.fetch_source), address)
+            impl_f = self._pool.submit(carry_context(self.fetch_source), impl)
+            meta, impl_meta = proxy_f.result(), impl_f.result()
+            upgraded = meta.get("Implementation")
+            if _is_address(upgraded) and upgraded.lower() != impl.lower():
+                # upgraded within the TTL — Etherscan already reports the new target
+                impl, impl_meta = upgraded, self.fetch_source(upgraded)
+                self._implementations.put(address, impl)
+            return meta, impl, impl_meta
+
+        proxy_f = self._pool.submit(carry_context(self.fetch_source), address)
+        slot_f = self._pool.submit(carry_context(self._implementation_from_slot), address)
+        meta = proxy_f.result()
+        listed = meta.get("Implementation") if meta.get("Proxy") == "1" else None
+        impl = listed if _is_address(listed) else slot_f.result()
+        self._implementations.put(address, impl)
+        return meta, impl, (self.fetch_source(impl) if impl else {})
+
+    def _analyze_meta(
+        self, address: str, meta: Dict[str, Any], implementation: Optional[str] = None, follow: bool = True
+    ) -> Tuple[bool, Dict[str, Any]]:
+        source = meta.get("SourceCode") or ""
+        if source:
+            return True, self.analyze_source(source)
+        if self._rpc is not None:
+            return False, self.analyze_bytecode(address, implementation, follow)
+        return False, {"error": "Source not available via Etherscan or API key missing"}
+
+    def validator(
+        self, address: str, meta: Dict[str, Any], impl: Optional[str], impl_meta: Dict[str, Any]
+    ) -> Optional[str]:
+        """Identifies an analysis result before it is computed, from the fetched sources.
+
+        Covers the rule set, the known-library list and the clone corpus
+        generation. None when either contract is unverified — bytecode is
+        only fetched by the analysis itself.
+        """
+        sources = [meta.get("SourceCode") or ""] + ([impl_meta.get("SourceCode") or ""] if impl else [])
+        if not all(sources):
+            return None
+        parts = [
+            RULESET_VERSION,
+            self._libraries.digest,
+            self._similarity.generation if self._similarity is not None else None,
+            address.lower(),
+            impl,
+            *(hashlib.sha256(s.encode("utf-8")).hexdigest() for s in sources),
+        ]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:32]
+
+    def analyze_contract(self, address: str, known: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        """Fetch and analyse ``address`` and its implementation, if it is a proxy.
+
+        With ``known`` — validators the caller already holds — the result
+        carries its ``validator``; when that is in ``known`` the analysis is
+        skipped and ``{"address", "validator", "unchanged": True}`` returned.
+        """
+        with span("analyze"):
+            return self._analyze_contract(address, known)
+
+    def _analyze_contract(self, address: str, known: Optional[Collection[str]]) -> Dict[str, Any]:
         if not address.startswith("0x") or len(address) != 42:
             raise ValidationError("address must be a valid 42-char hex string starting with 0x")
         result: Dict[str, Any] = {
@@ -75,13 +443,26 @@ class ContractService:
             "analysis": {},
         }
         try:
-            src_meta = self.fetch_source(address)
-            source = src_meta.get("SourceCode") or ""
-            if source:
-                result["source_available"] = True
-                result["analysis"] = self.analyze_source(source)
-            else:
-                result["analysis"] = {"error": "Source not available via Etherscan or API key missing"}
+            src_meta, impl, impl_meta = self.fetch_with_implementation(address)
+            if known is not None:
+                result["validator"] = self.validator(address, src_meta, impl, impl_meta)
+                if result["validator"] is not None and result["validator"] in known:
+                    return {"address": address, "validator": result["validator"], "unchanged": True}
+            impl_verified = bool(impl_meta.get("SourceCode"))
+            result["source_available"], result["analysis"] = self._analyze_meta(
+                address, src_meta, impl, follow=not impl_verified
+            )
+            if impl:
+                # an unverified proxy's bytecode analysis already followed an unverified implementation
+                covered = not result["source_available"] and not impl_verified and "bytecode" in result["analysis"]
+                impl_available, impl_analysis = (False, {}) if covered else self._analyze_meta(impl, impl_meta)
+                result["implementation"] = {
+                    "address": impl,
+                    "source_available": impl_available,
+                    "analysis": impl_analysis,
+                }
+                # the proxy's own code is boilerplate — headline the riskier of the two
+                result["analysis"]["score"] = max(result["analysis"].get("score", 0), impl_analysis.get("score", 0))
         except ExternalServiceError:
             raise
         except Exception as exc:
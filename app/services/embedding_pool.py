@@ -0,0 +1,155 @@
+"""
+Multi-process embedding for bulk ingest.
+
+A large ``add_texts`` call is split into chunks that worker processes
+encode in parallel, each with its own copy of the model. Workers write
+their rows straight into one shared-memory buffer at the chunk's offset,
+so embeddings are never pickled back and come out in input order.
+
+Workers are spawned (never forked — torch and FAISS thread pools do not
+survive a fork) on the first large call and kept for the life of the
+process; model loading dominates their start-up. Each gets an equal share
+of the inference threads, so the pool as a whole stays within the CPU quota.
+"""
+
+import json
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger("service.embedding_pool")
+
+# ── worker process ──
+
+_encode: Optional[Callable[[List[str]], np.ndarray]] = None
+
+
+def make_encoder(spec: Dict[str, Any]) -> Callable[[List[str]], np.ndarray]:
+    """Texts → float32 embeddings for the backend described by ``spec`` (see IndexerService._pool_spec)."""
+    kind = spec["kind"]
+    if kind == "hash":
+        from app.services.indexer_service import hash_embed
+
+        return lambda texts: hash_embed(texts, spec["dim"])
+    if kind == "sentence":
+        from sentence_transformers import SentenceTransformer
+
+        from app.services.embedding_runtime import set_torch_threads
+
+        set_torch_threads(spec["threads"])
+        model = SentenceTransformer(spec["model"], device="cpu")
+        return lambda texts: model.encode(texts, convert_to_numpy=True).astype(np.float32)
+    from app.services.embedding_runtime import QuantizedEncoder
+
+    return QuantizedEncoder(
+        spec["model"],
+        spec["runtime"],
+        threads=spec["threads"],
+        batch_size=spec["batch_size"],
+        batch_tokens=spec["batch_tokens"],
+    ).encode
+
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    global _encode
+    _encode = make_encoder(spec)
+
+
+def _worker_encoder() -> Callable[[List[str]], np.ndarray]:
+    if _encode is None:
+        raise RuntimeError("embedding pool worker was not initialised")
+    return _encode
+
+
+def _worker_dim() -> int:
+    return int(_worker_encoder()(["dimension probe"]).shape[1])
+
+
+def _encode_into(name: str, rows: int, dim: int, start: int, texts: List[str]) -> int:
+    # spawned workers share the parent's resource tracker, so attaching here never orphans the segment
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray((rows, dim), dtype=np.float32, buffer=shm.buf)
+        out[start : start + len(texts)] = _worker_encoder()(texts)
+        del out  # release the buffer export before close()
+    finally:
+        shm.close()
+    return len(texts)
+
+
+# ── pool ──
+
+
+class EmbeddingPool:
+    """``workers`` processes encoding chunks of up to ``chunk`` texts into shared memory."""
+
+    def __init__(self, spec: Dict[str, Any], workers: int, chunk: int = 256) -> None:
+        self.spec = spec
+        self.workers = workers
+        self.chunk = chunk
+        self._dim: Optional[int] = None
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+        logger.info("Embedding pool started", extra={"extra_data": {"workers": workers, "backend": spec["kind"]}})
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:
+            self._dim = self._executor.submit(_worker_dim).result()
+        return self._dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for ``texts`` in input order, as one float32 array."""
+        rows, dim = len(texts), self.dim
+        # at least one chunk per worker, so small bulk calls still use every process
+        size = max(1, min(self.chunk, math.ceil(rows / self.workers)))
+        shm = shared_memory.SharedMemory(create=True, size=max(1, rows * dim * 4))
+        futures = []
+        try:
+            futures = [
+                self._executor.submit(_encode_into, shm.name, rows, dim, start, texts[start : start + size])
+                for start in range(0, rows, size)
+            ]
+            for future in futures:
+                future.result()
+            return np.ndarray((rows, dim), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            for future in futures:
+                future.cancel()
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pools: Dict[str, EmbeddingPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(spec: Dict[str, Any], workers: int, chunk: int = 256) -> EmbeddingPool:
+    """The process-wide pool for ``spec``; indexes swapped in from snapshots reuse their predecessor's."""
+    key = json.dumps([spec, workers, chunk], sort_keys=True)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = EmbeddingPool(spec, workers, chunk)
+        return _pools[key]
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
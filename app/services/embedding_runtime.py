@@ -0,0 +1,307 @@
+"""
+CPU inference runtimes for sentence-transformers models.
+
+``QuantizedEncoder`` runs a sentence-transformers model directory without
+sentence-transformers itself: the transformer through ONNX Runtime
+(``onnx``) or torch with int8 dynamic quantisation of its Linear layers
+(``int8``), followed by the model's own pooling and normalisation. ``torch``
+is the unquantised reference the other two are checked against.
+
+Inputs are tokenised once, sorted by length and cut into batches whose
+padded size stays under a token budget, so short texts are never padded to
+the length of a long one. Thread pools are sized to the container's CPU
+quota rather than the host's core count.
+
+Export the ONNX graphs (fp32 and int8) next to a local model:
+
+    python -m app.services.embedding_runtime export ./models/all-MiniLM-L6-v2
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger("service.embedding_runtime")
+
+RUNTIMES = ("torch", "int8", "onnx")
+ONNX_DIR = "onnx"
+ONNX_FILES = ("model.int8.onnx", "model.onnx")  # preferred first
+
+
+# ── CPU quota ──
+
+
+def cpu_quota(cgroup_root: str = "/sys/fs/cgroup") -> float:
+    """CPUs this process may use: the cgroup CFS quota (v2, then v1), else its affinity mask."""
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return min(float(available), int(quota) / int(period))
+        return float(available)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) as f:
+            quota_us = int(f.read())
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")) as f:
+            period_us = int(f.read())
+        if quota_us > 0 and period_us > 0:
+            return min(float(available), quota_us / period_us)
+    except (OSError, ValueError):
+        pass
+    return float(available)
+
+
+def inference_threads(configured: int = 0) -> int:
+    """``configured`` if set, else one thread per whole CPU of quota — oversubscribing a quota only adds throttling."""
+    return configured if configured > 0 else max(1, math.floor(cpu_quota()))
+
+
+def set_torch_threads(threads: int) -> None:
+    import torch
+
+    torch.set_num_threads(threads)
+    with contextlib.suppress(RuntimeError):  # only settable before the first parallel op
+        torch.set_num_interop_threads(1)
+
+
+# ── batching ──
+
+
+def length_batches(lengths: Sequence[int], max_batch: int, max_tokens: int) -> List[List[int]]:
+    """Group row indices into batches of similar length, longest first.
+
+    A batch closes when one more row would take it past ``max_batch`` rows
+    or its padded size (rows × longest row) past ``max_tokens``. A single
+    row longer than ``max_tokens`` still gets a batch of its own.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for i in order:
+        if current and (len(current) >= max_batch or lengths[current[0]] * (len(current) + 1) > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+# ── model directory ──
+
+
+def _local_dir(model_dir: str) -> str:
+    if not os.path.isdir(model_dir):
+        raise FileNotFoundError(
+            f"embedding model directory {model_dir!r} does not exist; runtimes load local models only"
+        )
+    return model_dir
+
+
+def _read_json(path: str) -> Any:
+    """Parsed JSON, or None if the file does not exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _pipeline(model_dir: str) -> Dict[str, Any]:
+    """Pooling mode, normalisation and max length from the sentence-transformers config files."""
+    modules: List[Dict[str, Any]] = _read_json(os.path.join(model_dir, "modules.json")) or []
+    pooling: Dict[str, Any] = {}
+    for module in modules:
+        if module.get("type", "").endswith("Pooling"):
+            pooling = _read_json(os.path.join(model_dir, module.get("path", ""), "config.json")) or {}
+    if pooling.get("pooling_mode_cls_token"):
+        mode = "cls"
+    elif pooling.get("pooling_mode_max_tokens"):
+        mode = "max"
+    else:
+        mode = "mean"  # the sentence-transformers default
+    return {
+        "pooling": mode,
+        "normalize": any(m.get("type", "").endswith("Normalize") for m in modules),
+        "max_length": (_read_json(os.path.join(model_dir, "sentence_bert_config.json")) or {}).get("max_seq_length"),
+    }
+
+
+def _pool(hidden: np.ndarray, mask: np.ndarray, mode: str) -> np.ndarray:
+    pooled: np.ndarray
+    if mode == "cls":
+        pooled = hidden[:, 0]
+    else:
+        m = mask[..., None].astype(hidden.dtype)
+        if mode == "max":
+            pooled = np.where(m > 0, hidden, np.finfo(hidden.dtype).min).max(axis=1)
+        else:
+            pooled = (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+    return pooled
+
+
+class QuantizedEncoder:
+    """Drop-in for ``SentenceTransformer.encode`` on CPU, reading a local model directory only."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        runtime: str = "int8",
+        threads: int = 0,
+        batch_size: int = 32,
+        batch_tokens: int = 8192,
+        max_length: Optional[int] = None,
+    ) -> None:
+        if runtime not in RUNTIMES:
+            raise ValueError(f"runtime must be one of {RUNTIMES}")
+        from transformers import AutoTokenizer
+
+        pipeline = _pipeline(_local_dir(model_dir))
+        self.model_dir = model_dir
+        self.runtime = runtime
+        self.threads = inference_threads(threads)
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.max_length = max_length or pipeline["max_length"] or 256
+        self.pooling = pipeline["pooling"]
+        self.normalize = pipeline["normalize"]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+        if runtime == "onnx":
+            self._session = self._load_onnx()
+            self._inputs = {i.name for i in self._session.get_inputs()}
+        else:
+            self._model = self._load_torch(quantize=runtime == "int8")
+        logger.info(
+            "Embedding runtime loaded",
+            extra={"extra_data": {"model": model_dir, "runtime": runtime, "threads": self.threads}},
+        )
+
+    def _load_torch(self, quantize: bool) -> Any:
+        import torch
+        from transformers import AutoModel
+
+        set_torch_threads(self.threads)
+        model = AutoModel.from_pretrained(self.model_dir, local_files_only=True).eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def _load_onnx(self) -> Any:
+        import onnxruntime as ort
+
+        for name in ONNX_FILES:
+            path = os.path.join(self.model_dir, ONNX_DIR, name)
+            if os.path.exists(path):
+                break
+        else:
+            raise FileNotFoundError(f"no ONNX export under {self.model_dir}/{ONNX_DIR}; run the export command first")
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def _pad(self, seqs: List[List[int]], width: int, feature: str) -> np.ndarray:
+        fill = (self.tokenizer.pad_token_id or 0) if feature == "input_ids" else 0
+        out = np.full((len(seqs), width), fill, dtype=np.int64)
+        left = self.tokenizer.padding_side == "left"
+        for row, seq in enumerate(seqs):
+            if left:
+                out[row, width - len(seq) :] = seq
+            else:
+                out[row, : len(seq)] = seq
+        return out
+
+    def _forward(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        hidden: np.ndarray
+        if self.runtime == "onnx":
+            hidden = self._session.run(None, {k: v for k, v in batch.items() if k in self._inputs})[0]
+            return hidden
+        import torch
+
+        with torch.inference_mode():
+            out = self._model(**{k: torch.from_numpy(v) for k, v in batch.items()})
+        hidden = out.last_hidden_state.numpy()
+        return hidden
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **_: Any) -> np.ndarray:
+        """Embeddings in input order, float32, one row per text."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        features = list(encoded.keys())
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        out = np.empty((len(texts), 0), dtype=np.float32)  # sized by the first batch
+        for rows in length_batches(lengths, self.batch_size, self.batch_tokens):
+            width = max(lengths[i] for i in rows)
+            batch = {f: self._pad([encoded[f][i] for i in rows], width, f) for f in features}
+            pooled = _pool(self._forward(batch), batch["attention_mask"], self.pooling).astype(np.float32)
+            if not out.shape[1]:
+                out = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            out[rows] = pooled
+        if self.normalize:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out
+
+
+# ── CLI ──
+
+
+def export_onnx(model_dir: str, opset: int = 17) -> List[str]:
+    """Write ``onnx/model.onnx`` and, with onnxruntime installed, its int8 twin ``onnx/model.int8.onnx``."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    model = AutoModel.from_pretrained(_local_dir(model_dir), local_files_only=True).eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = list(sample.keys())
+    os.makedirs(os.path.join(model_dir, ONNX_DIR), exist_ok=True)
+    fp32 = os.path.join(model_dir, ONNX_DIR, "model.onnx")
+    axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    torch.onnx.export(
+        model,
+        (dict(sample),),
+        fp32,
+        input_names=names,
+        output_names=["last_hidden_state"],
+        dynamic_axes={**axes, "last_hidden_state": {0: "batch", 1: "sequence"}},
+        opset_version=opset,
+        dynamo=False,
+    )
+    written = [fp32]
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        logger.warning("onnxruntime not installed; int8 ONNX export skipped")
+        return written
+    int8 = os.path.join(model_dir, ONNX_DIR, "model.int8.onnx")
+    quantize_dynamic(fp32, int8, weight_type=QuantType.QInt8)
+    written.append(int8)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prepare local models for the CPU embedding runtimes")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    e = sub.add_parser("export", help="export a sentence-transformers model directory to ONNX (fp32 + int8)")
+    e.add_argument("model_dir")
+    e.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+    for path in export_onnx(args.model_dir, args.opset):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
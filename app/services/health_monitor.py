@@ -0,0 +1,196 @@
+"""
+Dependency health monitor — checks run in the background, probes read the result.
+
+Every HEALTH_CHECK_INTERVAL seconds the monitor probes each dependency
+cheaply: a read-only ``SELECT 1`` against the SQLite files (never schema
+work or writes), a ping to the index server in remote mode (with its own
+HEALTH_CHECK_TIMEOUT), and an HTTP HEAD against Etherscan when a key is
+configured. Results and a short latency history
+are kept per check, and the readiness probe serves the last round without
+doing any I/O itself. A check whose last result is older than
+HEALTH_STALE_AFTER is reported as stale — the monitor itself has stalled.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import requests
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("service.health")
+
+# a probe returns None when healthy, or a status other than "ok"; raising means "down"
+Probe = Callable[[], Optional[str]]
+
+
+@dataclass
+class CheckState:
+    status: str = "unknown"
+    latency_ms: Optional[float] = None
+    checked_at: Optional[float] = None  # time.time() of the last run
+    error: Optional[str] = None
+    history: Deque[float] = field(default_factory=deque)  # latencies in ms, oldest first
+
+
+def sqlite_probe(path: str, timeout: float) -> Probe:
+    """``SELECT 1`` on a read-only connection — fails if the file is missing, locked or corrupt."""
+
+    def probe() -> None:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=timeout)
+        try:
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        finally:
+            conn.close()
+
+    return probe
+
+
+def http_probe(url: str, timeout: float) -> Probe:
+    """Reachability only: any response below 500 counts, so no API quota is spent."""
+
+    def probe() -> Optional[str]:
+        resp = requests.head(url, timeout=timeout, allow_redirects=False)
+        return "degraded" if resp.status_code >= 500 else None
+
+    return probe
+
+
+def indexer_probe(
+    get: Callable[[], Any], warming: Callable[[], bool], ping: Optional[Callable[[], None]] = None
+) -> Probe:
+    """Down if the index failed to load; in remote mode also ``ping`` the index server."""
+
+    def probe() -> Optional[str]:
+        # warming first: a warm-up finishing in between then reads as loaded, never as failed
+        still_warming = warming()
+        indexer = get()
+        if indexer is None:
+            if still_warming:
+                return "warming"
+            raise RuntimeError("index failed to load")
+        if ping is not None:
+            ping()
+        return None
+
+    return probe
+
+
+class HealthMonitor:
+    """Runs ``probes`` on an interval and keeps the latest result of each."""
+
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        interval: Optional[float] = None,
+        stale_after: Optional[float] = None,
+        history: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self.probes = probes
+        self.interval = interval or settings.HEALTH_CHECK_INTERVAL
+        self.stale_after = stale_after or settings.HEALTH_STALE_AFTER
+        self._history = history or settings.HEALTH_HISTORY_SIZE
+        self._states: Dict[str, CheckState] = {name: CheckState(history=deque(maxlen=self._history)) for name in probes}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def for_app(cls, get_indexer: Callable[[], Any], warming: Callable[[], bool]) -> "HealthMonitor":
+        """The dependencies this service has under the current settings."""
+        settings = get_settings()
+        timeout = settings.HEALTH_CHECK_TIMEOUT
+        ping = None
+        if settings.INDEX_MODE == "remote":
+            from app.services.index_client import RemoteIndexer
+
+            # a client of its own, so the probe waits HEALTH_CHECK_TIMEOUT rather than INDEX_SERVER_TIMEOUT
+            ping = RemoteIndexer(timeout=timeout, pool_size=1).ping
+        probes: Dict[str, Probe] = {
+            "indexer": indexer_probe(get_indexer, warming, ping),
+            "database": sqlite_probe(settings.APIKEY_DB_PATH, timeout),
+        }
+        if settings.ANALYSIS_CACHE_ENABLED:
+            probes["analysis_cache"] = sqlite_probe(settings.ANALYSIS_CACHE_DB_PATH, timeout)
+        if settings.ETHERSCAN_API_KEY:
+            probes["etherscan"] = http_probe(settings.ETHERSCAN_API_URL, timeout)
+        else:
+            probes["etherscan"] = lambda: "disabled"  # analyses run without source code
+        return cls(probes)
+
+    # ── checks ──
+
+    def run_check(self, name: str) -> CheckState:
+        state = self._states[name]
+        t0 = time.perf_counter()
+        try:
+            status, error = self.probes[name]() or "ok", None
+        except Exception as exc:
+            status, error = "down", f"{type(exc).__name__}: {exc}"[:200]
+        latency = round((time.perf_counter() - t0) * 1000, 2)
+        if status != state.status and state.checked_at is not None:
+            logger.warning(
+                "Dependency health changed",
+                extra={"extra_data": {"check": name, "from": state.status, "to": status, "error": error}},
+            )
+        state.status, state.error, state.latency_ms, state.checked_at = status, error, latency, time.time()
+        state.history.append(latency)
+        return state
+
+    def run_all(self) -> None:
+        for name in self.probes:
+            self.run_check(name)
+
+    def snapshot(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The last result of every check; reads memory only."""
+        now = time.time() if now is None else now
+        checks = []
+        for name, state in self._states.items():
+            stale = state.checked_at is None or now - state.checked_at > self.stale_after
+            checks.append(
+                {
+                    "name": name,
+                    "status": state.status,
+                    "latency_ms": state.latency_ms,
+                    "checked_at": datetime.fromtimestamp(state.checked_at, timezone.utc) if state.checked_at else None,
+                    "stale": stale,
+                    "error": state.error,
+                    "latency_history_ms": list(state.history),
+                }
+            )
+        return checks
+
+    # ── background loop ──
+
+    def poke(self) -> None:
+        """Run the next round now rather than at the end of the interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(self._wake))
+        logger.info("Health monitor started", extra={"extra_data": {"checks": list(self.probes)}})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self, wake: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_all)
+            except Exception:
+                logger.exception("Health check round failed")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wake.wait(), self.interval)
+            wake.clear()
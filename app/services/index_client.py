@@ -0,0 +1,171 @@
+"""
+Client for the shared index-owner process (see app.services.index_server).
+
+RemoteIndexer is a drop-in for IndexerService on app.state.indexer when
+INDEX_MODE=remote, so HTTP workers stay stateless and every worker sees
+the same writes.
+"""
+
+import queue
+import socket
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.exceptions import AstraBlockError, ExternalServiceError
+from app.core.logging import get_logger
+from app.core.tracing import span
+from app.services.index_server import dumps, loads
+
+logger = get_logger("service.index_client")
+
+# safe to send twice; everything else (add_texts, snapshot exports and loads) is sent at most once
+_IDEMPOTENT = frozenset({"search", "ids", "list_ids", "stats", "ping", "snapshots"})
+
+
+class _Connection:
+    def __init__(self, path: str, timeout: float) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile("rb")
+
+    def close(self) -> None:
+        try:
+            self.rfile.close()
+        finally:
+            self.sock.close()
+
+
+class RemoteIndexer:
+    """IndexerService-compatible proxy with a small pool of persistent connections."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+        pool_size: int = 8,
+    ) -> None:
+        settings = get_settings()
+        self.socket_path = socket_path or settings.INDEX_SERVER_SOCKET
+        self.timeout = timeout or settings.INDEX_SERVER_TIMEOUT
+        self._pool: queue.LifoQueue[_Connection] = queue.LifoQueue(maxsize=pool_size)
+
+    # ── transport ──
+
+    def _acquire(self) -> Tuple[_Connection, bool]:
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return _Connection(self.socket_path, self.timeout), False
+
+    def _release(self, conn: _Connection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _call(self, op: str, **args: Any) -> Any:
+        """One request/response round trip.
+
+        A pooled connection may predate a server restart, so a read-only op
+        is sent once more on a fresh connection if the pooled one turns out
+        to be closed. Nothing is resent after a timeout: the server may still
+        be working on the request.
+        """
+        payload = dumps({"op": op, "args": args}) + b"\n"
+        for attempt in range(2):
+            try:
+                conn, pooled = self._acquire()
+            except OSError as exc:
+                raise ExternalServiceError("Index server", str(exc)) from exc
+            retry = pooled and attempt == 0 and op in _IDEMPOTENT
+            try:
+                conn.sock.sendall(payload)
+                line = conn.rfile.readline()
+            except TimeoutError as exc:
+                conn.close()
+                raise ExternalServiceError("Index server", f"no response within {self.timeout}s") from exc
+            except OSError as exc:
+                conn.close()
+                if retry:
+                    continue
+                raise ExternalServiceError("Index server", str(exc)) from exc
+            if not line:
+                conn.close()
+                if retry:
+                    continue
+                raise ExternalServiceError("Index server", "connection closed by index server")
+            self._release(conn)
+            resp = loads(line)
+            if not resp["ok"]:
+                if "status_code" in resp:
+                    raise AstraBlockError(resp["error"], resp["status_code"], resp["error_code"])
+                raise ExternalServiceError("Index server", resp["error"])
+            return resp["result"]
+        raise ExternalServiceError("Index server", "unreachable")
+
+    # ── IndexerService interface ──
+
+    def add_texts(self, texts: List[str], ids: Optional[List[str]] = None) -> int:
+        with span("index_add"):
+            return int(self._call("add_texts", texts=texts, ids=ids)["indexed"])
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        with span("index_search"):
+            return [(doc_id, float(score)) for doc_id, score in self._call("search", query=query, k=k)]
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._call("ids"))
+
+    def list_ids(self, after: Optional[str] = None, prefix: str = "", limit: int = 100) -> List[str]:
+        return list(self._call("list_ids", after=after, prefix=prefix, limit=limit))
+
+    @property
+    def doc_count(self) -> int:
+        return int(self._call("stats")["doc_count"])
+
+    @property
+    def memory_bytes(self) -> int:
+        return int(self._call("stats")["memory_bytes"])
+
+    @property
+    def generation(self) -> int:
+        return int(self._call("stats")["generation"])
+
+    @property
+    def version(self) -> str:
+        return str(self._call("stats")["version"])
+
+    @property
+    def snapshot_id(self) -> Optional[str]:
+        snapshot_id: Optional[str] = self._call("stats")["snapshot_id"]
+        return snapshot_id
+
+    # ── SnapshotManager interface ──
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        return list(self._call("snapshots"))
+
+    def export_snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        return dict(self._call("export_snapshot", name=name))
+
+    def load_snapshot(self, name: str) -> Dict[str, Any]:
+        return dict(self._call("load_snapshot", name=name))
+
+    def ping(self) -> None:
+        """One round trip; raises ExternalServiceError if the server does not answer within ``timeout``."""
+        self._call("ping")
+
+    def warm_up(self, wait: Optional[float] = None) -> None:
+        """Block until the index server answers — it may still be loading."""
+        deadline = time.monotonic() + (wait if wait is not None else get_settings().INDEX_SERVER_WAIT)
+        while True:
+            try:
+                self.ping()
+                return
+            except ExternalServiceError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
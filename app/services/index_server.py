@@ -0,0 +1,177 @@
+"""
+Index-owner process — holds the embedding model and vector index once and
+serves every HTTP worker over a local Unix socket.
+
+Run it next to a multi-worker uvicorn with INDEX_MODE=remote:
+
+    python -m app.services.index_server
+
+Protocol: one JSON object per line in each direction.
+    → {"op": "search", "args": {"query": "...", "k": 5}}
+    ← {"ok": true, "result": [["doc_1", 0.42], ...]}
+
+Snapshot exports and loads (see app.services.index_snapshot) run outside
+the lock, so searches keep being served while a new index loads. Set
+INDEX_SNAPSHOT_WATCH=true to hot-load snapshots dropped into
+INDEX_SNAPSHOT_DIR.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.exceptions import AstraBlockError
+from app.core.logging import configure_logging, get_logger
+from app.services.index_snapshot import SnapshotManager
+from app.services.indexer_service import IndexerService, build_default_index
+
+logger = get_logger("service.index_server")
+
+# add_texts batches can be large — allow big request lines
+STREAM_LIMIT = 64 * 1024 * 1024
+
+loads: Callable[[bytes], Any]
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except Exception:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    loads = json.loads
+
+
+class IndexServer:
+    """Owns the index for every worker; writes and swaps take one lock, reads run concurrently.
+
+    Every write bumps ``generation`` so clients can tell when results changed.
+    """
+
+    def __init__(self, indexer: IndexerService, socket_path: Optional[str] = None) -> None:
+        self._indexer = indexer
+        self._lock = threading.Lock()
+        self.socket_path = socket_path or get_settings().INDEX_SERVER_SOCKET
+        self.generation = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.snapshots = SnapshotManager(lambda: self._indexer, self._swap)
+
+    def _swap(self, indexer: IndexerService) -> None:
+        with self._lock:
+            self._indexer = indexer
+            self.generation += 1
+
+    # ── dispatch ──
+
+    def _stats(self) -> Dict[str, Any]:
+        indexer = self._indexer
+        return {
+            "doc_count": indexer.doc_count,
+            "generation": self.generation,
+            "memory_bytes": indexer.memory_bytes,
+            "snapshot_id": indexer.snapshot_id,
+            "version": indexer.version,
+        }
+
+    def dispatch(self, op: str, args: Dict[str, Any]) -> Any:
+        if op == "snapshots":
+            return self.snapshots.list_snapshots()
+        if op == "export_snapshot":
+            return self.snapshots.export_snapshot(args.get("name"))
+        if op == "load_snapshot":
+            return self.snapshots.load_snapshot(args["name"])
+        if op == "add_texts":
+            # the indexer serialises its own writes; the lock keeps generation in step with them and with swaps
+            with self._lock:
+                count = self._indexer.add_texts(args["texts"], args.get("ids"))
+                self.generation += 1
+                return {"indexed": count, **self._stats()}
+        # reads never wait on each other, nor on a write in progress
+        indexer = self._indexer
+        if op == "search":
+            return [[doc_id, score] for doc_id, score in indexer.search(args["query"], int(args.get("k", 5)))]
+        if op == "ids":
+            offset = int(args.get("offset", 0))
+            limit = args.get("limit")
+            end = None if limit is None else offset + int(limit)
+            return indexer.ids[offset:end]
+        if op == "list_ids":
+            return indexer.list_ids(args.get("after"), args.get("prefix", ""), int(args.get("limit", 100)))
+        if op == "stats":
+            return self._stats()
+        if op == "ping":
+            return "pong"
+        raise ValueError(f"unknown op: {op}")
+
+    # ── transport ──
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = loads(line)
+                    result = await asyncio.to_thread(self.dispatch, req["op"], req.get("args") or {})
+                    resp = {"ok": True, "result": result}
+                except AstraBlockError as exc:
+                    # passed through so clients raise the same 4xx the server did
+                    resp = {
+                        "ok": False,
+                        "error": exc.message,
+                        "status_code": exc.status_code,
+                        "error_code": exc.error_code,
+                    }
+                except Exception as exc:
+                    resp = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                writer.write(dumps(resp) + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        d = os.path.dirname(self.socket_path)
+        if d and not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=STREAM_LIMIT)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(
+            "Index server listening",
+            extra={"extra_data": {"socket": self.socket_path, "docs": self._indexer.doc_count}},
+        )
+        return self._server
+
+    async def serve_forever(self) -> None:
+        server = await self.start()
+        if get_settings().INDEX_SNAPSHOT_WATCH:
+            self.snapshots.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.snapshots.stop()
+
+
+def main() -> None:
+    settings = get_settings()
+    configure_logging(level=settings.LOG_LEVEL, fmt=settings.LOG_FORMAT)
+    indexer = build_default_index()
+    indexer.warm_up()
+    asyncio.run(IndexServer(indexer).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Index snapshots — point-in-time exports of the live index, and hot reloads.
+
+A snapshot is a directory under INDEX_SNAPSHOT_DIR holding the index files
+and a ``manifest.json`` with their SHA-256 checksums, the embedding backend,
+dimension and document count. Loading one happens off the request path: the
+snapshot is read into a new index next to the live one and validated. Only
+then does the holder's reference switch over. Searches that already took the
+old index finish on it, and it is freed once the last of them returns.
+
+Writes that reach the old index after the snapshot was built are not carried
+over. An offline rebuild replaces the whole index.
+
+Build a snapshot offline from a JSONL file of {"id": ..., "text": ...} lines:
+
+    python -m app.services.index_snapshot build docs.jsonl --name 2024-06-01
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+from app.core.exceptions import AstraBlockError, ConflictError, NotFoundError, ServiceUnavailableError, ValidationError
+from app.core.logging import get_logger
+from app.services.indexer_service import IndexerService
+
+logger = get_logger("service.index_snapshot")
+
+FORMAT = 1
+MANIFEST = "manifest.json"
+SMOKE_QUERY = "snapshot smoke test"
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_name(name: str) -> str:
+    """Snapshot names are single path components — never a path into other directories."""
+    if not _NAME.match(name):
+        raise ValidationError("snapshot names are 1-128 of [A-Za-z0-9._-] and may not start with . - or _")
+    return name
+
+
+def write_snapshot(indexer: IndexerService, directory: str, name: Optional[str] = None) -> Dict[str, Any]:
+    """Export ``indexer`` as snapshot ``name``; appears atomically, so watchers never see it half-written."""
+    now = datetime.now(timezone.utc)
+    name = check_name(name or f"{now:%Y%m%dT%H%M%SZ}-{indexer.doc_count}")
+    final = os.path.join(directory, name)
+    if os.path.exists(final):
+        raise ConflictError(f"Snapshot {name} already exists")
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+    try:
+        info = indexer.save_to(tmp)
+        manifest = {
+            "format": FORMAT,
+            "name": name,
+            "created_at": now.isoformat(),
+            **info,
+            "files": {f: _sha256(os.path.join(tmp, f)) for f in sorted(os.listdir(tmp))},
+        }
+        with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(tmp, final)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    logger.info("Index snapshot written", extra={"extra_data": {"name": name, "docs": manifest["doc_count"]}})
+    return manifest
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            manifest: Dict[str, Any] = json.load(f)
+    except FileNotFoundError:
+        raise NotFoundError("Snapshot", os.path.basename(path)) from None
+    except ValueError:
+        raise ValidationError("snapshot manifest is not valid JSON") from None
+    if manifest.get("format") != FORMAT:
+        raise ValidationError(f"unsupported snapshot format {manifest.get('format')!r}")
+    return manifest
+
+
+def load_snapshot(path: str, like: IndexerService) -> IndexerService:
+    """Read and validate a snapshot into a new index with ``like``'s backend; raises ValidationError."""
+    manifest = read_manifest(path)
+    if manifest["backend"] != like.backend:
+        raise ValidationError(f"snapshot was built with backend {manifest['backend']}, this index uses {like.backend}")
+    for file, expected in manifest["files"].items():
+        if not os.path.exists(os.path.join(path, file)) or _sha256(os.path.join(path, file)) != expected:
+            raise ValidationError(f"snapshot file {file} is missing or fails its checksum")
+    try:
+        svc = like.load_from(path)
+    except (OSError, ValueError, RuntimeError) as exc:
+        raise ValidationError(f"snapshot could not be read: {exc}") from exc
+
+    if not svc.doc_count == svc.vector_count == manifest["doc_count"]:
+        raise ValidationError(
+            f"snapshot holds {svc.doc_count} ids and {svc.vector_count} vectors, manifest says {manifest['doc_count']}"
+        )
+    if svc.doc_count and manifest["dim"] != svc.dim:
+        raise ValidationError(f"snapshot vectors have dim {svc.dim}, manifest says {manifest['dim']}")
+    if svc.doc_count:
+        try:
+            hits = svc.search(SMOKE_QUERY, k=1)
+        except Exception as exc:
+            raise ValidationError(f"smoke query failed: {exc}") from exc
+        if len(hits) != 1 or not math.isfinite(hits[0][1]):
+            raise ValidationError(f"smoke query returned {hits!r}")
+    svc.snapshot_id = manifest["name"]
+    return svc
+
+
+class SnapshotManager:
+    """Exports, validates and swaps snapshots for one index holder.
+
+    ``get`` and ``swap`` read and replace the live index, e.g.
+    ``app.state.indexer`` in an HTTP worker or the index server's own
+    reference. At most one load runs at a time.
+    """
+
+    def __init__(
+        self,
+        get: Callable[[], Optional[IndexerService]],
+        swap: Callable[[IndexerService], None],
+        directory: Optional[str] = None,
+    ) -> None:
+        settings = get_settings()
+        self._get = get
+        self._swap = swap
+        self.directory = directory or settings.INDEX_SNAPSHOT_DIR
+        self._poll_every = settings.INDEX_SNAPSHOT_POLL
+        self._loading = threading.Lock()
+        self._failed: Set[str] = set()  # names not retried by the watcher
+        self._task: Optional[asyncio.Task] = None
+
+    def _live(self) -> IndexerService:
+        indexer = self._get()
+        if indexer is None:
+            raise ServiceUnavailableError("Document index is warming up", retry_after=5)
+        return indexer
+
+    # ── public ──
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Manifests of every complete snapshot, newest name first."""
+        if not os.path.isdir(self.directory):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if _NAME.match(name) and os.path.exists(os.path.join(self.directory, name, MANIFEST)):
+                try:
+                    manifests.append(read_manifest(os.path.join(self.directory, name)))
+                except AstraBlockError:
+                    continue
+        return manifests
+
+    def export_snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        return write_snapshot(self._live(), self.directory, name)
+
+    def load_snapshot(self, name: str) -> Dict[str, Any]:
+        """Validate snapshot ``name`` and make it the live index; the replaced index is released afterwards."""
+        path = os.path.join(self.directory, check_name(name))
+        if not self._loading.acquire(blocking=False):
+            raise ConflictError("A snapshot load is already running")
+        try:
+            old = self._live()
+            started = time.perf_counter()
+            new = load_snapshot(path, old)
+            new._persist()  # a restart comes back on this snapshot
+            self._swap(new)
+        finally:
+            self._loading.release()
+        info = {"name": name, "docs": new.doc_count, "replaced": old.snapshot_id}
+        weakref.finalize(old, logger.info, "Replaced index released", extra={"extra_data": info})
+        logger.info(
+            "Index snapshot loaded",
+            extra={"extra_data": {**info, "load_ms": round((time.perf_counter() - started) * 1000, 1)}},
+        )
+        return read_manifest(path)
+
+    # ── file watch ──
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Load the newest snapshot if it is not live yet; a snapshot that fails validation is skipped."""
+        indexer = self._get()
+        snapshots = self.list_snapshots()
+        if indexer is None or not snapshots:
+            return None
+        name = snapshots[0]["name"]
+        if name == indexer.snapshot_id or name in self._failed:
+            return None
+        try:
+            return self.load_snapshot(name)
+        except ConflictError:
+            return None  # an admin-triggered load is running; look again next time
+        except AstraBlockError as exc:
+            self._failed.add(name)
+            logger.error("Index snapshot rejected", extra={"extra_data": {"name": name, "reason": exc.message}})
+            return None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Index snapshot watcher started", extra={"extra_data": {"directory": self.directory}})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.poll)
+            except Exception:
+                logger.exception("Index snapshot poll failed")
+            await asyncio.sleep(self._poll_every)
+
+
+# ── CLI ──
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build index snapshots offline")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help='index a JSONL file of {"id": ..., "text": ...} lines into a new snapshot')
+    b.add_argument("path")
+    b.add_argument("--name", help="snapshot name; default <UTC time>-<doc count>")
+    # large batches let add_texts spread the embedding over EMBEDDING_POOL_WORKERS processes
+    b.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # a scratch index_path keeps the build away from the live FAISS_INDEX_PATH
+        indexer = IndexerService(index_path=os.path.join(scratch, "build.index"), load_persisted=False)
+        with open(args.path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for i in range(0, len(rows), args.batch):
+            chunk = rows[i : i + args.batch]
+            indexer.add_texts([r["text"] for r in chunk], [str(r["id"]) for r in chunk])
+        manifest = write_snapshot(indexer, get_settings().INDEX_SNAPSHOT_DIR, args.name)
+    print(f"{manifest['name']}  {manifest['doc_count']} docs  {manifest['backend']}")
+
+
+if __name__ == "__main__":
+    main()
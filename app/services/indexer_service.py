@@ -1,69 +1,180 @@
 """
 Vector indexer service — wraps the embedding/search engine.
 """
+
+import bisect
+import copy
+import heapq
+import itertools
+import json
 import os
-from typing import List, Optional, Tuple
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.metrics import INDEX_DOCUMENTS, INDEX_MEMORY_BYTES, stage_timer
+from app.core.tracing import span
+from app.services.projection import Projection
 
 logger = get_logger("service.indexer")
 
-# Optional heavy-weight imports — graceful degradation
-try:
-    import faiss
-    FAISS_AVAILABLE = True
-except Exception:
-    FAISS_AVAILABLE = False
-
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_AVAILABLE = True
-except Exception:
-    SENTENCE_AVAILABLE = False
-
-try:
-    import openai as _openai_mod
-    _settings = get_settings()
-    if _settings.OPENAI_API_KEY:
-        _openai_mod.api_key = _settings.OPENAI_API_KEY
-        OPENAI_AVAILABLE = True
-    else:
-        OPENAI_AVAILABLE = False
-except Exception:
-    OPENAI_AVAILABLE = False
+_INSORT_MAX = 32  # list_ids catches up on writes up to this size with insort, larger ones with a merge
+
+# Optional heavy-weight imports — deferred to first use so importing this
+# module (and app.main) stays cheap; graceful degradation when missing.
+
+
+@lru_cache
+def _faiss():
+    try:
+        import faiss
+
+        return faiss
+    except Exception:
+        return None
+
+
+@lru_cache
+def _sentence_transformer_cls():
+    try:
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer
+    except Exception:
+        return None
+
+
+@lru_cache
+def _runtime_available(runtime: str) -> bool:
+    """Whether the ONNX Runtime / int8 torch embedding runtime can be imported."""
+    try:
+        import transformers  # noqa: F401
+
+        if runtime == "onnx":
+            import onnxruntime  # noqa: F401
+        else:
+            import torch  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+@lru_cache
+def _openai_available() -> bool:
+    settings = get_settings()
+    if not settings.OPENAI_API_KEY:
+        return False
+    try:
+        import openai
+
+        openai.api_key = settings.OPENAI_API_KEY
+        return True
+    except Exception:
+        return False
+
+
+def hash_embed(texts: List[str], dim: int) -> np.ndarray:
+    """Signed feature hashing of lower-cased tokens, L2-normalised."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for tok in text.lower().split():
+            h = zlib.crc32(tok.encode())
+            out[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
 
 
 class IndexerService:
-    """Flexible vector indexer: OpenAI > sentence-transformers+FAISS > TF-IDF."""
+    """Flexible vector indexer: OpenAI > sentence-transformers+FAISS > TF-IDF.
+
+    EMBEDDING_BACKEND pins a backend instead of auto-selecting; ``hash`` is
+    a deterministic, model-free feature-hashing backend for tests and benchmarks.
+    ``onnx`` and ``int8`` run the sentence-transformers model through a
+    faster CPU runtime (see embedding_runtime); they count as the same
+    backend, so indexes and snapshots move freely between the three.
+    """
 
-    def __init__(self, index_path: Optional[str] = None) -> None:
+    def __init__(self, index_path: Optional[str] = None, load_persisted: bool = True) -> None:
         settings = get_settings()
         self.index_path = index_path or settings.FAISS_INDEX_PATH
-        self.ids: List[str] = []
-        self.dim: Optional[int] = None
-        self.faiss_index = None
-        self.vectors: Optional[np.ndarray] = None
-        self.use_openai = OPENAI_AVAILABLE
-        self.use_sentence = SENTENCE_AVAILABLE and not self.use_openai
-        self._vectorizer = None  # lazy TF-IDF
+        self._reset()
+        backend = settings.EMBEDDING_BACKEND
+        # a local model directory replaces the model name for every sentence-transformers runtime
+        self.model_name = settings.EMBEDDING_MODEL_DIR or settings.EMBEDDING_MODEL
+        self.use_hash = backend == "hash"
+        self.use_openai = backend in ("auto", "openai") and _openai_available()
+        self.runtime = backend if backend in ("onnx", "int8") and _runtime_available(backend) else None
+        if backend in ("onnx", "int8") and self.runtime is None:
+            # a pinned runtime never degrades to TF-IDF, whose vectors are not comparable
+            if _sentence_transformer_cls() is None:
+                raise RuntimeError(
+                    f"EMBEDDING_BACKEND={backend} needs "
+                    f"{'onnxruntime' if backend == 'onnx' else 'torch'} and transformers, or sentence-transformers"
+                )
+            logger.warning(
+                "Embedding runtime not installed; using sentence-transformers",
+                extra={"extra_data": {"runtime": backend}},
+            )
+        self.use_sentence = self.runtime is not None or (
+            backend in ("auto", "sentence", "onnx", "int8")
+            and _sentence_transformer_cls() is not None
+            and not self.use_openai
+        )
+        self._hash_dim = settings.EMBEDDING_HASH_DIM
 
-        if self.use_sentence:
-            self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        if self.use_hash:
+            logger.info("Using feature-hashing backend")
+        elif self.runtime is not None:
+            from app.services.embedding_runtime import QuantizedEncoder
+
+            self.model = QuantizedEncoder(
+                self.model_name,
+                self.runtime,
+                threads=settings.EMBEDDING_THREADS,
+                batch_size=settings.EMBEDDING_BATCH_SIZE,
+                batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+            )
+            logger.info("Using sentence-transformers backend", extra={"extra_data": {"runtime": self.runtime}})
+        elif self.use_sentence:
+            from app.services.embedding_runtime import inference_threads, set_torch_threads
+
+            set_torch_threads(inference_threads(settings.EMBEDDING_THREADS))
+            self.model = _sentence_transformer_cls()(self.model_name)
             logger.info("Using sentence-transformers backend")
         elif self.use_openai:
             logger.info("Using OpenAI embeddings backend")
         else:
             logger.info("Using TF-IDF fallback backend")
 
-        self._try_load_persisted()
+        if load_persisted:
+            self._try_load_persisted()
+
+    def _reset(self) -> None:
+        """Empty index state; backend selection and loaded models are kept."""
+        self.ids: List[str] = []
+        self.dim: Optional[int] = None
+        self.faiss_index = None
+        self.vectors: Optional[np.ndarray] = None
+        self._vectorizer = None  # lazy TF-IDF
+        self._sorted_ids: List[str] = []  # sort-ordered view of ids, caught up lazily by list_ids
+        self._sorted_for: Tuple[Optional[List[str]], int] = (None, 0)  # (ids list, length) the view covers
+        self._sorted_lock = threading.Lock()
+        self.snapshot_id: Optional[str] = None  # name of the snapshot this index was loaded from
+        self.projection: Optional[Projection] = None  # fitted on this index's vectors; None = full dimension
+        # serialises writes with snapshot exports; searches never take it
+        self._lock = threading.RLock()
 
     # ── embedding backends ──
 
     def _embed_openai(self, texts: List[str]) -> np.ndarray:
         import openai
+
         embeds = []
         for chunk in texts:
             resp = openai.Embedding.create(model="text-embedding-3-small", input=chunk)
@@ -73,66 +184,182 @@ class IndexerService:
     def _embed_sentence(self, texts: List[str]) -> np.ndarray:
         return self.model.encode(texts, convert_to_numpy=True).astype(np.float32)
 
+    def _embed_hash(self, texts: List[str]) -> np.ndarray:
+        return hash_embed(texts, self._hash_dim)
+
+    # ── bulk embedding ──
+
+    def _pool_spec(self, workers: int) -> Dict[str, Any]:
+        """How a pool worker rebuilds this index's embedder; the pool splits the inference threads between them."""
+        from app.services.embedding_runtime import inference_threads
+
+        settings = get_settings()
+        if self.use_hash:
+            return {"kind": "hash", "dim": self._hash_dim}
+        threads = max(1, inference_threads(settings.EMBEDDING_THREADS) // workers)
+        if self.runtime is not None:
+            return {
+                "kind": "quantized",
+                "model": self.model_name,
+                "runtime": self.runtime,
+                "threads": threads,
+                "batch_size": settings.EMBEDDING_BATCH_SIZE,
+                "batch_tokens": settings.EMBEDDING_BATCH_TOKENS,
+            }
+        return {"kind": "sentence", "model": self.model_name, "threads": threads}
+
+    def _pool_for(self, count: int):
+        """The multi-process embedding pool for a write of ``count`` texts; None below EMBEDDING_POOL_MIN_TEXTS."""
+        settings = get_settings()
+        if count < settings.EMBEDDING_POOL_MIN_TEXTS or not (self.use_hash or self.use_sentence):
+            return None
+        from app.services.embedding_pool import get_pool
+        from app.services.embedding_runtime import cpu_quota
+
+        workers = settings.EMBEDDING_POOL_WORKERS or int(cpu_quota())
+        if workers < 2:
+            return None
+        return get_pool(self._pool_spec(workers), workers, settings.EMBEDDING_POOL_CHUNK)
+
+    # ── projection ──
+
+    def _stored_vectors(self) -> Optional[np.ndarray]:
+        if self.faiss_index is not None:
+            return self.faiss_index.reconstruct_n(0, self.faiss_index.ntotal) if self.faiss_index.ntotal else None
+        return self.vectors
+
+    def _project_for_write(self, embs: np.ndarray) -> np.ndarray:
+        """Project a write's embeddings, first fitting EMBEDDING_PROJECTION once enough vectors exist.
+
+        A PCA index stores full vectors until it holds EMBEDDING_PROJECTION_FIT_MIN
+        of them; fitting then projects those in place.
+        """
+        if self.projection is None:
+            settings = get_settings()
+            kind, out_dim = settings.EMBEDDING_PROJECTION, settings.EMBEDDING_PROJECTION_DIM
+            if kind == "none" or out_dim >= embs.shape[1]:
+                return embs
+            stored = self._stored_vectors()
+            count = len(embs) + (0 if stored is None else len(stored))
+            if kind == "pca" and count < max(out_dim, settings.EMBEDDING_PROJECTION_FIT_MIN):
+                return embs
+            vectors = embs if stored is None else np.vstack([stored, embs])
+            projection = Projection.create(kind, vectors, out_dim, settings.EMBEDDING_PROJECTION_SAMPLE)
+            projected = None if stored is None else projection.apply(stored)
+            index = None
+            if projected is not None and self.faiss_index is not None:
+                index = _faiss().IndexFlatL2(out_dim)
+                index.add(projected)
+            # projection before index: a lock-free search that still sees the full-dimension
+            # index leaves its query unprojected, one that sees the new index projects it
+            self.projection = projection
+            self.dim = out_dim
+            if index is not None:
+                self.faiss_index = index
+            elif projected is not None:
+                self.vectors = projected
+            logger.info(
+                "Embedding projection fitted",
+                extra={"extra_data": {"projection": repr(projection), "vectors": len(vectors)}},
+            )
+        return self.projection.apply(embs)
+
+    def _project_query(self, q_emb: np.ndarray, stored_dim: int) -> np.ndarray:
+        # decided by the dimension of the vectors being searched, so a search racing the first fit stays consistent
+        projection = self.projection
+        if projection is not None and stored_dim == projection.out_dim and q_emb.shape[1] == projection.in_dim:
+            return projection.apply(q_emb)
+        return q_emb
+
     # ── persistence ──
 
     def _try_load_persisted(self) -> None:
-        if FAISS_AVAILABLE and os.path.exists(self.index_path):
+        if _faiss() is not None and os.path.exists(self.index_path):
             try:
-                self.faiss_index = faiss.read_index(self.index_path)
+                self.faiss_index = _faiss().read_index(self.index_path)
                 ids_path = self.index_path + ".ids.npy"
                 if os.path.exists(ids_path):
                     self.ids = list(np.load(ids_path, allow_pickle=True).tolist())
                     self.dim = int(self.faiss_index.d)
+                if os.path.exists(self.index_path + ".projection.npz"):
+                    self.projection = Projection.load(self.index_path + ".projection.npz")
                 logger.info("Loaded persisted FAISS index", extra={"extra_data": {"docs": len(self.ids)}})
+                self._update_gauges()
             except Exception:
                 self.faiss_index = None
 
     def _persist(self) -> None:
-        d = os.path.dirname(self.index_path)
-        if d and not os.path.exists(d):
-            os.makedirs(d, exist_ok=True)
-        if FAISS_AVAILABLE and self.faiss_index is not None:
-            try:
-                faiss.write_index(self.faiss_index, self.index_path)
+        with stage_timer("persist"):
+            d = os.path.dirname(self.index_path)
+            if d and not os.path.exists(d):
+                os.makedirs(d, exist_ok=True)
+            if self.projection is not None:
+                self.projection.save(self.index_path + ".projection.npz")
+            elif os.path.exists(self.index_path + ".projection.npz"):
+                os.remove(self.index_path + ".projection.npz")  # left by an earlier index at this path
+            if _faiss() is not None and self.faiss_index is not None:
+                try:
+                    _faiss().write_index(self.faiss_index, self.index_path)
+                    np.save(self.index_path + ".ids.npy", np.array(self.ids, dtype=object))
+                    return
+                except Exception:
+                    pass
+            if self.vectors is not None:
+                np.save(self.index_path + ".vectors.npy", self.vectors)
                 np.save(self.index_path + ".ids.npy", np.array(self.ids, dtype=object))
-                return
-            except Exception:
-                pass
-        if self.vectors is not None:
-            np.save(self.index_path + ".vectors.npy", self.vectors)
-            np.save(self.index_path + ".ids.npy", np.array(self.ids, dtype=object))
+
+    def _update_gauges(self) -> None:
+        INDEX_DOCUMENTS.set(len(self.ids))
+        INDEX_MEMORY_BYTES.set(self.memory_bytes)
 
     def _ensure_faiss(self, dim: int) -> None:
-        if not FAISS_AVAILABLE:
+        if _faiss() is None:
             return
         if self.faiss_index is None:
-            self.faiss_index = faiss.IndexFlatL2(dim)
+            self.faiss_index = _faiss().IndexFlatL2(dim)
             self.dim = dim
 
     # ── public ──
 
     def add_texts(self, texts: List[str], ids: Optional[List[str]] = None) -> int:
+        with span("index_add"), self._lock:
+            return self._add_texts(texts, ids)
+
+    def _add_texts(self, texts: List[str], ids: Optional[List[str]]) -> int:
         if ids is None:
             ids = [str(i) for i in range(len(self.ids), len(self.ids) + len(texts))]
 
-        if self.use_openai:
-            embs = self._embed_openai(texts)
+        pool = self._pool_for(len(texts))
+        if pool is not None:
+            with stage_timer("embed"):
+                embs = pool.encode(texts)
+        elif self.use_hash:
+            with stage_timer("embed"):
+                embs = self._embed_hash(texts)
+        elif self.use_openai:
+            with stage_timer("embed"):
+                embs = self._embed_openai(texts)
         elif self.use_sentence:
-            embs = self._embed_sentence(texts)
+            with stage_timer("embed"):
+                embs = self._embed_sentence(texts)
         else:
             from sklearn.feature_extraction.text import TfidfVectorizer
-            if self.vectors is None:
-                self._vectorizer = TfidfVectorizer()
-                X = self._vectorizer.fit_transform(texts).toarray().astype(np.float32)
-                self.vectors = X
-            else:
-                X = self._vectorizer.transform(texts).toarray().astype(np.float32)
-                self.vectors = np.vstack([self.vectors, X])
+
+            with stage_timer("embed"):
+                if self.vectors is None:
+                    self._vectorizer = TfidfVectorizer()
+                    X = self._vectorizer.fit_transform(texts).toarray().astype(np.float32)
+                    self.vectors = X
+                else:
+                    X = self._vectorizer.transform(texts).toarray().astype(np.float32)
+                    self.vectors = np.vstack([self.vectors, X])
             self.ids.extend(ids)
             self._persist()
+            self._update_gauges()
             return len(texts)
 
-        if FAISS_AVAILABLE:
+        embs = self._project_for_write(embs)
+        if _faiss() is not None:
             self._ensure_faiss(embs.shape[1])
             self.faiss_index.add(embs)
         else:
@@ -140,42 +367,190 @@ class IndexerService:
 
         self.ids.extend(ids)
         self._persist()
+        self._update_gauges()
         logger.info("Indexed documents", extra={"extra_data": {"count": len(texts)}})
         return len(texts)
 
     def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
-        if self.use_openai:
-            q_emb = self._embed_openai([query])
+        with span("index_search"):
+            return self._search(query, k)
+
+    def _search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        if self.use_hash:
+            with stage_timer("embed"):
+                q_emb = self._embed_hash([query])
+        elif self.use_openai:
+            with stage_timer("embed"):
+                q_emb = self._embed_openai([query])
         elif self.use_sentence:
-            q_emb = self._embed_sentence([query])
+            with stage_timer("embed"):
+                q_emb = self._embed_sentence([query])
         else:
             if self.vectors is None or self._vectorizer is None:
                 return []
-            q_vec = self._vectorizer.transform([query]).toarray().astype(np.float32)
+            with stage_timer("embed"):
+                q_vec = self._vectorizer.transform([query]).toarray().astype(np.float32)
             from sklearn.metrics.pairwise import cosine_similarity
-            sims = cosine_similarity(q_vec, self.vectors)[0]
-            top_idx = np.argsort(-sims)[:k]
+
+            with stage_timer("cosine_search"):
+                sims = cosine_similarity(q_vec, self.vectors)[0]
+                top_idx = np.argsort(-sims)[:k]
             return [(self.ids[int(i)], float(sims[int(i)])) for i in top_idx]
 
-        if FAISS_AVAILABLE and self.faiss_index is not None:
-            D, I = self.faiss_index.search(q_emb, k)
+        index = self.faiss_index
+        if _faiss() is not None and index is not None:
+            q_emb = self._project_query(q_emb, index.d)
+            with stage_timer("faiss_search"):
+                D, I = index.search(q_emb, k)
             results = []
             for score, idx in zip(D[0], I[0]):
                 if 0 <= idx < len(self.ids):
                     results.append((self.ids[idx], float(score)))
             return results
 
-        if self.vectors is None:
+        vectors = self.vectors
+        if vectors is None:
             return []
+        q_emb = self._project_query(q_emb, vectors.shape[1])
         from sklearn.metrics.pairwise import cosine_similarity
-        sims = cosine_similarity(q_emb, self.vectors)[0]
-        top_idx = np.argsort(-sims)[:k]
+
+        with stage_timer("cosine_search"):
+            sims = cosine_similarity(q_emb, vectors)[0]
+            top_idx = np.argsort(-sims)[:k]
         return [(self.ids[int(i)], float(sims[int(i)])) for i in top_idx]
 
+    def warm_up(self) -> None:
+        """Run one throwaway query so the first real request skips lazy init / JIT.
+
+        Skipped for OpenAI, where it would cost a paid API round trip.
+        """
+        if self.use_openai:
+            return
+        self.search("warm-up", k=1)  # embeds the query, so it loads the model and the index path alike
+
+    def _sorted_view(self) -> List[str]:
+        """``ids`` in sort order. Call with ``_sorted_lock`` held.
+
+        ids are append-only, so (list, length) says what the view already
+        covers: a few new ids are insorted, a bulk write is sorted on its own
+        and merged in, and only a replaced list (reset, snapshot load) is
+        sorted from scratch.
+        """
+        ids = self.ids
+        count = len(ids)
+        seen_list, seen = self._sorted_for
+        if seen_list is not ids or seen > count:
+            self._sorted_ids = sorted(ids[:count])
+        elif count - seen <= _INSORT_MAX:
+            for doc_id in ids[seen:count]:
+                bisect.insort(self._sorted_ids, doc_id)
+        else:
+            self._sorted_ids = list(heapq.merge(self._sorted_ids, sorted(ids[seen:count])))
+        self._sorted_for = (ids, count)
+        return self._sorted_ids
+
+    def list_ids(self, after: Optional[str] = None, prefix: str = "", limit: int = 100) -> List[str]:
+        """Up to ``limit`` ids in sort order, starting with ``prefix`` and greater than ``after``."""
+        with self._sorted_lock:
+            ordered = self._sorted_view()
+            start = bisect.bisect_left(ordered, prefix)
+            if after is not None:
+                start = max(start, bisect.bisect_right(ordered, after))
+            page = ordered[start : start + limit]
+        if prefix and page and not page[-1].startswith(prefix):
+            # ids sharing the prefix are contiguous, so the matches are a head of the page
+            page = list(itertools.takewhile(lambda i: i.startswith(prefix), page))
+        return page
+
     @property
     def doc_count(self) -> int:
         return len(self.ids)
 
+    @property
+    def version(self) -> str:
+        """Changes with every write and snapshot load; the same after a restart of an unchanged index."""
+        return json.dumps([self.backend, self.snapshot_id, len(self.ids), self.ids[-1] if self.ids else None])
+
+    @property
+    def vector_count(self) -> int:
+        if self.faiss_index is not None:
+            return int(self.faiss_index.ntotal)
+        return 0 if self.vectors is None else int(self.vectors.shape[0])
+
+    @property
+    def backend(self) -> str:
+        """Embedding backend identity; vectors are only comparable between equal backends."""
+        if self.use_hash:
+            return f"hash-{self._hash_dim}"
+        if self.use_openai:
+            return "openai"
+        if self.use_sentence:
+            return f"sentence:{self.model_name}"
+        return "tfidf"
+
+    # ── snapshots ──
+
+    def save_to(self, directory: str) -> Dict[str, Any]:
+        """Write a point-in-time copy of the index into ``directory``.
+
+        Holds the write lock, so concurrent ``add_texts`` calls wait and
+        searches carry on.
+        """
+        with self._lock:
+            with open(os.path.join(directory, "ids.json"), "w", encoding="utf-8") as f:
+                json.dump(self.ids, f)
+            if self.faiss_index is not None:
+                _faiss().write_index(self.faiss_index, os.path.join(directory, "index.faiss"))
+            elif self.vectors is not None:
+                np.save(os.path.join(directory, "vectors.npy"), self.vectors)
+            if self._vectorizer is not None:
+                with open(os.path.join(directory, "tfidf_vocabulary.json"), "w", encoding="utf-8") as f:
+                    json.dump({term: int(i) for term, i in self._vectorizer.vocabulary_.items()}, f)
+                np.save(os.path.join(directory, "tfidf_idf.npy"), self._vectorizer.idf_)
+            if self.projection is not None:
+                self.projection.save(os.path.join(directory, "projection.npz"))
+            dim = int(self.vectors.shape[1]) if self.vectors is not None else self.dim
+            return {
+                "backend": self.backend,
+                "dim": dim,
+                "doc_count": len(self.ids),
+                "projection": repr(self.projection) if self.projection is not None else None,
+            }
+
+    def load_from(self, directory: str) -> "IndexerService":
+        """New index with the contents of a ``save_to`` directory, sharing this one's backend and model."""
+        svc = copy.copy(self)
+        svc._reset()
+        with open(os.path.join(directory, "ids.json"), encoding="utf-8") as f:
+            svc.ids = json.load(f)
+        if os.path.exists(os.path.join(directory, "index.faiss")):
+            if _faiss() is None:
+                raise RuntimeError("snapshot holds a FAISS index but faiss is not installed")
+            index = _faiss().read_index(os.path.join(directory, "index.faiss"))
+            svc.faiss_index, svc.dim = index, int(index.d)
+        elif os.path.exists(os.path.join(directory, "vectors.npy")):
+            svc.vectors = np.load(os.path.join(directory, "vectors.npy"), allow_pickle=False)
+            svc.dim = int(svc.vectors.shape[1])
+        if os.path.exists(os.path.join(directory, "tfidf_vocabulary.json")):
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            with open(os.path.join(directory, "tfidf_vocabulary.json"), encoding="utf-8") as f:
+                vectorizer = TfidfVectorizer(vocabulary=json.load(f))
+            vectorizer.idf_ = np.load(os.path.join(directory, "tfidf_idf.npy"), allow_pickle=False)
+            svc._vectorizer = vectorizer
+        if os.path.exists(os.path.join(directory, "projection.npz")):
+            svc.projection = Projection.load(os.path.join(directory, "projection.npz"))
+        return svc
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by stored vectors (FAISS flat index or numpy matrix)."""
+        if self.faiss_index is not None:
+            return int(self.faiss_index.ntotal) * int(self.faiss_index.d) * 4
+        if self.vectors is not None:
+            return int(self.vectors.nbytes)
+        return 0
+
 
 def build_default_index() -> IndexerService:
     """Build the starter index with sample documents."""
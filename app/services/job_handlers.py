@@ -0,0 +1,51 @@
+"""
+Handlers for the built-in job types.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from app.core.config import get_settings
+from app.core.exceptions import AstraBlockError, ServiceUnavailableError
+from app.services.contract_service import ContractService
+from app.services.job_service import Handler, JobContext
+
+
+def ingest_handler(get_indexer: Callable[[], Any]) -> Handler:
+    """Index ``docs`` in JOB_INGEST_BATCH batches; the checkpoint is the number of docs already indexed.
+
+    Every add_texts call persists the whole index, so batches are large: a
+    handful of writes per job, each big enough for the embedding pool.
+    """
+
+    def run(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, int]:
+        indexer = get_indexer()
+        if indexer is None:
+            raise ServiceUnavailableError("Document index is not available")
+        docs: List[str] = payload["docs"]
+        ids = payload.get("ids")
+        done = int(ctx.checkpoint or 0)
+        batch = max(1, get_settings().JOB_INGEST_BATCH)
+        for start in range(done, len(docs), batch):
+            end = min(start + batch, len(docs))
+            indexer.add_texts(docs[start:end], ids[start:end] if ids else None)
+            ctx.report(end / len(docs), end)
+        return {"indexed": len(docs), "total_docs": indexer.doc_count}
+
+    return run
+
+
+def analyze_handler(service: ContractService) -> Handler:
+    """Analyse each address; one address failing does not fail the batch."""
+
+    def run(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+        addresses: List[str] = payload["addresses"]
+        results = []
+        for i, address in enumerate(addresses, 1):
+            try:
+                results.append(service.analyze_contract(address))
+            except AstraBlockError as exc:
+                results.append({"address": address, "source_available": False, "analysis": {"error": exc.message}})
+            ctx.report(i / len(addresses))
+        return {"results": results}
+
+    return run
@@ -0,0 +1,170 @@
+"""
+In-process background jobs backed by the SQLite job table.
+
+Each job type gets its own pool of asyncio workers (its concurrency limit);
+handlers are plain functions run in the threadpool so they never block the
+event loop. Queued and interrupted jobs survive restarts: a graceful
+shutdown requeues its running jobs at once, and jobs whose worker died
+are requeued once their heartbeat is JOB_STALE_SECONDS old, up to
+JOB_MAX_ATTEMPTS times. Delivery is at-least-once; handlers resume from
+their last checkpoint.
+"""
+
+import asyncio
+import contextlib
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.repositories.job_repository import JobRepository
+
+logger = get_logger("service.jobs")
+
+
+class JobContext:
+    """Passed to handlers: the checkpoint saved by a previous attempt, and a progress reporter."""
+
+    def __init__(self, repo: JobRepository, job: dict) -> None:
+        self._repo = repo
+        self.job_id: str = job["id"]
+        self.checkpoint: Any = job.get("checkpoint")
+        self.attempt: int = job.get("attempts", 1)
+
+    def report(self, progress: float, checkpoint: Any = None) -> None:
+        self._repo.set_progress(self.job_id, max(0.0, min(1.0, progress)), checkpoint)
+
+
+# handler(payload, ctx) -> JSON-serialisable result
+Handler = Callable[[Any, JobContext], Any]
+
+
+@dataclass
+class JobType:
+    handler: Handler
+    concurrency: int = 1
+    ready: Optional[Callable[[], Awaitable[None]]] = None  # awaited before the first claim
+
+
+class JobManager:
+    def __init__(self, repo: Optional[JobRepository] = None) -> None:
+        settings = get_settings()
+        self._repo = repo or JobRepository()
+        self._types: Dict[str, JobType] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running: Set[str] = set()
+        self._poll = settings.JOB_POLL_INTERVAL
+        self._stale_after = settings.JOB_STALE_SECONDS
+        self._max_attempts = settings.JOB_MAX_ATTEMPTS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    # ── setup ──
+
+    def register(
+        self,
+        job_type: str,
+        handler: Handler,
+        concurrency: int = 1,
+        ready: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
+        self._types[job_type] = JobType(handler, max(1, concurrency), ready)
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._repo.requeue_stale, self._stale_after, self._max_attempts)
+        for name, spec in self._types.items():
+            self._wakeups[name] = asyncio.Event()
+            for _ in range(spec.concurrency):
+                self._tasks.append(asyncio.create_task(self._worker(name, spec)))
+        self._tasks.append(asyncio.create_task(self._housekeeping()))
+        logger.info(
+            "Job workers started",
+            extra={"extra_data": {"types": {n: t.concurrency for n, t in self._types.items()}}},
+        )
+
+    async def stop(self) -> None:
+        """Cancel workers and requeue the jobs they were running."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._running:
+            await asyncio.to_thread(self._repo.release, list(self._running))
+            self._running.clear()
+
+    # ── public ──
+
+    def submit(self, job_type: str, payload: Any, priority: int = 0, owner: Optional[str] = None) -> dict:
+        if job_type not in self._types:
+            raise ValueError(f"unknown job type: {job_type}")
+        job = self._repo.create(job_type, payload, priority, owner)
+        event = self._wakeups.get(job_type)
+        if event is not None:
+            event.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._repo.get(job_id)
+
+    # ── workers ──
+
+    async def _worker(self, name: str, spec: JobType) -> None:
+        if spec.ready is not None:
+            await spec.ready()
+        wakeup = self._wakeups[name]
+        while True:
+            try:
+                job = await asyncio.to_thread(self._repo.claim, name, self.worker_id)
+                if job is None:
+                    wakeup.clear()
+                    # other processes may enqueue too — fall back to polling
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(wakeup.wait(), timeout=self._poll)
+                    continue
+                await self._run(spec, job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. a locked database; a dead worker task would stop this job type for good
+                logger.exception("Job worker error", extra={"extra_data": {"type": name}})
+                await asyncio.sleep(self._poll)
+
+    async def _run(self, spec: JobType, job: dict) -> None:
+        job_id = job["id"]
+        extra = {"extra_data": {"job_id": job_id, "type": job["type"]}}
+        self._running.add(job_id)
+        error: Optional[str] = None
+        try:
+            result = await asyncio.to_thread(spec.handler, job["payload"], JobContext(self._repo, job))
+        except asyncio.CancelledError:
+            raise  # shutting down — stop() requeues it
+        except Exception as exc:
+            logger.exception("Job failed", extra=extra)
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            try:
+                await asyncio.to_thread(self._repo.succeed, job_id, result)
+                logger.info("Job finished", extra=extra)
+            except Exception as exc:
+                # a result that does not serialise must not leave the job running until its lease expires
+                logger.exception("Job result could not be stored", extra=extra)
+                error = f"result not stored: {type(exc).__name__}: {exc}"
+        try:
+            if error is not None:
+                await asyncio.to_thread(self._repo.fail, job_id, error)
+        finally:
+            # no longer heartbeated: if the write above failed, the lease expires and the job is requeued
+            self._running.discard(job_id)
+
+    async def _housekeeping(self) -> None:
+        interval = max(1.0, self._stale_after / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self._repo.heartbeat, list(self._running))
+                await asyncio.to_thread(self._repo.requeue_stale, self._stale_after, self._max_attempts)
+            except Exception:
+                logger.exception("Job housekeeping failed")
@@ -0,0 +1,142 @@
+"""
+Hashes of audited library files (OpenZeppelin, Solmate, ...) that the
+analyzer skips. Matching is by content hash only, never by path, so a
+modified copy under ``@openzeppelin/`` is still scanned.
+
+The bundled table is generated at image build time from the pinned npm
+releases in RELEASES (``python -m app.services.known_libraries fetch``).
+Extend it from checked-out library sources with:
+
+    python -m app.services.known_libraries build node_modules/@openzeppelin/contracts \\
+        --label openzeppelin-contracts@4.9.3 --out app/resources/known_libraries.json
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.services.source_files import file_hash
+
+logger = get_logger("service.known_libraries")
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "resources" / "known_libraries.json"
+NPM_REGISTRY = "https://registry.npmjs.org"
+
+# (npm package, version) pairs hashed into the bundled table
+RELEASES: Tuple[Tuple[str, str], ...] = (
+    ("@openzeppelin/contracts", "3.4.2"),
+    ("@openzeppelin/contracts", "4.9.6"),
+    ("@openzeppelin/contracts", "5.0.2"),
+    ("@openzeppelin/contracts-upgradeable", "4.9.6"),
+    ("@openzeppelin/contracts-upgradeable", "5.0.2"),
+    ("solmate", "6.2.0"),
+)
+
+
+class KnownLibraries:
+    """Lookup table of library file hash → ``package@version:path`` label."""
+
+    def __init__(self, hashes: Optional[Dict[str, str]] = None) -> None:
+        self.hashes: Dict[str, str] = dict(hashes or {})
+        # part of the analysis cache key — a new table must invalidate cached results
+        self.digest = hashlib.sha256("\n".join(sorted(self.hashes)).encode()).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "KnownLibraries":
+        path = path or str(DEFAULT_PATH)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                hashes = json.load(fh).get("hashes", {})
+        except FileNotFoundError:
+            logger.warning("Known-library table not found", extra={"extra_data": {"path": path}})
+            hashes = {}
+        logger.info("Known-library table loaded", extra={"extra_data": {"files": len(hashes)}})
+        return cls(hashes)
+
+    def match(self, content: str) -> Optional[str]:
+        return self.hashes.get(file_hash(content))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+
+@lru_cache(maxsize=1)
+def get_known_libraries() -> KnownLibraries:
+    return KnownLibraries.load(get_settings().KNOWN_LIBRARIES_PATH)
+
+
+# ── builder CLI ──
+
+
+def build(root: str, label: str, out: str) -> int:
+    """Hash every ``.sol`` file under ``root`` into ``out``, merging with existing entries."""
+    table: Dict[str, Any] = {"version": 1, "hashes": {}}
+    if os.path.exists(out):
+        with open(out, encoding="utf-8") as fh:
+            table = json.load(fh)
+    added = 0
+    for path in sorted(Path(root).rglob("*.sol")):
+        content = path.read_text(encoding="utf-8")
+        table["hashes"][file_hash(content)] = f"{label}:{path.relative_to(root).as_posix()}"
+        added += 1
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(table, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    return added
+
+
+def _download(url: str) -> bytes:
+    resp = requests.get(url, timeout=60)
+    resp.raise_for_status()
+    return resp.content
+
+
+def fetch(out: str, releases: Tuple[Tuple[str, str], ...] = RELEASES, registry: str = NPM_REGISTRY) -> int:
+    """Download each npm release tarball and ``build`` its ``.sol`` files into ``out``."""
+    added = 0
+    for package, version in releases:
+        url = f"{registry}/{package}/-/{package.rsplit('/', 1)[-1]}-{version}.tgz"
+        label = f"{package.lstrip('@').replace('/', '-')}@{version}"
+        with tempfile.TemporaryDirectory() as tmp:
+            with tarfile.open(fileobj=io.BytesIO(_download(url)), mode="r:gz") as tar:
+                tar.extractall(tmp, filter="data")
+            added += build(os.path.join(tmp, "package"), label, out)
+    return added
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the known-library hash table")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="hash all .sol files under a directory")
+    b.add_argument("root")
+    b.add_argument("--label", required=True, help="e.g. openzeppelin-contracts@4.9.3")
+    b.add_argument("--out", default=str(DEFAULT_PATH))
+    f = sub.add_parser("fetch", help="hash the pinned npm releases in RELEASES")
+    f.add_argument("--registry", default=NPM_REGISTRY)
+    f.add_argument("--out", default=str(DEFAULT_PATH))
+    args = parser.parse_args()
+    if args.cmd == "fetch":
+        added = fetch(args.out, registry=args.registry)
+        source = f"{len(RELEASES)} releases"
+    else:
+        added = build(args.root, args.label, args.out)
+        source = args.root
+    print(f"hashed {added} files from {source} into {args.out}")
+    if not added:
+        sys.exit("no library files hashed")  # an empty table would silently skip nothing
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+MinHash signatures and a banded LSH index for near-duplicate contracts.
+
+Signatures use one-permutation hashing with rotation densification: each
+shingle is hashed once, its low bits pick a bin and the bin keeps its
+minimum. A signature therefore costs O(shingles) instead of
+O(shingles × permutations), which keeps the lookup cheap enough to run on
+every analysis. The fraction of equal bins between two signatures
+estimates the Jaccard similarity of their shingle sets.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.bytecode import disassemble, strip_metadata
+
+_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+
+# odd 64-bit multipliers for combining a shingle's token hashes
+_MIX = np.array(
+    [
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+        0xFF51AFD7ED558CCD,
+        0xC4CEB9FE1A85EC53,
+        0x94D049BB133111EB,
+        0xBF58476D1CE4E5B9,
+    ],
+    dtype=np.uint64,
+)
+MAX_SHINGLE_SIZE = len(_MIX)
+
+
+def _finalize(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser — spreads combined hashes over all 64 bits."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    out: np.ndarray = h ^ (h >> np.uint64(31))
+    return out
+
+
+def shingle_hashes(tokens: np.ndarray, k: int) -> np.ndarray:
+    """64-bit hashes of every run of ``k`` consecutive token hashes."""
+    if not 1 <= k <= MAX_SHINGLE_SIZE:
+        raise ValueError(f"shingle size must be 1..{MAX_SHINGLE_SIZE}")
+    tokens = tokens.astype(np.uint64)
+    if len(tokens) < k:
+        if not len(tokens):
+            return tokens
+        k = len(tokens)  # a short text is one shingle
+    n = len(tokens) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h += tokens[j : j + n] * _MIX[j]
+    return _finalize(h)
+
+
+def source_tokens(lowered_files: Iterable[str]) -> np.ndarray:
+    """Hashes of the whitespace-separated words of lower-cased Solidity, comments removed.
+
+    Splitting on whitespace runs in C, which keeps shingling a small
+    fraction of the regex scan even for megabyte sources.
+    """
+    words: List[str] = []
+    for text in lowered_files:
+        words.extend(_COMMENTS.sub(" ", text).split())
+    ids = {w: zlib.crc32(w.encode()) + 1 for w in set(words)}
+    return np.fromiter(map(ids.__getitem__, words), dtype=np.uint64, count=len(words))
+
+
+def opcode_tokens(code: bytes) -> np.ndarray:
+    """Opcode sequence of runtime code; PUSH data is dropped so embedded addresses don't matter."""
+    return np.fromiter((ins.op + 1 for ins in disassemble(strip_metadata(code))), dtype=np.uint64)
+
+
+class MinHasher:
+    """One-permutation MinHash with ``num_perm`` bins (a power of two)."""
+
+    def __init__(self, num_perm: int = 128) -> None:
+        if num_perm < 2 or num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        self.num_perm = num_perm
+        self._bits = np.uint64(num_perm.bit_length() - 1)
+        self._mask = np.uint64(num_perm - 1)
+        # rotated values are offset by whole bin widths so they never equal real ones
+        self._offsets = np.arange(num_perm, dtype=np.uint64) << (np.uint64(64) - self._bits)
+
+    def signature(self, hashes: np.ndarray) -> Optional[np.ndarray]:
+        """Signature of a set of shingle hashes; None for an empty set."""
+        if not len(hashes):
+            return None
+        sig = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        np.minimum.at(sig, (hashes & self._mask).astype(np.intp), hashes >> self._bits)
+        empty = sig == np.iinfo(np.uint64).max
+        if empty.any():
+            # each empty bin borrows the next non-empty bin to its right (circularly)
+            filled = np.flatnonzero(~empty)
+            idx = np.arange(self.num_perm)
+            pos = np.searchsorted(filled, idx) % len(filled)
+            src = filled[pos]
+            dist = (src - idx) % self.num_perm
+            sig = np.where(empty, sig[src] + self._offsets[dist], sig)
+        return sig
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures.
+
+    Signatures sharing any band land in the same bucket, so a lookup only
+    compares against those candidates instead of every stored signature.
+    With ``b`` bands of ``r`` rows, pairs above roughly ``(1/b)^(1/r)``
+    Jaccard become candidates.
+    """
+
+    def __init__(self, num_perm: int, bands: int) -> None:
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _keys(self, sig: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        r = self.rows
+        return ((i, sig[i * r : (i + 1) * r].tobytes()) for i in range(self.bands))
+
+    def add(self, key: str, sig: np.ndarray) -> None:
+        self.remove(key)
+        self._signatures[key] = sig
+        for band, k in self._keys(sig):
+            self._buckets[band].setdefault(k, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for band, k in self._keys(sig):
+            bucket = self._buckets[band].get(k)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][k]
+
+    def candidates(self, sig: np.ndarray) -> Set[str]:
+        found: Set[str] = set()
+        for band, k in self._keys(sig):
+            found |= self._buckets[band].get(k, set())
+        return found
+
+    def query(self, sig: np.ndarray, k: int = 5, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        """Up to ``k`` (key, estimated Jaccard) pairs at or above ``threshold``, closest first."""
+        keys = list(self.candidates(sig))
+        if not keys:
+            return []
+        sims = np.count_nonzero(np.stack([self._signatures[key] for key in keys]) == sig, axis=1) / len(sig)
+        order = np.argsort(-sims, kind="stable")[:k]
+        return [(keys[i], float(sims[i])) for i in order if sims[i] >= threshold]
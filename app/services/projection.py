@@ -0,0 +1,103 @@
+"""
+Dimensionality reduction for stored embeddings.
+
+A ``Projection`` maps embeddings to fewer dimensions before they are stored
+or searched, cutting the flat index's memory and per-query scan cost in
+proportion. ``pca`` is fitted on a sample of the index's own vectors;
+``truncate`` keeps the leading dimensions, which is what Matryoshka-trained
+models (OpenAI ``text-embedding-3-*``, nomic, ...) are built for. Both
+re-normalise, so inner-product and L2 rankings stay cosine rankings.
+
+The projection belongs to the index it was fitted on and is saved with it,
+so indexes and snapshots with different dimensions can coexist.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+KINDS = ("pca", "truncate")
+
+
+def _normalise(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    out: np.ndarray = (x / norms).astype(np.float32)
+    return out
+
+
+class Projection:
+    """Linear map ``in_dim → out_dim``: ``(x - mean) @ components.T``, then L2-normalised."""
+
+    def __init__(self, kind: str, components: np.ndarray, mean: Optional[np.ndarray] = None) -> None:
+        if kind not in KINDS:
+            raise ValueError(f"projection must be one of {KINDS}")
+        self.kind = kind
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+
+    @property
+    def in_dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def out_dim(self) -> int:
+        return int(self.components.shape[0])
+
+    def __repr__(self) -> str:
+        return f"{self.kind}-{self.in_dim}to{self.out_dim}"
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        if x.shape[1] != self.in_dim:
+            raise ValueError(f"projection expects {self.in_dim}-dim vectors, got {x.shape[1]}")
+        if self.kind == "truncate":
+            return _normalise(x[:, : self.out_dim])
+        return _normalise((x - self.mean) @ self.components.T)
+
+    # ── construction ──
+
+    @classmethod
+    def truncate(cls, in_dim: int, out_dim: int) -> "Projection":
+        return cls("truncate", np.eye(out_dim, in_dim, dtype=np.float32))
+
+    @classmethod
+    def fit_pca(cls, sample: np.ndarray, out_dim: int) -> "Projection":
+        """Top ``out_dim`` principal components of ``sample`` (rows are vectors); needs ``out_dim`` rows or more."""
+        sample = np.asarray(sample, dtype=np.float32)
+        if sample.shape[0] < out_dim:
+            raise ValueError(f"PCA to {out_dim} dims needs at least {out_dim} sample vectors, got {sample.shape[0]}")
+        mean = sample.mean(axis=0)
+        # eigenvectors of the d × d covariance — cheaper than an SVD of the sample when rows ≫ d
+        centred = (sample - mean).astype(np.float64)
+        eigvals, eigvecs = np.linalg.eigh(centred.T @ centred)
+        order = np.argsort(eigvals)[::-1][:out_dim]
+        return cls("pca", eigvecs[:, order].T, mean)
+
+    @classmethod
+    def create(cls, kind: str, vectors: np.ndarray, out_dim: int, sample_size: int, seed: int = 0) -> "Projection":
+        """Fit ``kind`` for ``vectors``; PCA uses a random sample of at most ``sample_size`` of them."""
+        if kind == "truncate":
+            return cls.truncate(vectors.shape[1], out_dim)
+        if vectors.shape[0] > sample_size:
+            rows = np.random.default_rng(seed).choice(vectors.shape[0], sample_size, replace=False)
+            vectors = vectors[np.sort(rows)]
+        return cls.fit_pca(vectors, out_dim)
+
+    # ── persistence ──
+
+    def save(self, path: str) -> None:
+        """Write to ``path`` (an ``.npz`` file, written as given)."""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                kind=np.array(self.kind),
+                components=self.components,
+                mean=self.mean if self.mean is not None else np.zeros(0, dtype=np.float32),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "Projection":
+        with np.load(path, allow_pickle=False) as data:
+            mean = data["mean"]
+            return cls(str(data["kind"]), data["components"], mean if mean.size else None)
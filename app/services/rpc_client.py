@@ -0,0 +1,87 @@
+"""
+Minimal Ethereum JSON-RPC client — batched calls over one pooled HTTP session.
+"""
+
+import itertools
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import get_settings
+from app.core.exceptions import ExternalServiceError
+from app.core.logging import get_logger
+from app.core.metrics import stage_timer
+
+logger = get_logger("service.rpc")
+
+RPCCall = Tuple[str, Sequence[Any]]
+
+
+class RPCClient:
+    """Thread-safe; one keep-alive connection pool shared by every caller."""
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None, pool_size: int = 10) -> None:
+        settings = get_settings()
+        url = url or settings.RPC_URL
+        if not url:
+            raise ValueError("RPC_URL is not configured")
+        self.url = url
+        self.timeout = timeout or settings.RPC_TIMEOUT
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+
+    def _next_id(self) -> int:
+        with self._ids_lock:
+            return next(self._ids)
+
+    def _post(self, payload: Any) -> Any:
+        try:
+            with stage_timer("rpc_call"):
+                resp = self._session.post(self.url, json=payload, timeout=self.timeout)
+                resp.raise_for_status()
+            return resp.json()
+        except (requests.RequestException, ValueError) as exc:
+            raise ExternalServiceError("RPC", str(exc)) from exc
+
+    @staticmethod
+    def _result(item: Any) -> Any:
+        if not isinstance(item, dict):
+            raise ExternalServiceError("RPC", f"malformed response: {item!r}")
+        if item.get("error"):
+            raise ExternalServiceError("RPC", str(item["error"].get("message", item["error"])))
+        return item.get("result")
+
+    # ── public ──
+
+    def call(self, method: str, params: Sequence[Any]) -> Any:
+        return self._result(
+            self._post({"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": list(params)})
+        )
+
+    def batch(self, calls: Sequence[RPCCall]) -> List[Any]:
+        """Send ``calls`` as one JSON-RPC batch; results come back in call order."""
+        if not calls:
+            return []
+        ids = [self._next_id() for _ in calls]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": list(params)}
+            for i, (method, params) in zip(ids, calls, strict=True)
+        ]
+        body = self._post(payload)
+        if not isinstance(body, list):
+            # some nodes answer a batch they reject with a single error object
+            raise ExternalServiceError("RPC", f"batch rejected: {self._result(body)!r}")
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        missing = [i for i in ids if i not in by_id]
+        if missing:
+            raise ExternalServiceError("RPC", f"batch response missing ids {missing}")
+        return [self._result(by_id[i]) for i in ids]
+
+    def close(self) -> None:
+        self._session.close()
@@ -0,0 +1,136 @@
+"""
+Function-selector table for bytecode analysis.
+
+Risky signatures are hashed once at build time into
+``app/resources/selectors.json`` so lookups at request time are a dict
+hit with no keccak dependency. Regenerate after editing SIGNATURES:
+
+    python -m app.services.selectors build
+"""
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("service.selectors")
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "resources" / "selectors.json"
+
+# category → canonical signatures; "erc20" entries identify tokens and carry no risk
+SIGNATURES: Dict[str, List[str]] = {
+    "mint": [
+        "mint(address,uint256)",
+        "mint(uint256)",
+        "mintTo(address,uint256)",
+        "mintFor(address,uint256)",
+        "_mint(address,uint256)",
+        "issue(uint256)",
+    ],
+    "burn-from": ["burn(address,uint256)", "burnFrom(address,uint256)", "redeem(uint256)"],
+    "fee": [
+        "setFee(uint256)",
+        "setFees(uint256,uint256)",
+        "setTaxFee(uint256)",
+        "setBuyFee(uint256)",
+        "setSellFee(uint256)",
+        "setTaxes(uint256,uint256)",
+        "updateFees(uint256,uint256)",
+        "setMaxTxAmount(uint256)",
+        "setMaxWalletSize(uint256)",
+        "setSwapTokensAtAmount(uint256)",
+    ],
+    "blacklist": [
+        "blacklist(address)",
+        "addToBlacklist(address)",
+        "setBlacklist(address,bool)",
+        "blacklistAddress(address,bool)",
+        "addBots(address[])",
+        "setBots(address[])",
+        "addBot(address)",
+        "isBlacklisted(address)",
+    ],
+    "pause": ["pause()", "unpause()", "setTradingEnabled(bool)", "enableTrading()", "setTradingPaused(bool)"],
+    "fee-exempt": ["excludeFromFee(address)", "excludeFromFees(address,bool)", "setExcludedFromFee(address,bool)"],
+    "ownership": ["transferOwnership(address)", "renounceOwnership()", "owner()"],
+    "withdraw": [
+        "withdraw()",
+        "withdrawAll()",
+        "emergencyWithdraw()",
+        "rescueTokens(address,uint256)",
+        "withdrawToken(address,uint256)",
+        "clearStuckBalance()",
+    ],
+    "upgrade": ["upgradeTo(address)", "upgradeToAndCall(address,bytes)", "setImplementation(address)"],
+    "destroy": ["kill()", "destroy()", "selfDestruct()"],
+    "erc20": [
+        "transfer(address,uint256)",
+        "transferFrom(address,address,uint256)",
+        "approve(address,uint256)",
+        "balanceOf(address)",
+        "totalSupply()",
+        "allowance(address,address)",
+    ],
+}
+
+
+class SelectorTable:
+    """selector (``0x`` + 8 hex) → {"signature", "category"}."""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        self.entries: Dict[str, Dict[str, str]] = dict(entries or {})
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SelectorTable":
+        path = path or str(DEFAULT_PATH)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                entries = json.load(fh).get("selectors", {})
+        except FileNotFoundError:
+            logger.warning("Selector table not found", extra={"extra_data": {"path": path}})
+            entries = {}
+        return cls(entries)
+
+    def lookup(self, selector: str) -> Optional[Dict[str, str]]:
+        return self.entries.get(selector)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+@lru_cache(maxsize=1)
+def get_selector_table() -> SelectorTable:
+    return SelectorTable.load(get_settings().SELECTOR_TABLE_PATH)
+
+
+# ── builder CLI ──
+
+
+def build(out: str) -> int:
+    from eth_utils import keccak  # build-time only; ships with web3
+
+    selectors = {}
+    for category, sigs in SIGNATURES.items():
+        for sig in sigs:
+            selectors["0x" + keccak(text=sig)[:4].hex()] = {"signature": sig, "category": category}
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump({"version": 1, "selectors": selectors}, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    return len(selectors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the function-selector table")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="hash SIGNATURES into the selector table")
+    b.add_argument("--out", default=str(DEFAULT_PATH))
+    args = parser.parse_args()
+    print(f"wrote {build(args.out)} selectors to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
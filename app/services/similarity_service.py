@@ -0,0 +1,200 @@
+"""
+Clone detection — "which known contract is this a copy of?"
+
+Known (typically known-bad) contracts are stored as MinHash signatures in
+one LSH index per kind: Solidity sources are shingled over words with
+comments and audited library files removed, bytecode over its opcode
+sequence. A lookup only compares against LSH candidates, so its cost does
+not grow with the size of the corpus.
+
+Seed the corpus from files:
+
+    python -m app.services.similarity_service add scams/*.sol --label rugpull
+"""
+
+import argparse
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+from app.repositories.similarity_repository import SimilarityRepository
+from app.services.bytecode import hex_to_bytes
+from app.services.known_libraries import KnownLibraries, get_known_libraries
+from app.services.minhash import LSHIndex, MinHasher, opcode_tokens, shingle_hashes, source_tokens
+from app.services.source_files import file_hash, normalize_source, split_sources
+
+logger = get_logger("service.similarity")
+
+KINDS = ("source", "bytecode")
+
+
+class SimilarityService:
+    def __init__(
+        self,
+        repo: Optional[SimilarityRepository] = None,
+        libraries: Optional[KnownLibraries] = None,
+    ) -> None:
+        settings = get_settings()
+        self._repo = repo or SimilarityRepository()
+        self._libraries = libraries if libraries is not None else get_known_libraries()
+        self._hasher = MinHasher(settings.SIMILARITY_NUM_PERM)
+        self._bands = settings.SIMILARITY_BANDS
+        self._shingle = settings.SIMILARITY_SHINGLE_SIZE
+        self._threshold = settings.SIMILARITY_THRESHOLD
+        self._top_k = settings.SIMILARITY_TOP_K
+        self._refresh_every = settings.SIMILARITY_REFRESH_SECONDS
+        # signatures made under another scheme are not comparable
+        self.scheme = f"oph{self._hasher.num_perm}-w{self._shingle}"
+        self._indexes: Dict[str, LSHIndex] = {}
+        self._entries: Dict[str, dict] = {}
+        self._generation = -1
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._reload()
+
+    # ── signatures ──
+
+    def source_signature(self, lowered_files: Iterable[str]) -> Optional[np.ndarray]:
+        return self._hasher.signature(shingle_hashes(source_tokens(lowered_files), self._shingle))
+
+    def code_signature(self, code: bytes) -> Optional[np.ndarray]:
+        return self._hasher.signature(shingle_hashes(opcode_tokens(code), self._shingle))
+
+    def _sign(self, kind: str, content: bytes) -> Optional[np.ndarray]:
+        if kind == "bytecode":
+            return self.code_signature(content)
+        files = split_sources(content.decode("utf-8"))
+        return self.source_signature(
+            normalize_source(c) for c in files.values() if file_hash(c) not in self._libraries.hashes
+        )
+
+    def encode(self, sig: Optional[np.ndarray]) -> Optional[str]:
+        """Compact form for storing a signature inside a cached analysis result."""
+        return None if sig is None else f"{self.scheme}:{sig.tobytes().hex()}"
+
+    def decode(self, encoded: Optional[str]) -> Optional[np.ndarray]:
+        """Inverse of ``encode``; None if missing or made under another scheme."""
+        if not encoded:
+            return None
+        scheme, _, data = encoded.partition(":")
+        if scheme != self.scheme:
+            return None
+        return np.frombuffer(bytes.fromhex(data), dtype=np.uint64)
+
+    # ── corpus ──
+
+    def _reload(self) -> None:
+        generation = self._repo.generation()
+        indexes = {kind: LSHIndex(self._hasher.num_perm, self._bands) for kind in KINDS}
+        entries: Dict[str, dict] = {}
+        for row in self._repo.signatures():
+            sig: Optional[np.ndarray]
+            if row["scheme"] == self.scheme:
+                sig = np.frombuffer(row["signature"], dtype=np.uint64)
+            else:
+                sig = self._sign(row["kind"], zlib.decompress(row["content"]))
+                if sig is None:
+                    continue
+                self._repo.update_signature(row["id"], self.scheme, sig.tobytes())
+            indexes[row["kind"]].add(row["id"], sig)
+            entries[row["id"]] = {k: row[k] for k in ("id", "kind", "label", "address", "created_at")}
+        with self._lock:
+            self._indexes, self._entries, self._generation = indexes, entries, generation
+            self._checked_at = time.monotonic()
+        logger.info(
+            "Similarity index loaded",
+            extra={"extra_data": {kind: len(index) for kind, index in indexes.items()}},
+        )
+
+    def _refresh(self) -> None:
+        """Pick up corpus changes made by other workers, checked at most every SIMILARITY_REFRESH_SECONDS."""
+        if time.monotonic() - self._checked_at < self._refresh_every:
+            return
+        self._checked_at = time.monotonic()
+        if self._repo.generation() != self._generation:
+            self._reload()
+
+    @property
+    def generation(self) -> int:
+        """Corpus version; changes whenever any worker adds or removes an entry."""
+        self._refresh()
+        return self._generation
+
+    def add(self, kind: str, label: str, content: str, address: Optional[str] = None) -> dict:
+        """Add a source (``kind="source"``) or hex runtime bytecode (``kind="bytecode"``)."""
+        if kind not in KINDS:
+            raise ValidationError(f"kind must be one of {KINDS}")
+        raw = hex_to_bytes(content) if kind == "bytecode" else content.encode("utf-8")
+        sig = self._sign(kind, raw)
+        if sig is None:
+            raise ValidationError("nothing to fingerprint: the contract is empty or only library code")
+        entry = self._repo.add(kind, label, raw, self.scheme, sig.tobytes(), address)
+        with self._lock:
+            self._indexes[kind].add(entry["id"], sig)
+            self._entries[entry["id"]] = entry
+        return entry
+
+    def remove(self, entry_id: str) -> bool:
+        removed = self._repo.remove(entry_id)
+        with self._lock:
+            entry = self._entries.pop(entry_id, None)
+            if entry is not None:
+                self._indexes[entry["kind"]].remove(entry_id)
+        return removed
+
+    def list_all(self) -> List[dict]:
+        return self._repo.list_all()
+
+    # ── lookup ──
+
+    def match(self, kind: str, sig: Optional[np.ndarray], k: Optional[int] = None) -> List[dict]:
+        """Closest known contracts of ``kind`` with their estimated Jaccard similarity."""
+        if sig is None:
+            return []
+        self._refresh()
+        with self._lock:
+            hits = self._indexes[kind].query(sig, k or self._top_k, self._threshold)
+            return [
+                {
+                    "id": entry_id,
+                    "label": self._entries[entry_id]["label"],
+                    "address": self._entries[entry_id]["address"],
+                    "similarity": round(sim, 3),
+                }
+                for entry_id, sim in hits
+            ]
+
+
+@lru_cache(maxsize=1)
+def get_similarity_service() -> SimilarityService:
+    """One corpus per process, shared by every ContractService and the admin endpoints."""
+    return SimilarityService()
+
+
+# ── CLI ──
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the known-contract similarity corpus")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("add", help="add .sol sources or .hex/.bin runtime bytecode files")
+    a.add_argument("paths", nargs="+")
+    a.add_argument("--label", required=True, help="e.g. rugpull-2024")
+    args = parser.parse_args()
+    service = get_similarity_service()
+    for path in map(Path, args.paths):
+        kind = "source" if path.suffix == ".sol" else "bytecode"
+        entry = service.add(kind, args.label, path.read_text(encoding="utf-8").strip())
+        print(f"{entry['id']}  {kind:8}  {path}")
+
+
+if __name__ == "__main__":
+    main()
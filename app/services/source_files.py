@@ -0,0 +1,58 @@
+"""
+Split Etherscan ``SourceCode`` into individual Solidity files.
+
+Etherscan returns one of three shapes:
+  * plain Solidity (single-file or flattened verification);
+  * ``{{ ...standard-json input... }}`` — double braces around
+    ``{"language": ..., "sources": {path: {"content": ...}}}``;
+  * ``{ path: {"content": ...}, ... }`` — the older multi-file format.
+"""
+
+import hashlib
+import json
+from typing import Dict, Optional
+
+SINGLE_FILE = ""  # path key for sources that were not split
+
+
+def _sources_map(obj: object) -> Optional[Dict[str, str]]:
+    if not isinstance(obj, dict):
+        return None
+    sources = obj.get("sources", obj)
+    if not isinstance(sources, dict) or not sources:
+        return None
+    files: Dict[str, str] = {}
+    for path, entry in sources.items():
+        if not isinstance(entry, dict) or not isinstance(entry.get("content"), str):
+            return None
+        files[str(path)] = entry["content"]
+    return files
+
+
+def split_sources(source_code: str) -> Dict[str, str]:
+    """Map of file path → content; a non-JSON source comes back as ``{SINGLE_FILE: source}``."""
+    text = source_code.strip()
+    if text.startswith("{{") and text.endswith("}}"):
+        text = text[1:-1]
+    if text.startswith("{"):
+        try:
+            files = _sources_map(json.loads(text))
+        except ValueError:
+            files = None
+        if files:
+            return files
+    return {SINGLE_FILE: source_code}
+
+
+def file_hash(content: str) -> str:
+    """sha256 of the file with newlines unified and outer whitespace trimmed.
+
+    Case is preserved — a library file only matches if its code is byte-identical.
+    """
+    text = content.replace("\r\n", "\n").replace("\r", "\n").strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_source(source: str) -> str:
+    """Canonical form the scan runs on: unified newlines, lower-cased."""
+    return source.replace("\r\n", "\n").replace("\r", "\n").lower()
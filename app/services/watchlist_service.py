@@ -0,0 +1,270 @@
+"""
+Watchlist scheduler — re-checks monitored contracts and re-analyses only
+the ones that changed.
+
+Every tick claims the entries that are due, within a token-bucket rate
+budget, and fingerprints them cheaply: one JSON-RPC batch reads each
+contract's code hash and EIP-1967 implementation slot. Unverified contracts
+are re-checked on Etherscan every WATCHLIST_VERIFY_INTERVAL. Without an RPC
+endpoint the Etherscan source hash stands in for the code hash. A full
+``analyze_contract`` runs only when the fingerprint changed, and a changed
+score is recorded as an event and POSTed to WATCHLIST_WEBHOOK_URL.
+Next checks are jittered so entries added together drift apart.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from app.core.config import get_settings
+from app.core.exceptions import ExternalServiceError
+from app.core.logging import get_logger
+from app.core.metrics import record_cache
+from app.repositories.watchlist_repository import WatchlistRepository
+from app.services.bytecode import EIP1967_IMPLEMENTATION_SLOT, hex_to_bytes, slot_to_address
+from app.services.contract_service import ContractService
+from app.services.rpc_client import RPCCall, RPCClient
+
+logger = get_logger("service.watchlist")
+
+# fingerprint fields whose change triggers a full re-analysis
+CHANGE_KEYS = ("code_hash", "source_hash", "implementation", "verified")
+LEASE_SECONDS = 600.0  # a claimed entry is re-claimable this long after a crashed check
+DELIVERY_LEASE_SECONDS = 30.0  # claimed events are re-sent this long after a failed or crashed POST
+TICK_SECONDS = 1.0
+
+EntryKey = Tuple[str, str]  # (owner, address) — a watchlist entry's primary key
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def take(self, wanted: int) -> int:
+        """Take up to ``wanted`` whole tokens; returns how many were granted."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            granted = int(min(wanted, self._tokens))
+            self._tokens -= granted
+            return granted
+
+    def refund(self, n: int) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + n)
+
+
+class WatchlistScheduler:
+    def __init__(
+        self,
+        service: ContractService,
+        repo: Optional[WatchlistRepository] = None,
+        bucket: Optional[TokenBucket] = None,
+    ) -> None:
+        settings = get_settings()
+        self._service = service
+        self._repo = repo or WatchlistRepository()
+        self._batch = max(1, settings.WATCHLIST_BATCH)
+        # every worker process runs its own scheduler; WATCHLIST_RATE is their combined budget
+        self._bucket = bucket or TokenBucket(settings.WATCHLIST_RATE / max(1, settings.WORKERS), self._batch)
+        self._jitter = settings.WATCHLIST_JITTER
+        self._verify_interval = settings.WATCHLIST_VERIFY_INTERVAL
+        self._webhook = settings.WATCHLIST_WEBHOOK_URL
+        self._http = requests.Session()
+        self._task: Optional[asyncio.Task] = None
+
+    # ── lifecycle ──
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Watchlist scheduler started", extra={"extra_data": {"rate": self._bucket.rate}})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Watchlist tick failed")
+            await asyncio.sleep(TICK_SECONDS)
+
+    # ── fingerprints ──
+
+    @staticmethod
+    def _rpc_fingerprints(rpc: RPCClient, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        calls: List[RPCCall] = []
+        for address in addresses:
+            calls.append(("eth_getCode", [address, "latest"]))
+            calls.append(("eth_getStorageAt", [address, EIP1967_IMPLEMENTATION_SLOT, "latest"]))
+        results = rpc.batch(calls)
+        return {
+            address: {
+                "code_hash": hashlib.sha256(hex_to_bytes(results[2 * i])).hexdigest(),
+                "implementation": slot_to_address(results[2 * i + 1]),
+            }
+            for i, address in enumerate(addresses)
+        }
+
+    def _source_fingerprint(self, address: str) -> Dict[str, Any]:
+        meta = self._service.fetch_source(address)
+        source = meta.get("SourceCode") or ""
+        return {
+            "source_hash": hashlib.sha256(source.encode()).hexdigest() if source else None,
+            "implementation": (meta.get("Implementation") or None) if meta.get("Proxy") == "1" else None,
+            "verified": bool(source),
+        }
+
+    def _fingerprints(self, entries: List[dict], now: float) -> Dict[EntryKey, Dict[str, Any]]:
+        """Current fingerprint per (owner, address); entries that could not be read are left out.
+
+        Each address is read once, however many owners watch it; the
+        verification state comes from each entry's own stored fingerprint.
+        """
+        addresses = list(dict.fromkeys(e["address"] for e in entries))
+        rpc = self._service.rpc
+        if rpc is None:
+            by_address = {}
+            for address in addresses:
+                try:
+                    by_address[address] = self._source_fingerprint(address)
+                except ExternalServiceError:
+                    logger.warning("Watchlist source check failed", extra={"extra_data": {"address": address}})
+            return {
+                (e["owner"], e["address"]): dict(by_address[e["address"]])
+                for e in entries
+                if e["address"] in by_address
+            }
+
+        by_address = self._rpc_fingerprints(rpc, addresses)
+        verified: Dict[str, Optional[bool]] = {}  # this tick's Etherscan re-checks, per address
+        found: Dict[EntryKey, Dict[str, Any]] = {}
+        for entry in entries:
+            address, old = entry["address"], entry["fingerprint"] or {}
+            fp = {**by_address[address], "verified": old.get("verified"), "verified_at": old.get("verified_at")}
+            # verification is one-way, so only unverified contracts are re-checked
+            if old and not old.get("verified") and now - (old.get("verified_at") or 0) >= self._verify_interval:
+                if address not in verified:
+                    try:
+                        verified[address] = bool(self._service.fetch_source(address).get("SourceCode"))
+                    except ExternalServiceError:
+                        verified[address] = None
+                if verified[address] is not None:
+                    fp["verified"] = verified[address]
+                    fp["verified_at"] = now
+            found[(entry["owner"], address)] = fp
+        return found
+
+    # ── checks ──
+
+    def _next_check(self, interval: float, now: float) -> float:
+        return now + interval * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def run_once(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Check every due entry the rate budget allows; returns per-tick counts."""
+        now = time.time() if now is None else now
+        granted = self._bucket.take(self._batch)
+        entries = self._repo.claim_due(now, granted, LEASE_SECONDS) if granted else []
+        self._bucket.refund(granted - len(entries))
+        stats = {"checked": len(entries), "analyzed": 0, "events": 0}
+        if entries:
+            # one fingerprint read and at most one analysis per address, however many owners watch it
+            try:
+                current = self._fingerprints(entries, now)
+            except ExternalServiceError as exc:
+                logger.warning("Watchlist fingerprinting failed", extra={"extra_data": {"error": str(exc)}})
+                current = {}
+            analyses: Dict[str, Optional[Dict[str, Any]]] = {}
+            for entry in entries:
+                analyzed, evented = self._check(entry, current.get((entry["owner"], entry["address"])), analyses, now)
+                stats["analyzed"] += analyzed
+                stats["events"] += evented
+        if self._webhook:
+            self._deliver(self._webhook, now)
+        return stats
+
+    def _check(
+        self, entry: dict, fp: Optional[Dict[str, Any]], analyses: Dict[str, Optional[Dict[str, Any]]], now: float
+    ) -> Tuple[bool, bool]:
+        """Record one entry's check; returns (ran an analysis, emitted an event)."""
+        address, old = entry["address"], entry["fingerprint"]
+        next_at = self._next_check(entry["interval_s"], now)
+        if fp is None:
+            # unreadable this time — keep the old fingerprint so a change is still caught later
+            self._repo.record_check(entry["owner"], address, old, entry["last_score"], next_at)
+            return False, False
+        changes = [k for k in CHANGE_KEYS if k in fp and (old or {}).get(k) != fp[k]] if old else ["added"]
+        record_cache("watchlist_fingerprint", not changes)
+        if not changes:
+            self._repo.record_check(entry["owner"], address, fp, entry["last_score"], next_at)
+            return False, False
+
+        analyzed = address not in analyses
+        if analyzed:
+            try:
+                analyses[address] = self._service.analyze_contract(address)
+            except ExternalServiceError as exc:
+                logger.warning(
+                    "Watchlist analysis failed", extra={"extra_data": {"address": address, "error": str(exc)}}
+                )
+                analyses[address] = None
+        result = analyses[address]
+        if result is None:
+            self._repo.record_check(entry["owner"], address, old, entry["last_score"], next_at)
+            return analyzed, False
+
+        score = result["analysis"].get("score")
+        if score is None:
+            # an error payload — keep the old fingerprint so the next check analyses again
+            self._repo.record_check(entry["owner"], address, old, entry["last_score"], next_at)
+            return analyzed, False
+
+        if "verified" in fp:
+            fp["verified"] = bool(result.get("source_available"))
+            fp["verified_at"] = now
+        evented = old is not None and score != entry["last_score"]
+        if evented:
+            self._repo.add_event(entry["owner"], address, entry["last_score"], score, changes)
+            logger.info(
+                "Watched contract score changed",
+                extra={
+                    "extra_data": {"address": address, "old": entry["last_score"], "new": score, "changes": changes}
+                },
+            )
+        self._repo.record_check(entry["owner"], address, fp, score, next_at)
+        return analyzed, evented
+
+    # ── delivery ──
+
+    def _deliver(self, url: str, now: float) -> None:
+        # leased, so another worker's scheduler does not post the same events meanwhile
+        events = self._repo.claim_undelivered(now, 100, DELIVERY_LEASE_SECONDS)
+        if not events:
+            return
+        try:
+            resp = self._http.post(url, json={"events": events}, timeout=10)
+            resp.raise_for_status()
+        except requests.RequestException as exc:
+            # left undelivered — retried once the lease lapses
+            logger.warning(
+                "Watchlist webhook failed", extra={"extra_data": {"error": str(exc), "pending": len(events)}}
+            )
+            return
+        self._repo.mark_delivered([e["id"] for e in events])
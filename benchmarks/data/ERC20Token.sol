@@ -0,0 +1,185 @@
+// SPDX-License-Identifier: MIT
+// Benchmark fixture: a typical owner-managed ERC20 with fees, blacklist and pause.
+pragma solidity ^0.8.20;
+
+interface IERC20 {
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    function totalSupply() external view returns (uint256);
+    function balanceOf(address account) external view returns (uint256);
+    function transfer(address to, uint256 value) external returns (bool);
+    function allowance(address owner, address spender) external view returns (uint256);
+    function approve(address spender, uint256 value) external returns (bool);
+    function transferFrom(address from, address to, uint256 value) external returns (bool);
+}
+
+abstract contract Context {
+    function _msgSender() internal view virtual returns (address) {
+        return msg.sender;
+    }
+}
+
+abstract contract Ownable is Context {
+    address private _owner;
+
+    event OwnershipTransferred(address indexed previousOwner, address indexed newOwner);
+
+    error OwnableUnauthorizedAccount(address account);
+    error OwnableInvalidOwner(address owner);
+
+    constructor(address initialOwner) {
+        if (initialOwner == address(0)) {
+            revert OwnableInvalidOwner(address(0));
+        }
+        _transferOwnership(initialOwner);
+    }
+
+    modifier onlyOwner() {
+        if (owner() != _msgSender()) {
+            revert OwnableUnauthorizedAccount(_msgSender());
+        }
+        _;
+    }
+
+    function owner() public view virtual returns (address) {
+        return _owner;
+    }
+
+    function renounceOwnership() public virtual onlyOwner {
+        _transferOwnership(address(0));
+    }
+
+    function transferOwnership(address newOwner) public virtual onlyOwner {
+        if (newOwner == address(0)) {
+            revert OwnableInvalidOwner(address(0));
+        }
+        _transferOwnership(newOwner);
+    }
+
+    function _transferOwnership(address newOwner) internal virtual {
+        address oldOwner = _owner;
+        _owner = newOwner;
+        emit OwnershipTransferred(oldOwner, newOwner);
+    }
+}
+
+contract FeeToken is Context, IERC20, Ownable {
+    mapping(address => uint256) private _balances;
+    mapping(address => mapping(address => uint256)) private _allowances;
+    mapping(address => bool) public isBlacklisted;
+    mapping(address => bool) public isExcludedFromFee;
+
+    uint256 private _totalSupply;
+    string public name;
+    string public symbol;
+    uint8 public constant decimals = 18;
+
+    uint256 public buyFee = 2;
+    uint256 public sellFee = 2;
+    address public pair;
+    address public feeWallet;
+    bool public tradingPaused;
+
+    constructor(string memory name_, string memory symbol_, uint256 supply) Ownable(_msgSender()) {
+        name = name_;
+        symbol = symbol_;
+        feeWallet = _msgSender();
+        isExcludedFromFee[_msgSender()] = true;
+        _mint(_msgSender(), supply * 10 ** decimals);
+    }
+
+    function totalSupply() public view override returns (uint256) {
+        return _totalSupply;
+    }
+
+    function balanceOf(address account) public view override returns (uint256) {
+        return _balances[account];
+    }
+
+    function transfer(address to, uint256 value) public override returns (bool) {
+        _transfer(_msgSender(), to, value);
+        return true;
+    }
+
+    function allowance(address owner_, address spender) public view override returns (uint256) {
+        return _allowances[owner_][spender];
+    }
+
+    function approve(address spender, uint256 value) public override returns (bool) {
+        _allowances[_msgSender()][spender] = value;
+        emit Approval(_msgSender(), spender, value);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 value) public override returns (bool) {
+        uint256 current = _allowances[from][_msgSender()];
+        if (current != type(uint256).max) {
+            require(current >= value, "ERC20: insufficient allowance");
+            _allowances[from][_msgSender()] = current - value;
+        }
+        _transfer(from, to, value);
+        return true;
+    }
+
+    // ── owner controls ──
+
+    function setFees(uint256 buy, uint256 sell) external onlyOwner {
+        buyFee = buy;
+        sellFee = sell;
+    }
+
+    function setPair(address pair_) external onlyOwner {
+        pair = pair_;
+    }
+
+    function setBlacklist(address account, bool value) external onlyOwner {
+        isBlacklisted[account] = value;
+    }
+
+    function setTradingPaused(bool paused) external onlyOwner {
+        tradingPaused = paused;
+    }
+
+    function mint(address to, uint256 amount) external onlyOwner {
+        _mint(to, amount);
+    }
+
+    function burn(uint256 amount) external {
+        _burn(_msgSender(), amount);
+    }
+
+    // ── internals ──
+
+    function _transfer(address from, address to, uint256 value) internal {
+        require(!tradingPaused || isExcludedFromFee[from], "trading paused");
+        require(!isBlacklisted[from] && !isBlacklisted[to], "blacklisted");
+        require(_balances[from] >= value, "ERC20: transfer amount exceeds balance");
+
+        uint256 fee;
+        if (!isExcludedFromFee[from] && !isExcludedFromFee[to]) {
+            if (from == pair) fee = (value * buyFee) / 100;
+            else if (to == pair) fee = (value * sellFee) / 100;
+        }
+        _balances[from] -= value;
+        _balances[to] += value - fee;
+        emit Transfer(from, to, value - fee);
+        if (fee > 0) {
+            _balances[feeWallet] += fee;
+            emit Transfer(from, feeWallet, fee);
+        }
+    }
+
+    function _mint(address account, uint256 value) internal {
+        _totalSupply += value;
+        _balances[account] += value;
+        emit Transfer(address(0), account, value);
+    }
+
+    function _burn(address account, uint256 value) internal {
+        require(_balances[account] >= value, "ERC20: burn amount exceeds balance");
+        _balances[account] -= value;
+        _totalSupply -= value;
+        emit Transfer(account, address(0), value);
+    }
+}
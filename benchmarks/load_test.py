@@ -0,0 +1,356 @@
+"""
+End-to-end load test — boots create_app() under uvicorn with the hash
+embedding backend and a local Etherscan stub, drives a mixed workload and
+reports RPS, latency percentiles and server RSS as JSON.
+
+    python -m benchmarks.load_test --duration 30 --concurrency 32
+    python -m benchmarks.load_test --mix search=1 --out benchmarks/results/search.json
+    python -m benchmarks.load_test --baseline benchmarks/baselines/load.json   # exit 1 on regression
+    python -m benchmarks.load_test --save-baseline benchmarks/baselines/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.stubs import EtherscanStub
+
+ADMIN_KEY = "bench-admin-key"
+DEFAULT_MIX = "search=60,ingest=10,analyze=20,auth_fail=10"
+ROOT = Path(__file__).resolve().parent.parent
+
+_WORDS = [
+    "owner",
+    "mint",
+    "burn",
+    "fee",
+    "liquidity",
+    "pool",
+    "pair",
+    "swap",
+    "router",
+    "token",
+    "proxy",
+    "upgrade",
+    "pause",
+    "blacklist",
+    "transfer",
+    "approve",
+    "allowance",
+    "vault",
+    "oracle",
+    "price",
+    "reserve",
+    "drain",
+    "rug",
+    "audit",
+    "renounce",
+    "timelock",
+]
+
+
+# ── statistics ──
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class ScenarioStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        return {
+            "requests": len(lat),
+            "errors": self.errors,
+            "rps": round(len(lat) / duration, 2) if duration else 0.0,
+            "p50_ms": round(percentile(lat, 50), 3),
+            "p95_ms": round(percentile(lat, 95), 3),
+            "p99_ms": round(percentile(lat, 99), 3),
+            "max_ms": round(lat[-1], 3) if lat else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ── server lifecycle ──
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+
+        rss: int = psutil.Process(pid).memory_info().rss
+        return rss
+    except Exception:
+        return None
+
+
+def start_server(port: int, workdir: str, etherscan_url: str, workers: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "ENVIRONMENT": "development",
+        "ADMIN_API_KEY": ADMIN_KEY,
+        "EMBEDDING_BACKEND": "hash",
+        "ETHERSCAN_API_KEY": "bench",
+        "ETHERSCAN_API_URL": etherscan_url,
+        "APIKEY_DB_PATH": os.path.join(workdir, "apikeys.db"),
+        "FAISS_INDEX_PATH": os.path.join(workdir, "faiss.index"),
+        "RATE_LIMIT_CALLS": "100000000",
+        "LOG_LEVEL": "WARNING",
+    }
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:create_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]  # fmt: skip
+    # server logs go to /dev/null — auth-failure storms would flood the terminal
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/v1/readiness")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("server did not become ready")
+
+
+# ── scenarios ──
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+async def scenario_search(client: httpx.AsyncClient, rng: random.Random, ctx: dict) -> Tuple[int, int]:
+    resp = await client.get("/api/v1/documents/search", params={"q": _text(rng, 3), "k": 10})
+    return resp.status_code, 200
+
+
+async def scenario_ingest(client: httpx.AsyncClient, rng: random.Random, ctx: dict) -> Tuple[int, int]:
+    docs = [_text(rng, 12) for _ in range(5)]
+    ids = [f"bench-{rng.getrandbits(64):016x}" for _ in docs]
+    resp = await client.post("/api/v1/documents/", json={"docs": docs, "ids": ids}, headers=ctx["user_headers"])
+    return resp.status_code, 201
+
+
+async def scenario_analyze(client: httpx.AsyncClient, rng: random.Random, ctx: dict) -> Tuple[int, int]:
+    address = f"0x{rng.getrandbits(160):040x}"
+    resp = await client.get("/api/v1/contracts/analyze", params={"address": address})
+    return resp.status_code, 200
+
+
+async def scenario_auth_fail(client: httpx.AsyncClient, rng: random.Random, ctx: dict) -> Tuple[int, int]:
+    resp = await client.get("/api/v1/documents/", headers={"X-API-Key": f"bogus-{rng.getrandbits(32)}"})
+    return resp.status_code, 401
+
+
+SCENARIOS = {
+    "search": scenario_search,
+    "ingest": scenario_ingest,
+    "analyze": scenario_analyze,
+    "auth_fail": scenario_auth_fail,
+}
+
+
+# ── driver ──
+
+
+async def drive(base_url: str, args: argparse.Namespace, server_pid: int) -> dict:
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    stats = {name: ScenarioStats() for name in names}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        await wait_ready(client)
+        resp = await client.post("/api/v1/admin/keys", json={"name": "bench"}, headers={"X-API-Key": ADMIN_KEY})
+        ctx = {"user_headers": {"X-API-Key": resp.json()["key"]}}
+
+        rss_samples: List[int] = []
+        rss_start = _rss_bytes(server_pid)
+
+        async def worker(wid: int, deadline: float) -> None:
+            rng = random.Random(args.seed * 1000 + wid)
+            while time.monotonic() < deadline:
+                name = rng.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    status, expected = await SCENARIOS[name](client, rng, ctx)
+                except httpx.HTTPError:
+                    stats[name].errors += 1
+                    continue
+                st = stats[name]
+                st.latencies_ms.append((time.perf_counter() - t0) * 1000)
+                st.statuses[status] = st.statuses.get(status, 0) + 1
+                if status != expected:
+                    st.errors += 1
+
+        async def sample_rss(deadline: float) -> None:
+            while time.monotonic() < deadline:
+                value = _rss_bytes(server_pid)
+                if value:
+                    rss_samples.append(value)
+                await asyncio.sleep(0.5)
+
+        if args.warmup > 0:
+            await asyncio.gather(*(worker(i, time.monotonic() + args.warmup) for i in range(args.concurrency)))
+            stats = {name: ScenarioStats() for name in names}
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(sample_rss(deadline), *(worker(i, deadline) for i in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+
+    total = ScenarioStats()
+    for st in stats.values():
+        total.latencies_ms.extend(st.latencies_ms)
+        total.errors += st.errors
+        for code, n in st.statuses.items():
+            total.statuses[code] = total.statuses.get(code, 0) + n
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "duration_s": round(elapsed, 2),
+            "warmup_s": args.warmup,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "overall": total.summary(elapsed),
+        "scenarios": {name: st.summary(elapsed) for name, st in stats.items()},
+        "rss_bytes": {
+            "start": rss_start,
+            "peak": max(rss_samples) if rss_samples else None,
+            "end": rss_samples[-1] if rss_samples else None,
+        },
+    }
+
+
+# ── baseline comparison ──
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions beyond ``threshold`` (fractional) in p95 latency or RPS."""
+    problems = []
+    for name, cur in {"overall": result["overall"], **result["scenarios"]}.items():
+        base = baseline["overall"] if name == "overall" else baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            problems.append(f"{name}: p95 {base['p95_ms']:.2f} → {cur['p95_ms']:.2f} ms")
+        if base["rps"] and cur["rps"] < base["rps"] * (1 - threshold):
+            problems.append(f"{name}: rps {base['rps']:.1f} → {cur['rps']:.1f}")
+    return problems
+
+
+def _print_table(result: dict) -> None:
+    print(f"{'scenario':<12}{'reqs':>8}{'err':>6}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, s in {**result["scenarios"], "overall": result["overall"]}.items():
+        print(
+            f"{name:<12}{s['requests']:>8}{s['errors']:>6}{s['rps']:>10.1f}"
+            f"{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}"
+        )
+    rss = result["rss_bytes"]
+    if rss["peak"]:
+        print(f"server RSS: start {rss['start'] / 2**20:.0f} MiB, peak {rss['peak'] / 2**20:.0f} MiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    p.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before measuring")
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenarios (default {DEFAULT_MIX})")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--url", help="target an already-running server instead of booting one")
+    p.add_argument("--out", help="write JSON results here")
+    p.add_argument("--baseline", help="compare against a stored result; exit 1 on regression")
+    p.add_argument("--threshold", type=float, default=0.15, help="allowed fractional regression")
+    p.add_argument("--save-baseline", help="also write results as the new baseline")
+    args = p.parse_args(argv)
+
+    if args.url:
+        result = asyncio.run(drive(args.url, args, server_pid=-1))
+    else:
+        with tempfile.TemporaryDirectory() as workdir, EtherscanStub() as stub:
+            port = _free_port()
+            proc = start_server(port, workdir, stub.url, args.workers)
+            try:
+                result = asyncio.run(drive(f"http://127.0.0.1:{port}", args, proc.pid))
+            finally:
+                proc.terminate()
+                proc.wait(30)
+
+    _print_table(result)
+    for path in filter(None, (args.out, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(result, indent=2))
+        print(f"wrote {path}")
+
+    if args.baseline:
+        problems = compare(result, json.loads(Path(args.baseline).read_text()), args.threshold)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Microbenchmark fixtures — run with ``python -m pytest benchmarks/micro``.
+
+Sizes above BENCH_MAX_SIZE (default 100k) are skipped so a default run
+stays under a few GB of RAM; set BENCH_MAX_SIZE=1000000 for the full sweep.
+"""
+
+import os
+import tempfile
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# model-free, deterministic embeddings at a realistic width
+os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+os.environ.setdefault("EMBEDDING_HASH_DIM", "384")
+os.environ.setdefault("METRICS_ENABLED", "false")
+# time the scan itself; the cache-hit path has its own benchmark
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("SIMILARITY_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-"), "similarity.db"))
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MAX_SIZE = int(os.environ.get("BENCH_MAX_SIZE", "100000"))
+
+
+def sized(n: int) -> int:
+    """Skip the current benchmark if ``n`` exceeds BENCH_MAX_SIZE."""
+    if n > MAX_SIZE:
+        pytest.skip(f"size {n} > BENCH_MAX_SIZE={MAX_SIZE}")
+    return n
+
+
+@pytest.fixture
+def track_memory(benchmark) -> Callable[..., Any]:
+    """Run ``fn`` once under tracemalloc and record its peak in the benchmark's extra_info.
+
+    Done as a separate pass so tracing overhead never skews the timings.
+    Allocations made inside FAISS' C++ code are invisible to tracemalloc;
+    numpy buffers are traced.
+    """
+
+    def run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        tracemalloc.start()
+        try:
+            result = fn(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_alloc_kib"] = round(peak / 1024, 1)
+        return result
+
+    return run
@@ -0,0 +1,138 @@
+"""
+Deterministic synthetic data for the microbenchmarks.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+_VOCAB_SEED = [
+    "token",
+    "owner",
+    "mint",
+    "burn",
+    "transfer",
+    "fee",
+    "liquidity",
+    "pair",
+    "router",
+    "swap",
+    "pool",
+    "vault",
+    "proxy",
+    "upgrade",
+    "admin",
+    "pause",
+    "blacklist",
+    "whitelist",
+    "reward",
+    "stake",
+    "lock",
+    "vesting",
+    "oracle",
+    "price",
+]
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """``n`` L2-normalised float32 vectors, matching what the embedders produce."""
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim), dtype=np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
+
+
+def synthetic_texts(n: int, words: int = 24, vocab: int = 2000, seed: int = 0) -> List[str]:
+    """``n`` short documents drawn from a fixed vocabulary (domain words + filler tokens)."""
+    rnd = random.Random(seed)
+    pool = _VOCAB_SEED + [f"w{i}" for i in range(vocab - len(_VOCAB_SEED))]
+    return [" ".join(rnd.choices(pool, k=words)) for _ in range(n)]
+
+
+def load_solidity(name: str) -> str:
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def flattened_solidity(target_bytes: int) -> str:
+    """A large flattened source built by repeating the ERC20 fixture under fresh names.
+
+    Mirrors Etherscan's flattened verifications, which routinely run to
+    hundreds of KB once every imported library is inlined.
+    """
+    base = load_solidity("ERC20Token.sol")
+    parts: List[str] = []
+    size = i = 0
+    while size < target_bytes:
+        part = base.replace("FeeToken", f"FeeToken{i}").replace("Ownable", f"Ownable{i}")
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "\n".join(parts)
+
+
+def standard_json_source(files: Dict[str, str]) -> str:
+    """Etherscan's ``{{...}}`` standard-json SourceCode for a multi-file verification."""
+    return "{" + json.dumps({"language": "Solidity", "sources": {p: {"content": c} for p, c in files.items()}}) + "}"
+
+
+def vendored_libraries(n: int, size: int = 20_000) -> Dict[str, str]:
+    """``n`` distinct library-sized files under a vendored ``@openzeppelin/`` tree."""
+    return {
+        f"@openzeppelin/contracts/lib/Lib{i}.sol": flattened_solidity(size).replace("FeeToken", f"Lib{i}_")
+        for i in range(n)
+    }
+
+
+def random_sentence_model(directory: str, vocab: int = 2000, hidden: int = 384, layers: int = 6) -> str:
+    """A randomly initialised BERT shaped like all-MiniLM-L6-v2, saved as a sentence-transformers directory.
+
+    Weights are random, so only timings are meaningful — enough to compare
+    runtimes without downloading a model.
+    """
+    import torch
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    words = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + _VOCAB_SEED + [f"w{i}" for i in range(vocab)]
+    with open(os.path.join(directory, "vocab.txt"), "w") as fh:
+        fh.write("\n".join(words))
+    BertTokenizerFast(vocab_file=os.path.join(directory, "vocab.txt")).save_pretrained(directory)
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(words),
+        hidden_size=hidden,
+        num_hidden_layers=layers,
+        num_attention_heads=hidden // 32,
+        intermediate_size=hidden * 4,
+    )
+    BertModel(config).save_pretrained(directory)
+    modules = [
+        {"idx": 0, "name": "0", "path": "", "type": "sentence_transformers.models.Transformer"},
+        {"idx": 1, "name": "1", "path": "1_Pooling", "type": "sentence_transformers.models.Pooling"},
+        {"idx": 2, "name": "2", "path": "2_Normalize", "type": "sentence_transformers.models.Normalize"},
+    ]
+    with open(os.path.join(directory, "modules.json"), "w") as fh:
+        json.dump(modules, fh)
+    os.makedirs(os.path.join(directory, "1_Pooling"), exist_ok=True)
+    with open(os.path.join(directory, "1_Pooling", "config.json"), "w") as fh:
+        json.dump({"word_embedding_dimension": hidden, "pooling_mode_mean_tokens": True}, fh)
+    return directory
+
+
+def spectral_vectors(n: int, dim: int, decay: float = 0.6, seed: int = 0) -> np.ndarray:
+    """``n`` L2-normalised vectors whose variance falls off as ``i ** -decay`` along random directions.
+
+    Trained embedding models concentrate variance like this; isotropic
+    ``synthetic_vectors`` would make any projection look hopeless.
+    """
+    rng = np.random.default_rng(seed)
+    rotation, _ = np.linalg.qr(rng.standard_normal((dim, dim)))
+    scales = (np.arange(1, dim + 1) ** -decay).astype(np.float32)
+    vecs = (rng.standard_normal((n, dim), dtype=np.float32) * scales) @ rotation.astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
@@ -0,0 +1,34 @@
+"""
+APIKeyRepository.verify — runs on every authenticated request.
+"""
+
+import secrets
+from datetime import datetime, timezone
+
+import pytest
+
+from app.repositories.apikey_repository import APIKeyRepository
+
+
+@pytest.fixture(params=[100, 10_000], ids=lambda n: f"keys={n}")
+def repo_with_keys(request, tmp_path):
+    repo = APIKeyRepository(db_path=str(tmp_path / "keys.db"))
+    keys = [secrets.token_urlsafe(32) for _ in range(request.param)]
+    now = datetime.now(timezone.utc).isoformat()
+    conn = repo._conn()
+    try:
+        conn.executemany(
+            "INSERT INTO apikeys (key, name, created_at) VALUES (?, ?, ?)",
+            [(k, "bench", now) for k in keys],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return repo, keys
+
+
+@pytest.mark.parametrize("hit", [True, False], ids=["hit", "miss"])
+def test_verify(benchmark, repo_with_keys, hit):
+    repo, keys = repo_with_keys
+    key = keys[len(keys) // 2] if hit else secrets.token_urlsafe(32)
+    assert benchmark(repo.verify, key) is hit
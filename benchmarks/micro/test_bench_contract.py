@@ -0,0 +1,56 @@
+"""
+ContractService.analyze_source on small, typical and flattened-large sources.
+"""
+
+import pytest
+
+from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+from app.services.analysis_cache import AnalysisCache
+from app.services.contract_service import RULESET_VERSION, ContractService
+from app.services.known_libraries import KnownLibraries
+from app.services.source_files import file_hash
+from benchmarks.micro.generators import flattened_solidity, load_solidity, standard_json_source, vendored_libraries
+from benchmarks.stubs import SAMPLE_SOURCE
+
+SOURCES = {
+    "small": lambda: SAMPLE_SOURCE,
+    "erc20": lambda: load_solidity("ERC20Token.sol"),
+    "flattened_250k": lambda: flattened_solidity(250_000),
+    "flattened_1m": lambda: flattened_solidity(1_000_000),
+}
+
+
+@pytest.mark.parametrize("name", list(SOURCES))
+def test_analyze_source(benchmark, track_memory, name):
+    source = SOURCES[name]()
+    svc = ContractService()
+    benchmark.extra_info["source_bytes"] = len(source)
+    track_memory(svc.analyze_source, source)
+    result = benchmark(svc.analyze_source, source)
+    assert result["findings"]
+
+
+@pytest.mark.parametrize("tier", ["memory", "sqlite"])
+def test_analyze_source_cached(benchmark, tier, tmp_path):
+    source = SOURCES["flattened_250k"]()
+    cache = AnalysisCache(
+        RULESET_VERSION,
+        AnalysisCacheRepository(str(tmp_path / "cache.db")),
+        memory_size=1024 if tier == "memory" else 0,
+    )
+    svc = ContractService(cache=cache)
+    svc.analyze_source(source)
+    result = benchmark(svc.analyze_source, source)
+    assert result["cached"]
+
+
+@pytest.mark.parametrize("libraries", ["known", "unknown"])
+def test_analyze_multifile(benchmark, libraries):
+    # a typical token: one project file plus a dozen vendored library files
+    libs = vendored_libraries(12)
+    source = standard_json_source({"contracts/Token.sol": load_solidity("ERC20Token.sol"), **libs})
+    table = KnownLibraries({file_hash(c): p for p, c in libs.items()} if libraries == "known" else {})
+    svc = ContractService(libraries=table)
+    benchmark.extra_info["source_bytes"] = len(source)
+    result = benchmark(svc.analyze_source, source)
+    assert result["files_scanned"] == (1 if libraries == "known" else 13)
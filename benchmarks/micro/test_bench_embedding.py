@@ -0,0 +1,55 @@
+"""
+Embedding throughput on CPU — the unquantised transformer against the int8
+and ONNX runtimes, on texts of mixed length.
+
+Set BENCH_EMBEDDING_MODEL_DIR to a local sentence-transformers model to
+time real weights; otherwise a random model of all-MiniLM-L6-v2's shape is
+generated.
+"""
+
+import os
+import random
+
+import pytest
+
+from benchmarks.micro.generators import random_sentence_model, synthetic_texts
+
+pytest.importorskip("transformers")
+pytest.importorskip("torch")
+
+from app.services.embedding_runtime import QuantizedEncoder, inference_threads  # noqa: E402
+
+N = 256
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    return os.environ.get("BENCH_EMBEDDING_MODEL_DIR") or random_sentence_model(str(tmp_path_factory.mktemp("model")))
+
+
+@pytest.fixture(scope="module")
+def texts():
+    # mostly short descriptions with a tail of long ones, shuffled — what padding to the longest row punishes
+    mixed = [t for words in (8, 16, 24, 48, 200) for t in synthetic_texts(N // 5 + 1, words=words, seed=words)][:N]
+    random.Random(0).shuffle(mixed)
+    return mixed
+
+
+@pytest.mark.parametrize("runtime", ["sentence-transformers", "torch", "int8", "onnx"])
+def test_encode_throughput(benchmark, model_dir, texts, runtime):
+    if runtime == "sentence-transformers":
+        st = pytest.importorskip("sentence_transformers")
+        model = st.SentenceTransformer(model_dir, device="cpu")
+    else:
+        if runtime == "onnx":
+            pytest.importorskip("onnxruntime")
+            from app.services.embedding_runtime import ONNX_DIR, export_onnx
+
+            if not os.path.exists(os.path.join(model_dir, ONNX_DIR)):
+                export_onnx(model_dir)
+        model = QuantizedEncoder(model_dir, runtime)
+    benchmark.extra_info["threads"] = inference_threads()
+    out = benchmark.pedantic(model.encode, args=(texts,), rounds=3, warmup_rounds=1)
+    assert out.shape[0] == len(texts)
+    if benchmark.stats is not None:  # None under --benchmark-disable
+        benchmark.extra_info["texts_per_s"] = round(len(texts) / benchmark.stats.stats.mean)
@@ -0,0 +1,35 @@
+"""
+Bulk embedding across worker processes — in-process encoding against
+EmbeddingPool with 2 and 4 workers, using the model-free hash backend so
+the numbers show the pool's scaling and shared-memory overhead.
+"""
+
+import os
+
+import pytest
+
+from app.services.embedding_pool import EmbeddingPool
+from app.services.indexer_service import hash_embed
+from benchmarks.micro.generators import synthetic_texts
+
+N = 50_000
+DIM = 384
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_bulk_embed(benchmark, workers):
+    texts = synthetic_texts(N, words=48)
+    if workers == 1:
+        run = lambda: hash_embed(texts, DIM)  # noqa: E731
+    else:
+        if workers > (os.cpu_count() or 1):
+            pytest.skip(f"{workers} workers > {os.cpu_count()} CPUs")
+        pool = EmbeddingPool({"kind": "hash", "dim": DIM}, workers=workers)
+        pool.encode(texts[:workers])  # spawn and warm every worker outside the timing
+        run = lambda: pool.encode(texts)  # noqa: E731
+    out = benchmark.pedantic(run, rounds=3, warmup_rounds=0)
+    assert out.shape == (N, DIM)
+    if benchmark.stats is not None:  # None under --benchmark-disable
+        benchmark.extra_info["texts_per_s"] = round(N / benchmark.stats.stats.mean)
+    if workers > 1:
+        pool.close()
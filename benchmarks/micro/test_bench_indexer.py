@@ -0,0 +1,88 @@
+"""
+IndexerService hot paths: add_texts, search, _persist, _try_load_persisted.
+
+Backends: ``faiss`` (hash embeddings into IndexFlatL2), ``numpy`` (the
+cosine fallback used when FAISS is missing) and ``tfidf`` (dense TF-IDF).
+"""
+
+from typing import Any
+
+import pytest
+
+from app.services.indexer_service import IndexerService, _faiss
+from benchmarks.micro.conftest import SIZES, sized
+from benchmarks.micro.generators import synthetic_texts, synthetic_vectors
+
+BACKENDS = ["faiss", "numpy", "tfidf"]
+# dense TF-IDF holds n × vocab floats — beyond this it is a memory test, not a speed test
+TFIDF_MAX = 10_000
+QUERY = "owner can mint and blacklist holders"
+
+
+def _build(backend: str, n: int, tmp_path) -> IndexerService:
+    if backend == "faiss" and _faiss() is None:
+        pytest.skip("faiss not installed")
+    if backend == "tfidf" and n > TFIDF_MAX:
+        pytest.skip(f"tfidf capped at {TFIDF_MAX}")
+    svc = IndexerService(index_path=str(tmp_path / "index.faiss"))
+    svc.ids = [f"doc_{i}" for i in range(n)]
+    if backend == "tfidf":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        svc.use_hash = False
+        vectorizer = TfidfVectorizer()
+        svc._vectorizer = vectorizer
+        svc.vectors = vectorizer.fit_transform(synthetic_texts(n)).toarray().astype("float32")
+        return svc
+    vecs = synthetic_vectors(n, svc._hash_dim)
+    if backend == "faiss":
+        svc._ensure_faiss(vecs.shape[1])
+        index: Any = svc.faiss_index
+        index.add(vecs)
+    else:
+        svc.vectors = vecs
+    return svc
+
+
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_search(benchmark, track_memory, backend, n, tmp_path):
+    svc = _build(backend, sized(n), tmp_path)
+    benchmark.extra_info["index_bytes"] = svc.memory_bytes
+    track_memory(svc.search, QUERY, 10)
+    results = benchmark(svc.search, QUERY, 10)
+    assert len(results) == 10
+
+
+@pytest.mark.parametrize("batch", [1, 64])
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("backend", ["faiss", "tfidf"])
+def test_add_texts(benchmark, track_memory, backend, n, batch, tmp_path):
+    # includes the full-index _persist every call makes — that is the cost being tracked
+    svc = _build(backend, sized(n), tmp_path)
+    texts = synthetic_texts(batch, seed=1)
+    track_memory(svc.add_texts, texts)
+    benchmark.pedantic(svc.add_texts, args=(texts,), rounds=5, iterations=1, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("backend", ["faiss", "numpy"])
+def test_persist(benchmark, backend, n, tmp_path):
+    svc = _build(backend, sized(n), tmp_path)
+    benchmark.extra_info["index_bytes"] = svc.memory_bytes
+    benchmark.pedantic(svc._persist, rounds=5, iterations=1)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_try_load_persisted(benchmark, track_memory, n, tmp_path):
+    svc = _build("faiss", sized(n), tmp_path)
+    svc._persist()
+
+    def load() -> None:
+        svc.faiss_index = None
+        svc.ids = []
+        svc._try_load_persisted()
+
+    track_memory(load)
+    benchmark.pedantic(load, rounds=5, iterations=1)
+    assert svc.doc_count == n
@@ -0,0 +1,53 @@
+"""
+FAISS flat search over 1536-dim vectors (``text-embedding-3-small``'s width)
+against the same vectors PCA-projected to 384 and 256 dims. Each run records
+recall@10 against the full-dimension ranking and the index size.
+"""
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from app.services.indexer_service import IndexerService, _faiss
+from app.services.projection import Projection
+from benchmarks.micro.conftest import sized
+from benchmarks.micro.generators import spectral_vectors
+
+DIM = 1536
+QUERIES = 100
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    data = spectral_vectors(sized(100_000) + QUERIES, DIM)
+    return data[:-QUERIES], data[-QUERIES:]
+
+
+def _recall(svc: IndexerService, queries: np.ndarray, truth: np.ndarray) -> float:
+    index: Any = svc.faiss_index
+    q = svc._project_query(queries, index.d)
+    _, got = index.search(q, 10)
+    return float(np.mean([len(set(t) & set(g)) / 10 for t, g in zip(truth, got, strict=True)]))
+
+
+@pytest.mark.parametrize("out_dim", [DIM, 384, 256])
+def test_projected_search(benchmark, corpus, out_dim, tmp_path):
+    if _faiss() is None:
+        pytest.skip("faiss not installed")
+    vectors, queries = corpus
+    svc = IndexerService(index_path=str(tmp_path / "index.faiss"), load_persisted=False)
+    svc.ids = [f"doc_{i}" for i in range(len(vectors))]
+    if out_dim < DIM:
+        svc.projection = Projection.create("pca", vectors, out_dim, sample_size=20_000)
+    svc._ensure_faiss(out_dim)
+    svc.faiss_index.add(svc.projection.apply(vectors) if svc.projection else vectors)
+
+    exact = _faiss().IndexFlatL2(DIM)
+    exact.add(vectors)
+    truth = exact.search(queries, 10)[1]
+    benchmark.extra_info["index_bytes"] = svc.memory_bytes
+    benchmark.extra_info["recall_at_10"] = round(_recall(svc, queries, truth), 3)
+
+    query = queries[:1]
+    benchmark(lambda: svc.faiss_index.search(svc._project_query(query, svc.faiss_index.d), 10))
@@ -0,0 +1,64 @@
+"""
+Response serialisation for large results — FastAPI's response_model path
+(build models, validate them again, dump) against ``trusted()`` responses.
+"""
+
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.responses import trusted
+from app.models.schemas import JobResultResponse, RAGQueryResponse, RAGResult
+
+FINDINGS = [
+    {"pattern": "selfdestruct", "snippet": "selfdestruct(payable(owner));", "file": "Token.sol", "line": 120 + i}
+    for i in range(8)
+]
+
+
+def _validated(model: type, build):
+    """What FastAPI does for a returned model: validate against response_model, then dump_json."""
+    adapter: TypeAdapter[Any] = TypeAdapter(model)
+
+    def run():
+        return adapter.dump_json(adapter.validate_python(build(), from_attributes=True))
+
+    return run
+
+
+@pytest.mark.parametrize("k", [10, 100])
+@pytest.mark.parametrize("path", ["response_model", "trusted"])
+def test_search_response(benchmark, k, path):
+    hits = [(f"doc-{i:06d}", 1.0 / (i + 1)) for i in range(k)]
+    if path == "trusted":
+
+        def run():
+            return trusted({"query": "owner drain", "results": [{"doc_id": d, "score": s} for d, s in hits]}).body
+    else:
+        run = _validated(
+            RAGQueryResponse,
+            lambda: RAGQueryResponse(query="owner drain", results=[RAGResult(doc_id=d, score=s) for d, s in hits]),
+        )
+    assert len(benchmark(run)) > 30 * k
+
+
+@pytest.mark.parametrize("n", [100, 1000])
+@pytest.mark.parametrize("path", ["response_model", "trusted"])
+def test_batch_job_result(benchmark, n, path):
+    result = {
+        f"0x{i:040x}": {
+            "address": f"0x{i:040x}",
+            "source_available": True,
+            "analysis": {"score": 60, "findings": FINDINGS, "files_scanned": 3},
+        }
+        for i in range(n)
+    }
+    if path == "trusted":
+
+        def run():
+            return trusted({"job_id": "j", "status": "succeeded", "result": result, "error": None}).body
+    else:
+        run = _validated(JobResultResponse, lambda: JobResultResponse(job_id="j", status="succeeded", result=result))
+    benchmark.extra_info["response_bytes"] = len(run())
+    benchmark(run)
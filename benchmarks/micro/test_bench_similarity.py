@@ -0,0 +1,55 @@
+"""
+Clone detection — signature cost per source size, and LSH lookup against
+corpus size (with a brute-force scan of every signature for contrast).
+"""
+
+import numpy as np
+import pytest
+
+from app.repositories.similarity_repository import SimilarityRepository
+from app.services.known_libraries import KnownLibraries
+from app.services.minhash import LSHIndex, MinHasher, shingle_hashes
+from app.services.similarity_service import SimilarityService
+from app.services.source_files import normalize_source
+from benchmarks.micro.conftest import SIZES, sized
+from benchmarks.micro.test_bench_contract import SOURCES
+
+NUM_PERM, BANDS = 128, 32
+
+
+@pytest.mark.parametrize("name", list(SOURCES))
+def test_source_signature(benchmark, tmp_path, name):
+    source = normalize_source(SOURCES[name]())
+    similarity = SimilarityService(SimilarityRepository(str(tmp_path / "similarity.db")), KnownLibraries())
+    benchmark.extra_info["source_bytes"] = len(source)
+    assert benchmark(similarity.source_signature, [source]) is not None
+
+
+@pytest.fixture(params=SIZES[:3], ids=lambda n: f"corpus={n}")
+def corpus(request):
+    n = sized(request.param)
+    rng = np.random.default_rng(0)
+    hasher = MinHasher(NUM_PERM)
+    sigs = rng.integers(0, 2**63, (n, NUM_PERM), dtype=np.uint64)
+    index = LSHIndex(NUM_PERM, BANDS)
+    for i, sig in enumerate(sigs):
+        index.add(str(i), sig)
+    # one genuine near-duplicate of the query
+    shingles = rng.integers(1, 2**63, 2000, dtype=np.uint64)
+    query = hasher.signature(shingle_hashes(shingles, 1))
+    index.add("clone", hasher.signature(shingle_hashes(shingles[:1800], 1)))
+    return index, np.vstack([sigs, query]), query
+
+
+def test_lsh_query(benchmark, corpus):
+    index, _, query = corpus
+    assert benchmark(index.query, query, 3, 0.5)[0][0] == "clone"
+
+
+def test_linear_scan(benchmark, corpus):
+    _, matrix, query = corpus
+
+    def scan():
+        return np.argsort(-np.count_nonzero(matrix == query, axis=1))[:3]
+
+    benchmark(scan)
@@ -0,0 +1,83 @@
+"""
+Local stand-ins for external services so benchmarks are hermetic and repeatable.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+SAMPLE_SOURCE = """
+pragma solidity ^0.8.0;
+
+contract BenchToken {
+    address public owner;
+    mapping(address => uint256) public balanceOf;
+    uint256 public fee;
+
+    modifier onlyOwner() { require(msg.sender == owner, "not owner"); _; }
+
+    constructor() { owner = msg.sender; }
+
+    function mint(address to, uint256 amount) external onlyOwner { balanceOf[to] += amount; }
+    function burn(uint256 amount) external { balanceOf[msg.sender] -= amount; }
+    function setFee(uint256 newFee) external onlyOwner { fee = newFee; }
+    function transferOwnership(address newOwner) external onlyOwner { owner = newOwner; }
+
+    function _transfer(address from, address to, uint256 amount) internal {
+        uint256 cut = amount * fee / 100;
+        balanceOf[from] -= amount;
+        balanceOf[to] += amount - cut;
+        balanceOf[owner] += cut;
+    }
+}
+"""
+
+
+class _EtherscanHandler(BaseHTTPRequestHandler):
+    source = SAMPLE_SOURCE
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        if query.get("action") == ["getsourcecode"]:
+            body = {
+                "status": "1",
+                "message": "OK",
+                "result": [
+                    {"SourceCode": self.source, "ContractName": "BenchToken", "Proxy": "0", "Implementation": ""}
+                ],
+            }
+        else:
+            body = {"status": "0", "message": "NOTOK", "result": "unsupported action"}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 — silence per-request logging
+        pass
+
+
+class EtherscanStub:
+    """Minimal Etherscan `getsourcecode` server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, source: Optional[str] = None) -> None:
+        handler = type("Handler", (_EtherscanHandler,), {"source": source or SAMPLE_SOURCE})
+        self.host = host
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self._server.server_port}/api"
+
+    def __enter__(self) -> "EtherscanStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,7 +1,15 @@
 """
 Shared test fixtures.
 """
+
+import json
 import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -9,17 +17,95 @@ from fastapi.testclient import TestClient
 os.environ.setdefault("ENVIRONMENT", "development")
 os.environ.setdefault("ADMIN_API_KEY", "test-admin-key")
 os.environ.setdefault("APIKEY_DB_PATH", "./data/test_apikeys.db")
+os.environ.setdefault("ANALYSIS_CACHE_DB_PATH", "./data/test_analysis_cache.db")
+os.environ.setdefault("JOB_DB_PATH", "./data/test_jobs.db")
+os.environ.setdefault("SIMILARITY_DB_PATH", "./data/test_similarity.db")
+os.environ.setdefault("JOB_POLL_INTERVAL", "0.1")
+os.environ.setdefault("WATCHLIST_DB_PATH", "./data/test_watchlist.db")
+os.environ.setdefault("INDEX_SNAPSHOT_DIR", tempfile.mkdtemp(prefix="test-snapshots-"))
+# scheduler tests drive ticks themselves
+os.environ.setdefault("WATCHLIST_ENABLED", "false")
+os.environ.setdefault("PROFILING_ENABLED", "true")
+# polling tests share one client identity; 429 behaviour is tested with its own limiter
+os.environ.setdefault("RATE_LIMIT_CALLS", "10000")
 
 
 @pytest.fixture(scope="session")
 def client():
     """Provide a FastAPI TestClient that lives for the entire test session."""
     from app.main import create_app
+
     app = create_app()
     with TestClient(app) as c:
+        # the index warms up in the background; wait so search tests see it
+        deadline = time.monotonic() + 60
+        while app.state.indexer is None and time.monotonic() < deadline:
+            time.sleep(0.05)
         yield c
 
 
 @pytest.fixture(scope="session")
 def admin_headers():
     return {"X-API-Key": os.environ["ADMIN_API_KEY"]}
+
+
+@pytest.fixture
+def json_server():
+    """Start local HTTP servers answering JSON POSTs with ``handle(body)``; yields the factory."""
+    servers = []
+
+    def start(handle):
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                data = json.dumps(handle(body)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class StubNode:
+    """JSON-RPC node serving eth_getCode / eth_getStorageAt from dicts; records every request."""
+
+    def __init__(self) -> None:
+        self.code: Dict[str, bytes] = {}
+        self.storage: Dict[Tuple[str, str], str] = {}
+        self.requests: List[Any] = []  # one JSON-RPC body (a call or a batch) per HTTP request
+        self.url = ""
+
+    def answer(self, req):
+        method, params = req["method"], req["params"]
+        if method == "eth_getCode":
+            result = "0x" + self.code.get(params[0], b"").hex()
+        elif method == "eth_getStorageAt":
+            result = self.storage.get((params[0], params[1]), "0x" + "00" * 32)
+        else:
+            return {"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32601, "message": "method not found"}}
+        return {"jsonrpc": "2.0", "id": req["id"], "result": result}
+
+    def handle(self, body):
+        self.requests.append(body)
+        # answer batches out of order, as real nodes may
+        return [self.answer(r) for r in reversed(body)] if isinstance(body, list) else self.answer(body)
+
+
+@pytest.fixture
+def node(json_server):
+    state = StubNode()
+    state.url = json_server(state.handle)
+    return state
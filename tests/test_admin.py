@@ -1,5 +1,7 @@
 """Tests for admin API-key management endpoints."""
 
+import json
+
 
 def test_create_key_requires_admin(client):
     resp = client.post("/api/v1/admin/keys", json={"name": "test"})
@@ -12,7 +14,7 @@ def test_create_and_list_keys(client, admin_headers):
     key = resp.json()["key"]
     assert len(key) > 10
 
-    resp = client.get("/api/v1/admin/keys", headers=admin_headers)
+    resp = client.get("/api/v1/admin/keys", params={"prefix": key[:8]}, headers=admin_headers)
     assert resp.status_code == 200
     keys = resp.json()["keys"]
     assert any(k["key"] == key for k in keys)
@@ -34,3 +36,26 @@ def test_user_key_auth_flow(client, admin_headers):
 
     resp = client.get("/api/v1/documents/", headers={"X-API-Key": user_key})
     assert resp.status_code == 200
+
+
+def test_list_keys_pages_and_exports(client, admin_headers):
+    created = [
+        client.post("/api/v1/admin/keys", json={"name": f"page-{i}"}, headers=admin_headers).json()["key"]
+        for i in range(3)
+    ]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/api/v1/admin/keys", params=params, headers=admin_headers).json()
+        seen += [k["key"] for k in data["keys"]]
+        cursor = data["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+    assert seen[-3:] == created and len(seen) == len(set(seen))
+
+    by_prefix = client.get("/api/v1/admin/keys", params={"prefix": created[1][:8]}, headers=admin_headers).json()
+    assert [k["key"] for k in by_prefix["keys"]] == [created[1]]
+
+    resp = client.get("/api/v1/admin/keys/export", headers=admin_headers)
+    exported = [json.loads(line)["key"] for line in resp.text.splitlines()]
+    assert exported == seen
@@ -0,0 +1,73 @@
+"""Tests for admission control — per-route concurrency limits and load shedding."""
+
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, Gate
+from app.core.exceptions import ServiceUnavailableError
+
+
+def test_gate_queues_then_sheds():
+    async def scenario():
+        gate = Gate("/slow", limit=1, queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with gate.admit(1.0):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = gate.admit(1.0)  # kept referenced: a collected context manager would release its slot
+        waiter = asyncio.create_task(queued.__aenter__())
+        await asyncio.sleep(0)
+        assert (gate.running, gate.waiting) == (1, 1)
+
+        with pytest.raises(ServiceUnavailableError) as full:
+            async with gate.admit(1.0):
+                pass
+        assert full.value.headers["Retry-After"] == "1"
+
+        release.set()
+        await holder
+        await waiter  # the queued request got the freed slot
+        assert (gate.running, gate.waiting) == (1, 0)
+
+        with pytest.raises(ServiceUnavailableError):  # nothing frees up before its deadline
+            async with gate.admit(0.01):
+                pass
+        await queued.__aexit__(None, None, None)
+        assert gate.running == 0 and gate.service_time > 0
+
+    asyncio.run(scenario())
+
+
+def test_longest_prefix_and_deadline():
+    admission = AdmissionController({"/api/v1/documents": 8, "/api/v1/documents/search": 2}, timeout=5.0)
+    assert admission.gate_for("/api/v1/documents/search").limit == 2
+    assert admission.gate_for("/api/v1/documents/").limit == 8
+    assert admission.gate_for("/api/v1/health") is None
+    assert admission.deadline(None) == 5.0
+    assert admission.deadline(30) == 5.0
+    assert admission.deadline(0.5) == 0.5
+
+
+def test_saturated_route_sheds_while_others_are_served(client, monkeypatch):
+    admission = AdmissionController({"/api/v1/documents/search": 1}, queue=4, timeout=5.0)
+    monkeypatch.setattr(client.app.state, "admission", admission)
+    slots = admission.gates["/api/v1/documents/search"]._slots
+
+    client.portal.call(slots.acquire)  # an in-flight search holds the only slot
+    try:
+        resp = client.get("/api/v1/documents/search", params={"q": "reentrancy"}, headers={"X-Request-Timeout": "0.05"})
+        assert resp.status_code == 503
+        assert resp.json()["error_code"] == "SERVICE_UNAVAILABLE"
+        assert int(resp.headers["Retry-After"]) >= 1
+        assert client.get("/api/v1/health").status_code == 200
+    finally:
+        client.portal.call(slots.release)
+
+    assert client.get("/api/v1/documents/search", params={"q": "reentrancy"}).status_code == 200
+    resp = client.get("/api/v1/documents/search", params={"q": "x"}, headers={"X-Request-Timeout": "soon"})
+    assert resp.status_code == 422
@@ -1,5 +1,8 @@
 """Tests for the contract analysis service."""
+
+import json
 import os
+
 from app.services.contract_service import ContractService
 
 
@@ -27,3 +30,134 @@ def test_analyze_source_code():
     result = svc.analyze_source(source)
     assert result["score"] > 0
     assert len(result["findings"]) > 0
+
+
+def _cached_service(tmp_path, ruleset="v1"):
+    from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+    from app.services.analysis_cache import AnalysisCache
+
+    repo = AnalysisCacheRepository(str(tmp_path / "analysis.db"))
+    return ContractService(cache=AnalysisCache(ruleset, repo)), repo
+
+
+def test_identical_normalised_source_is_scanned_once(tmp_path):
+    svc, repo = _cached_service(tmp_path)
+    source = "contract T {\n  function mint() onlyOwner {}\n}\n"
+    first = svc.analyze_source(source)
+    clone = svc.analyze_source(source.replace("\n", "\r\n"))
+    assert first["cached"] is False
+    assert clone["cached"] is True
+    assert clone["findings"] == first["findings"]
+    assert repo.count() == 1
+
+
+def test_cache_is_shared_and_invalidated_by_ruleset(tmp_path):
+    svc, _ = _cached_service(tmp_path)
+    source = "contract T { function burn() {} }"
+    svc.analyze_source(source)
+
+    # another worker sees the stored result through the shared SQLite file
+    other, _ = _cached_service(tmp_path)
+    assert other.analyze_source(source)["cached"] is True
+
+    # a new rule-set version misses and purges the old rows
+    changed, repo = _cached_service(tmp_path, ruleset="v2")
+    assert repo.count() == 0
+    assert changed.analyze_source(source)["cached"] is False
+
+
+LIB_SOURCE = """
+abstract contract Ownable {
+    address private _owner;
+    function transferOwnership(address newOwner) public virtual onlyOwner { _owner = newOwner; }
+}
+"""
+
+TOKEN_SOURCE = """pragma solidity ^0.8.20;
+import "@openzeppelin/contracts/access/Ownable.sol";
+
+contract Token is Ownable {
+    function mint(address to, uint256 amount) external onlyOwner {}
+}
+"""
+
+
+def _standard_json(files):
+    return "{" + json.dumps({"language": "Solidity", "sources": {p: {"content": c} for p, c in files.items()}}) + "}"
+
+
+def test_split_sources_formats():
+    from app.services.source_files import SINGLE_FILE, split_sources
+
+    files = {"contracts/Token.sol": TOKEN_SOURCE, "@openzeppelin/contracts/access/Ownable.sol": LIB_SOURCE}
+    assert split_sources(_standard_json(files)) == files
+    assert split_sources(json.dumps({p: {"content": c} for p, c in files.items()})) == files
+    assert split_sources(TOKEN_SOURCE) == {SINGLE_FILE: TOKEN_SOURCE}
+    assert split_sources("{{ not json }}") == {SINGLE_FILE: "{{ not json }}"}
+
+
+def test_known_library_files_are_skipped_by_hash():
+    from app.services.known_libraries import KnownLibraries
+    from app.services.source_files import file_hash
+
+    libs = KnownLibraries({file_hash(LIB_SOURCE): "openzeppelin-contracts@5.0.0:access/Ownable.sol"})
+    svc = ContractService(libraries=libs)
+    lib_path = "@openzeppelin/contracts/access/Ownable.sol"
+    result = svc.analyze_source(_standard_json({"contracts/Token.sol": TOKEN_SOURCE, lib_path: LIB_SOURCE}))
+    assert result["files_skipped"] == [lib_path]
+    assert result["files_scanned"] == 1
+    assert {f.get("file") for f in result["findings"]} <= {"contracts/Token.sol", None}
+    mint = next(f for f in result["findings"] if f["pattern"].startswith("mint"))
+    assert mint["line"] == 5
+
+    # a tampered copy under the same path no longer matches and is scanned
+    tampered = LIB_SOURCE.replace("_owner = newOwner", "_owner = tx.origin")
+    result = svc.analyze_source(_standard_json({"contracts/Token.sol": TOKEN_SOURCE, lib_path: tampered}))
+    assert result["files_skipped"] == []
+    assert any(f.get("file") == lib_path for f in result["findings"])
+
+
+def test_known_libraries_builder(tmp_path):
+    from app.services.known_libraries import KnownLibraries, build
+
+    root = tmp_path / "lib" / "access"
+    root.mkdir(parents=True)
+    (root / "Ownable.sol").write_text(LIB_SOURCE.replace("\n", "\r\n"))
+    out = tmp_path / "known.json"
+    assert build(str(tmp_path / "lib"), "oz@5.0.0", str(out)) == 1
+    assert KnownLibraries.load(str(out)).match(LIB_SOURCE) == "oz@5.0.0:access/Ownable.sol"
+
+
+def test_known_libraries_fetch_hashes_npm_releases(tmp_path, monkeypatch):
+    import io
+    import tarfile
+
+    import app.services.known_libraries as known_libraries
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, text in [("package/access/Ownable.sol", LIB_SOURCE), ("package/README.md", "docs")]:
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    urls = []
+    monkeypatch.setattr(known_libraries, "_download", lambda url: urls.append(url) or buf.getvalue())
+    out = str(tmp_path / "known.json")
+    assert known_libraries.fetch(out, (("@openzeppelin/contracts", "5.0.2"),), registry="https://npm.test") == 1
+    assert urls == ["https://npm.test/@openzeppelin/contracts/-/contracts-5.0.2.tgz"]
+    table = known_libraries.KnownLibraries.load(out)
+    assert table.match(LIB_SOURCE) == "openzeppelin-contracts@5.0.2:access/Ownable.sol"
+
+
+def test_bundled_known_library_table_is_populated():
+    import pytest
+
+    from app.services.known_libraries import KnownLibraries
+
+    table = KnownLibraries.load()
+    if not table and not os.environ.get("CI"):
+        pytest.skip("known-library table not generated; run python -m app.services.known_libraries fetch")
+    labels = set(table.hashes.values())
+    assert any(label.startswith("openzeppelin-contracts@") for label in labels)
+    assert any(label.startswith("solmate@") for label in labels)
@@ -0,0 +1,107 @@
+"""Tests for bytecode analysis over JSON-RPC, against a local stub node."""
+
+from app.core.config import get_settings
+from app.services.bytecode import EIP1967_IMPLEMENTATION_SLOT, disassemble, scan, strip_metadata
+from app.services.contract_service import ContractService
+from app.services.rpc_client import RPCClient
+from app.services.selectors import SelectorTable
+
+TOKEN = "0x" + "11" * 20
+CLONE = "0x" + "22" * 20
+PROXY = "0x" + "33" * 20
+
+SELECTORS = SelectorTable(
+    {
+        "0x40c10f19": {"signature": "mint(address,uint256)", "category": "mint"},
+        "0x69fe0e2d": {"signature": "setFee(uint256)", "category": "fee"},
+        "0xa9059cbb": {"signature": "transfer(address,uint256)", "category": "erc20"},
+    }
+)
+
+
+def _dispatcher(*selectors: str) -> bytes:
+    """PUSH1 0 CALLDATALOAD PUSH1 0xe0 SHR, then DUP1 PUSH4 sel EQ PUSH2 dest JUMPI per selector."""
+    code = bytes.fromhex("60003560e01c")
+    for sel in selectors:
+        code += bytes.fromhex("8063" + sel[2:] + "14610100" + "57")
+    # a PUSH4 whose immediate contains EQ/SELFDESTRUCT bytes must not be decoded as opcodes
+    return code + bytes.fromhex("6314ff14ff50" + "00")
+
+
+def _minimal_proxy(impl: str) -> bytes:
+    return bytes.fromhex("363d3d373d3d3d363d73" + impl[2:] + "5af43d82803e903d91602b57fd5bf3")
+
+
+def _service(node):
+    return ContractService(rpc=RPCClient(node.url), selectors=SELECTORS)
+
+
+def test_scan_skips_push_data_and_metadata():
+    code = _dispatcher("0x40c10f19", "0xa9059cbb")
+    assert all(ins.op != 0xFF for ins in disassemble(code))
+    selectors, ops = scan(code)
+    assert selectors == ["0x40c10f19", "0xa9059cbb"]
+    # a fake CBOR trailer (a1 ... + 2-byte length) is stripped before scanning
+    assert strip_metadata(code + bytes.fromhex("a16000ff0004")) == code
+
+
+def test_unverified_token_via_batched_rpc(node):
+    node.code[TOKEN] = _dispatcher("0x40c10f19", "0x69fe0e2d", "0xa9059cbb")
+    result = _service(node).analyze_bytecode(TOKEN)
+    # code and both EIP-1967 slots arrive in one batch; responses matched by id, not order
+    assert isinstance(node.requests[0], list) and len(node.requests[0]) == 3
+    assert {f["pattern"] for f in result["findings"]} == {"mint", "fee"}
+    assert result["bytecode"]["functions"] == ["mint(address,uint256)", "setFee(uint256)", "transfer(address,uint256)"]
+    assert result["bytecode"]["proxy"] is None
+    assert result["score"] == 20
+
+
+def test_minimal_proxy_resolves_to_implementation(node):
+    node.code[TOKEN] = _dispatcher("0x40c10f19")
+    node.code[CLONE] = _minimal_proxy(TOKEN)
+    result = _service(node).analyze_bytecode(CLONE)
+    assert result["bytecode"]["proxy"] == {"kind": "eip1167", "implementation": TOKEN, "beacon": None}
+    assert [(f["pattern"], f["file"]) for f in result["findings"]] == [("mint", TOKEN)]
+
+
+def test_eip1967_proxy_resolves_from_storage_slot(node):
+    node.code[TOKEN] = _dispatcher("0x69fe0e2d")
+    node.code[PROXY] = bytes.fromhex("363d3d37363d7f") + bytes(32) + bytes.fromhex("545af43d")
+    node.storage[(PROXY, EIP1967_IMPLEMENTATION_SLOT)] = "0x" + "00" * 12 + TOKEN[2:]
+    result = _service(node).analyze_bytecode(PROXY)
+    assert result["bytecode"]["proxy"]["implementation"] == TOKEN
+    assert {f["pattern"] for f in result["findings"]} == {"fee", "upgradeable-proxy"}
+
+
+def test_analyze_contract_falls_back_to_bytecode(node, monkeypatch):
+    monkeypatch.delenv("ETHERSCAN_API_KEY", raising=False)
+    node.code[TOKEN] = _dispatcher("0x40c10f19")
+    result = _service(node).analyze_contract(TOKEN)
+    assert result["source_available"] is False
+    assert result["analysis"]["bytecode"]["code_size"] > 0
+    assert _service(node).analyze_bytecode("0x" + "44" * 20) == {"error": "No contract code at address"}
+
+
+def test_stray_delegatecall_is_flagged_from_a_single_scan(node, monkeypatch):
+    import app.services.contract_service as contract_service
+
+    monkeypatch.setattr(get_settings(), "ANALYSIS_CACHE_ENABLED", False)  # every lookup is a scan
+    node.code[TOKEN] = _dispatcher("0x40c10f19") + bytes.fromhex("f4")
+    scans = []
+    monkeypatch.setattr(contract_service, "scan", lambda code: scans.append(code) or scan(code))
+    result = _service(node).analyze_bytecode(TOKEN)
+    assert "delegatecall" in {f["pattern"] for f in result["findings"]}
+    assert len(scans) == 1
+
+
+def test_unverified_proxy_implementation_is_analysed_once(node, monkeypatch):
+    monkeypatch.delenv("ETHERSCAN_API_KEY", raising=False)
+    node.code[TOKEN] = _dispatcher("0x69fe0e2d")
+    node.code[PROXY] = bytes.fromhex("363d3d37363d7f") + bytes(32) + bytes.fromhex("545af43d")
+    node.storage[(PROXY, EIP1967_IMPLEMENTATION_SLOT)] = "0x" + "00" * 12 + TOKEN[2:]
+    result = _service(node).analyze_contract(PROXY)
+    # the slot read resolves the proxy; one batch then carries both codes
+    assert len(node.requests) == 2 and len(node.requests[1]) == 2
+    assert result["analysis"]["bytecode"]["proxy"]["implementation"] == TOKEN
+    assert [f["pattern"] for f in result["analysis"]["findings"]] == ["fee", "upgradeable-proxy"]
+    assert result["implementation"] == {"address": TOKEN, "source_available": False, "analysis": {}}
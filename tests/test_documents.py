@@ -1,5 +1,7 @@
 """Tests for RAG / document endpoints."""
 
+import json
+
 
 def test_search_documents(client):
     resp = client.get("/api/v1/documents/search", params={"q": "owner drain", "k": 3})
@@ -32,3 +34,28 @@ def test_index_and_list_docs(client, admin_headers):
     resp = client.get("/api/v1/documents/", headers=admin_headers)
     assert resp.status_code == 200
     assert "test_1" in resp.json()["docs"]
+
+
+def test_list_docs_pages_with_cursor_and_prefix(client, admin_headers):
+    ids = [f"page-{i}" for i in range(5)]
+    client.post("/api/v1/documents/", json={"docs": ids, "ids": ids[::-1]}, headers=admin_headers)
+    seen, cursor = [], None
+    while True:
+        params = {"prefix": "page-", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/api/v1/documents/", params=params, headers=admin_headers).json()
+        assert len(data["docs"]) <= 2 and data["pagination"]["limit"] == 2
+        seen += data["docs"]
+        cursor = data["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ids
+
+    resp = client.get("/api/v1/documents/", params={"cursor": "not-a-cursor"}, headers=admin_headers)
+    assert resp.status_code == 422
+
+
+def test_export_docs_streams_ndjson(client, admin_headers):
+    client.post("/api/v1/documents/", json={"docs": ["a", "b"], "ids": ["exp-b", "exp-a"]}, headers=admin_headers)
+    resp = client.get("/api/v1/documents/export", params={"prefix": "exp-"}, headers=admin_headers)
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in resp.text.splitlines()] == [{"doc_id": "exp-a"}, {"doc_id": "exp-b"}]
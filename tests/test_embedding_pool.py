@@ -0,0 +1,50 @@
+"""Tests for the multi-process bulk embedding pool."""
+
+import numpy as np
+import pytest
+
+from app.core.config import get_settings
+from app.services import embedding_pool
+from app.services.embedding_pool import EmbeddingPool
+from app.services.indexer_service import IndexerService, hash_embed
+
+
+def _texts(n):
+    return [f"doc {i} owner mint w{i % 97} burn w{i % 13}" for i in range(n)]
+
+
+@pytest.fixture
+def pool():
+    p = EmbeddingPool({"kind": "hash", "dim": 64}, workers=2, chunk=50)
+    yield p
+    p.close()
+
+
+def test_pool_matches_in_process_embeddings_in_order(pool):
+    texts = _texts(537)  # not a multiple of the chunk size
+    out = pool.encode(texts)
+    assert out.shape == (537, 64) and out.dtype == np.float32
+    np.testing.assert_array_equal(out, hash_embed(texts, 64))
+    np.testing.assert_array_equal(pool.encode(texts[:3]), hash_embed(texts[:3], 64))
+
+
+def test_large_add_texts_use_the_pool(monkeypatch, tmp_path):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "hash")
+    monkeypatch.setattr(settings, "EMBEDDING_POOL_WORKERS", 2)
+    monkeypatch.setattr(settings, "EMBEDDING_POOL_MIN_TEXTS", 100)
+    used = []
+
+    def encode(self, texts):
+        used.append(len(texts))
+        return hash_embed(texts, self.spec["dim"])
+
+    monkeypatch.setattr(embedding_pool.EmbeddingPool, "encode", encode)
+    indexer = IndexerService(index_path=str(tmp_path / "pooled.index"), load_persisted=False)
+    indexer.add_texts(_texts(99))
+    indexer.add_texts(_texts(300))
+    try:
+        assert used == [300]
+        assert indexer.doc_count == indexer.vector_count == 399
+    finally:
+        embedding_pool.shutdown_pools()
@@ -0,0 +1,141 @@
+"""Tests for the ONNX / int8 CPU embedding runtimes."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.services.embedding_runtime import QuantizedEncoder, cpu_quota, length_batches
+
+WORDS = [
+    "the",
+    "owner",
+    "can",
+    "mint",
+    "burn",
+    "tokens",
+    "and",
+    "transfer",
+    "fees",
+    "to",
+    "any",
+    "address",
+    "proxy",
+    "contract",
+    "upgrade",
+]
+
+
+def tiny_model(directory: str) -> str:
+    """A small random BERT laid out like a sentence-transformers model directory (mean pooling + normalize)."""
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS + [f"w{i}" for i in range(300)]
+    with open(os.path.join(directory, "vocab.txt"), "w") as f:
+        f.write("\n".join(vocab))
+    transformers.BertTokenizerFast(vocab_file=os.path.join(directory, "vocab.txt")).save_pretrained(directory)
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=128, num_hidden_layers=2, num_attention_heads=4, intermediate_size=256
+    )
+    transformers.BertModel(config).save_pretrained(directory)
+    modules = [
+        {"idx": 0, "name": "0", "path": "", "type": "sentence_transformers.models.Transformer"},
+        {"idx": 1, "name": "1", "path": "1_Pooling", "type": "sentence_transformers.models.Pooling"},
+        {"idx": 2, "name": "2", "path": "2_Normalize", "type": "sentence_transformers.models.Normalize"},
+    ]
+    with open(os.path.join(directory, "modules.json"), "w") as f:
+        json.dump(modules, f)
+    os.makedirs(os.path.join(directory, "1_Pooling"))
+    with open(os.path.join(directory, "1_Pooling", "config.json"), "w") as f:
+        json.dump({"word_embedding_dimension": 128, "pooling_mode_mean_tokens": True}, f)
+    return directory
+
+
+def texts(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS + [f"w{i}" for i in range(300)], size=rng.integers(2, 80))) for _ in range(n)]
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    return tiny_model(str(tmp_path_factory.mktemp("model")))
+
+
+def test_length_batches_stay_dense():
+    lengths = [5, 120, 7, 118, 6, 64, 8]
+    batches = length_batches(lengths, max_batch=3, max_tokens=256)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or max(lengths[i] for i in batch) * len(batch) <= 256
+    assert [1, 3] in batches  # the two long rows share a batch; no short row is padded to 120
+    assert length_batches([500], max_batch=8, max_tokens=256) == [[0]]
+
+
+def test_cpu_quota_reads_cgroup_limits(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cpu_quota(str(tmp_path)) == min(1.5, len(os.sched_getaffinity(0)))
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cpu_quota(str(tmp_path)) == len(os.sched_getaffinity(0))
+
+
+@pytest.mark.parametrize("runtime", ["int8", "onnx"])
+def test_parity_with_the_unquantised_model(model_dir, runtime):
+    if runtime == "onnx":
+        pytest.importorskip("onnxruntime")
+        from app.services.embedding_runtime import export_onnx
+
+        export_onnx(model_dir)
+    batch = texts(64)
+    reference = QuantizedEncoder(model_dir, "torch").encode(batch)
+    fast = QuantizedEncoder(model_dir, runtime, batch_size=8, batch_tokens=256).encode(batch)
+    assert fast.shape == reference.shape and fast.dtype == np.float32
+    assert (np.sum(fast * reference, axis=1) > 0.99).all()  # both are L2-normalised
+
+
+def test_batching_preserves_input_order(model_dir):
+    encoder = QuantizedEncoder(model_dir, "torch", batch_size=4, batch_tokens=128)
+    batch = texts(12, seed=1)
+    one_by_one = np.stack([encoder.encode([t])[0] for t in batch])
+    np.testing.assert_allclose(encoder.encode(batch), one_by_one, atol=1e-5)
+
+
+def test_matches_sentence_transformers(model_dir):
+    st = pytest.importorskip("sentence_transformers")
+    batch = texts(16)
+    expected = st.SentenceTransformer(model_dir, device="cpu").encode(batch, convert_to_numpy=True)
+    np.testing.assert_allclose(QuantizedEncoder(model_dir, "torch").encode(batch), expected, atol=1e-4)
+
+
+def test_indexer_uses_the_int8_runtime(model_dir, monkeypatch, tmp_path):
+    from app.core.config import get_settings
+    from app.services.indexer_service import IndexerService
+
+    monkeypatch.setattr(get_settings(), "EMBEDDING_BACKEND", "int8")
+    monkeypatch.setattr(get_settings(), "EMBEDDING_MODEL_DIR", model_dir)
+    indexer = IndexerService(index_path=str(tmp_path / "int8.index"), load_persisted=False)
+    assert isinstance(indexer.model, QuantizedEncoder) and indexer.backend == f"sentence:{model_dir}"
+    indexer.add_texts(["the owner can mint tokens", "transfer fees to any address"], ["mint", "fees"])
+    assert indexer.search("owner mint tokens", k=1)[0][0] == "mint"
+
+
+def test_pinned_runtime_never_degrades_to_tfidf(monkeypatch, tmp_path):
+    import app.services.indexer_service as indexer_service
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(indexer_service, "_runtime_available", lambda runtime: False)
+    monkeypatch.setattr(indexer_service, "_sentence_transformer_cls", lambda: None)
+    with pytest.raises(RuntimeError, match="EMBEDDING_BACKEND=onnx"):
+        indexer_service.IndexerService(index_path=str(tmp_path / "onnx.index"), load_persisted=False)
+
+    class FakeSentenceTransformer:
+        def __init__(self, name):
+            self.name = name
+
+    monkeypatch.setattr(indexer_service, "_sentence_transformer_cls", lambda: FakeSentenceTransformer)
+    indexer = indexer_service.IndexerService(index_path=str(tmp_path / "onnx.index"), load_persisted=False)
+    assert indexer.runtime is None and isinstance(indexer.model, FakeSentenceTransformer)
+    assert indexer.backend == f"sentence:{get_settings().EMBEDDING_MODEL}"
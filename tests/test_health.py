@@ -33,3 +33,85 @@ def test_security_headers(client):
     resp = client.get("/api/v1/health")
     assert resp.headers.get("x-content-type-options") == "nosniff"
     assert resp.headers.get("x-frame-options") == "DENY"
+
+
+def test_readiness_serves_the_monitors_last_round(client):
+    monitor = client.app.state.health
+    calls = []
+    probe = monitor.probes["database"]
+    monitor.probes["database"] = lambda: calls.append(1) or probe()
+    try:
+        for _ in range(3):
+            resp = client.get("/api/v1/readiness")
+            assert resp.status_code == 200
+        assert calls == []  # probes never run on the request path
+        db = next(c for c in resp.json()["checks"] if c["name"] == "database")
+        assert db["status"] == "ok" and db["checked_at"] and db["latency_history_ms"]
+        assert not db["stale"]
+    finally:
+        monitor.probes["database"] = probe
+
+
+def test_monitor_records_failures_history_and_staleness(tmp_path):
+    import sqlite3
+    import time
+
+    from app.services.health_monitor import HealthMonitor, http_probe, sqlite_probe
+
+    sqlite3.connect(str(tmp_path / "ok.db")).close()
+    monitor = HealthMonitor(
+        {
+            "ok": sqlite_probe(str(tmp_path / "ok.db"), 0.1),
+            "missing": sqlite_probe(str(tmp_path / "missing.db"), 0.1),
+            "unreachable": http_probe("http://127.0.0.1:9", 0.5),
+        },
+        interval=1,
+        stale_after=5,
+        history=2,
+    )
+    for _ in range(3):
+        monitor.run_all()
+    checks = {c["name"]: c for c in monitor.snapshot()}
+    assert checks["ok"]["status"] == "ok"
+    assert checks["missing"]["status"] == "down" and "OperationalError" in checks["missing"]["error"]
+    assert checks["unreachable"]["status"] == "down"
+    assert len(checks["ok"]["latency_history_ms"]) == 2
+    assert not (tmp_path / "missing.db").exists()  # read-only probes never create files
+    assert all(c["stale"] for c in monitor.snapshot(now=time.time() + 60))
+
+
+def test_remote_index_probe_waits_the_health_check_timeout(monkeypatch, tmp_path):
+    import socket
+
+    from app.core.config import get_settings
+    from app.services.health_monitor import HealthMonitor
+
+    path = str(tmp_path / "silent.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()  # connections are accepted by the kernel but never answered
+    monkeypatch.setattr(get_settings(), "INDEX_MODE", "remote")
+    monkeypatch.setattr(get_settings(), "INDEX_SERVER_SOCKET", path)
+    monkeypatch.setattr(get_settings(), "HEALTH_CHECK_TIMEOUT", 0.2)
+    try:
+        state = HealthMonitor.for_app(lambda: object(), lambda: False).run_check("indexer")
+    finally:
+        server.close()
+    assert state.status == "down" and "no response within 0.2s" in state.error
+    assert state.latency_ms < 5000  # not INDEX_SERVER_TIMEOUT
+
+
+def test_indexer_probe_never_reports_a_finishing_warm_up_as_failed():
+    from app.services.health_monitor import indexer_probe
+
+    state = {"indexer": None, "warming": True}
+
+    def then_finish(name):
+        def read():
+            value = state[name]
+            state.update(indexer=object(), warming=False)  # the warm-up completes right after the first read
+            return value
+
+        return read
+
+    assert indexer_probe(then_finish("indexer"), then_finish("warming"))() is None
@@ -0,0 +1,79 @@
+"""Tests for ETags, conditional requests and per-route Cache-Control."""
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.contract_service import ContractService
+
+ADDRESS = "0x" + "ab" * 20
+SOURCE = "contract Token { address owner; function mint(address to) external {} }"
+
+
+class _Fake(ContractService):
+    """Canned verified source; counts how often the rules actually run."""
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.scans = 0
+
+    def fetch_source(self, address):
+        return {"SourceCode": self.source}
+
+    def _implementation_from_slot(self, address):
+        return None
+
+    def analyze_source(self, source):
+        self.scans += 1
+        return super().analyze_source(source)
+
+
+@pytest.fixture
+def fake(client, monkeypatch):
+    svc = _Fake(SOURCE)
+    monkeypatch.setattr(client.app.state, "contracts", svc)
+    return svc
+
+
+def test_analysis_revalidates_without_rescanning(client, fake):
+    resp = client.get("/api/v1/contracts/analyze", params={"address": ADDRESS})
+    assert resp.status_code == 200 and fake.scans == 1
+    tag = resp.headers["etag"]
+    assert tag.startswith('W/"')
+    assert resp.headers["cache-control"] == get_settings().CACHE_CONTROL_ANALYSIS
+
+    resp = client.get("/api/v1/contracts/analyze", params={"address": ADDRESS}, headers={"If-None-Match": tag})
+    assert resp.status_code == 304 and resp.content == b""
+    assert resp.headers["etag"] == tag and fake.scans == 1
+
+    fake.source = SOURCE + " // v2"
+    resp = client.get("/api/v1/contracts/analyze", params={"address": ADDRESS}, headers={"If-None-Match": tag})
+    assert resp.status_code == 200 and resp.headers["etag"] != tag and fake.scans == 2
+
+
+def test_failed_analysis_is_not_cached(client):
+    resp = client.get("/api/v1/contracts/analyze", params={"address": "0x" + "12" * 20})
+    assert resp.json()["analysis"]["error"]
+    assert "etag" not in resp.headers and resp.headers["cache-control"] == "no-store"
+
+
+def test_search_etag_follows_the_index(client, admin_headers):
+    params = {"q": "etag probe", "k": 3}
+    resp = client.get("/api/v1/documents/search", params=params)
+    tag = resp.headers["etag"]
+    assert resp.headers["cache-control"] == get_settings().CACHE_CONTROL_SEARCH
+
+    resp = client.get("/api/v1/documents/search", params=params, headers={"If-None-Match": f'"x", {tag}'})
+    assert resp.status_code == 304
+    resp = client.get("/api/v1/documents/search", params={**params, "k": 4}, headers={"If-None-Match": tag})
+    assert resp.status_code == 200
+
+    client.post("/api/v1/documents/", json={"docs": ["etag probe document"]}, headers=admin_headers)
+    resp = client.get("/api/v1/documents/search", params=params, headers={"If-None-Match": tag})
+    assert resp.status_code == 200 and resp.headers["etag"] != tag
+
+
+def test_everything_else_is_no_store(client, admin_headers):
+    assert client.get("/api/v1/health").headers["cache-control"] == "no-store"
+    resp = client.get("/api/v1/admin/keys", headers=admin_headers)
+    assert resp.status_code == 200 and resp.headers["cache-control"] == "no-store"
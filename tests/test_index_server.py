@@ -0,0 +1,110 @@
+"""Tests for the shared index server and its client."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.exceptions import AstraBlockError, ExternalServiceError
+from app.services.index_client import RemoteIndexer
+from app.services.index_server import IndexServer
+from app.services.indexer_service import IndexerService
+
+
+@pytest.fixture()
+def index_server(tmp_path):
+    indexer = IndexerService(index_path=str(tmp_path / "shared.index"))
+    server = IndexServer(indexer, socket_path=str(tmp_path / "idx.sock"))
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(10)
+    yield server
+
+    async def shutdown():
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        await asyncio.sleep(0)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_writes_visible_to_all_clients(index_server):
+    a = RemoteIndexer(socket_path=index_server.socket_path)
+    b = RemoteIndexer(socket_path=index_server.socket_path)
+    assert a.add_texts(["owner can mint", "liquidity pool pair"], ["m", "p"]) == 2
+    assert b.doc_count == 2
+    assert b.ids == ["m", "p"]
+    assert b.list_ids(after="m") == ["p"] and b.list_ids(prefix="m") == ["m"]
+    assert b.generation == 1
+    results = b.search("mint", k=1)
+    assert results[0][0] == "m"
+
+
+def test_remote_errors_are_external_service_errors(index_server):
+    client = RemoteIndexer(socket_path=index_server.socket_path)
+    with pytest.raises(ExternalServiceError):
+        client._call("no-such-op")
+
+
+def test_unreachable_server(tmp_path):
+    client = RemoteIndexer(socket_path=str(tmp_path / "missing.sock"))
+    with pytest.raises(ExternalServiceError):
+        client.warm_up(wait=0)
+
+
+def test_snapshot_load_swaps_the_served_index(index_server, tmp_path):
+    index_server.snapshots.directory = str(tmp_path / "snaps")
+    client = RemoteIndexer(socket_path=index_server.socket_path)
+    client.add_texts(["owner can mint", "liquidity pool pair"], ["m", "p"])
+    assert client.export_snapshot("v1")["doc_count"] == 2
+    client.add_texts(["burn tokens"], ["b"])
+
+    generation = client.generation
+    assert client.load_snapshot("v1")["name"] == "v1"
+    assert client.snapshot_id == "v1" and client.ids == ["m", "p"]
+    assert client.generation == generation + 1
+    assert [s["name"] for s in client.list_snapshots()] == ["v1"]
+    # server-side 4xx errors keep their status instead of becoming 502s
+    with pytest.raises(AstraBlockError) as exc:
+        client.load_snapshot("missing")
+    assert exc.value.status_code == 404
+
+
+def test_reads_do_not_wait_for_the_write_lock(index_server):
+    client = RemoteIndexer(socket_path=index_server.socket_path)
+    client.add_texts(["owner can mint"], ["m"])
+    with index_server._lock:  # as if a write or snapshot swap were in progress
+        assert client.search("mint", k=1)[0][0] == "m"
+        assert client.doc_count == 1
+
+
+def test_timed_out_write_is_not_resent(index_server, monkeypatch):
+    calls = []
+    add_texts = index_server._indexer.add_texts
+
+    def slow_add(texts, ids=None):
+        calls.append(texts)
+        time.sleep(0.3)
+        return add_texts(texts, ids)
+
+    monkeypatch.setattr(index_server._indexer, "add_texts", slow_add)
+    client = RemoteIndexer(socket_path=index_server.socket_path, timeout=0.1)
+    assert client.doc_count == 0  # leaves a pooled connection behind
+    with pytest.raises(ExternalServiceError):
+        client.add_texts(["owner can mint"], ["m"])
+    time.sleep(0.5)
+    assert len(calls) == 1 and index_server._indexer.ids == ["m"]
@@ -0,0 +1,101 @@
+"""Tests for index snapshot export, validation and hot swap."""
+
+import gc
+import json
+import os
+import weakref
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.services.index_snapshot import MANIFEST, SnapshotManager, load_snapshot, write_snapshot
+from app.services.indexer_service import IndexerService
+
+DOCS = ["owner can mint unlimited tokens", "liquidity locked for a year", "proxy upgrade by admin"]
+
+
+def _indexer(tmp_path, name="live"):
+    svc = IndexerService(index_path=str(tmp_path / f"{name}.index"), load_persisted=False)
+    svc.add_texts(DOCS, ["mint", "lock", "proxy"])
+    return svc
+
+
+def test_snapshot_round_trip(tmp_path):
+    live = _indexer(tmp_path)
+    manifest = write_snapshot(live, str(tmp_path / "snaps"), "v1")
+    assert manifest["doc_count"] == 3 and manifest["backend"] == live.backend
+    assert not [d for d in os.listdir(tmp_path / "snaps") if d.startswith(".tmp-")]
+
+    loaded = load_snapshot(str(tmp_path / "snaps" / "v1"), IndexerService(index_path=str(tmp_path / "other.index")))
+    assert loaded.ids == live.ids and loaded.snapshot_id == "v1"
+    assert loaded.search("mint tokens", k=1) == live.search("mint tokens", k=1)
+
+
+def test_corrupt_or_foreign_snapshots_are_rejected(tmp_path):
+    live = _indexer(tmp_path)
+    snaps = tmp_path / "snaps"
+    write_snapshot(live, str(snaps), "tampered")
+    with open(snaps / "tampered" / "ids.json", "w") as f:
+        json.dump(["mint", "lock", "evil"], f)
+    with pytest.raises(ValidationError, match="checksum"):
+        load_snapshot(str(snaps / "tampered"), live)
+
+    write_snapshot(live, str(snaps), "foreign")
+    manifest = json.loads((snaps / "foreign" / MANIFEST).read_text())
+    (snaps / "foreign" / MANIFEST).write_text(json.dumps({**manifest, "backend": "hash-4096"}))
+    with pytest.raises(ValidationError, match="backend"):
+        load_snapshot(str(snaps / "foreign"), live)
+
+    with pytest.raises(ValidationError):
+        write_snapshot(live, str(snaps), "../escape")
+
+
+def test_swap_leaves_in_flight_readers_on_the_old_index(tmp_path):
+    holder = {"indexer": _indexer(tmp_path)}
+    manager = SnapshotManager(lambda: holder["indexer"], lambda ix: holder.update(indexer=ix), str(tmp_path / "snaps"))
+    manager.export_snapshot("v1")
+    holder["indexer"].add_texts(["written after the snapshot"], ["late"])
+
+    in_flight = holder["indexer"]
+    released = weakref.ref(in_flight)
+    manager.load_snapshot("v1")
+    assert holder["indexer"] is not in_flight and holder["indexer"].snapshot_id == "v1"
+    assert "late" not in holder["indexer"].ids
+    # a search that had already taken the old index still completes on it
+    assert "late" in [doc_id for doc_id, _ in in_flight.search("mint", k=4)]
+    del in_flight
+    gc.collect()
+    assert released() is None
+
+
+def test_watcher_loads_newest_snapshot_and_skips_bad_ones(tmp_path):
+    holder = {"indexer": _indexer(tmp_path)}
+    manager = SnapshotManager(lambda: holder["indexer"], lambda ix: holder.update(indexer=ix), str(tmp_path / "snaps"))
+    manager.export_snapshot("20240101")
+    assert manager.poll()["name"] == "20240101"
+    assert manager.poll() is None  # already live
+
+    manager.export_snapshot("20240102")
+    os.remove(tmp_path / "snaps" / "20240102" / "ids.json")
+    assert manager.poll() is None and manager.poll() is None
+    assert holder["indexer"].snapshot_id == "20240101"
+
+
+def test_admin_snapshot_endpoints(client, admin_headers):
+    assert client.post("/api/v1/admin/index/snapshots", json={}).status_code == 403
+    resp = client.post("/api/v1/admin/index/snapshots", json={"name": "api-v1"}, headers=admin_headers)
+    assert resp.status_code == 201
+    assert resp.json()["doc_count"] > 0
+    assert (
+        client.post("/api/v1/admin/index/snapshots", json={"name": "api-v1"}, headers=admin_headers).status_code == 409
+    )
+    unnamed = client.post("/api/v1/admin/index/snapshots", headers=admin_headers)
+    assert unnamed.status_code == 201 and unnamed.json()["name"].endswith(f"-{unnamed.json()['doc_count']}")
+
+    resp = client.post("/api/v1/admin/index/snapshots/api-v1/load", headers=admin_headers)
+    assert resp.status_code == 200
+    listed = client.get("/api/v1/admin/index/snapshots", headers=admin_headers).json()
+    assert listed["live"] == "api-v1" and "api-v1" in [s["name"] for s in listed["snapshots"]]
+    assert client.get("/api/v1/documents/search", params={"q": "owner drain"}).status_code == 200
+
+    assert client.post("/api/v1/admin/index/snapshots/missing/load", headers=admin_headers).status_code == 404
@@ -1,4 +1,5 @@
 """Tests for the indexer service."""
+
 from app.services.indexer_service import IndexerService
 
 
@@ -15,3 +16,37 @@ def test_indexer_add_and_count():
     svc = IndexerService(index_path="./data/test_index2")
     svc.add_texts(["hello world", "foo bar"], ["a", "b"])
     assert svc.doc_count == 2
+
+
+def test_hash_backend_is_deterministic():
+    svc = IndexerService(index_path="./data/test_index_hash")
+    a = svc._embed_hash(["owner can mint tokens"])
+    b = svc._embed_hash(["owner can mint tokens"])
+    assert (a == b).all()
+    assert abs(float((a**2).sum()) - 1.0) < 1e-5
+
+
+def test_list_ids_follows_small_and_bulk_writes(tmp_path):
+    svc = IndexerService(index_path=str(tmp_path / "ids.index"))
+    svc.add_texts(["owner can mint", "liquidity pool"], ["m", "c"])
+    assert svc.list_ids() == ["c", "m"]
+    svc.add_texts(["burn tokens"], ["a"])  # insorted into the existing view
+    svc.add_texts([f"bulk document {i}" for i in range(50)], [f"b{i:02d}" for i in range(50)])  # merged
+    assert svc.list_ids(limit=1000) == sorted(svc.ids)
+    assert svc.list_ids(prefix="b4", limit=3) == ["b40", "b41", "b42"]
+
+
+def test_warm_up_embeds_its_query_once(tmp_path):
+    import numpy as np
+
+    encoded = []
+
+    class CountingModel:
+        def encode(self, texts, convert_to_numpy=True):
+            encoded.append(list(texts))
+            return np.zeros((len(texts), 8), dtype=np.float32)
+
+    svc = IndexerService(index_path=str(tmp_path / "warm.index"), load_persisted=False)
+    svc.use_hash, svc.use_sentence, svc.model = False, True, CountingModel()
+    svc.warm_up()
+    assert encoded == [["warm-up"]]
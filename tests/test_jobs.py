@@ -0,0 +1,146 @@
+"""Tests for the background job queue."""
+
+import asyncio
+import threading
+import time
+
+from app.core.security import key_owner
+from app.repositories.job_repository import JobRepository
+from app.services.job_service import JobManager
+
+ADDR = "0x0000000000000000000000000000000000000000"
+
+
+def _wait(client, headers, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+def test_ingest_job_lifecycle(client, admin_headers):
+    docs = [f"job ingest document number {i} about liquidity pools" for i in range(250)]
+    ids = [f"job_doc_{i}" for i in range(250)]
+    resp = client.post("/api/v1/jobs/ingest", json={"docs": docs, "ids": ids}, headers=admin_headers)
+    assert resp.status_code == 202
+    body = resp.json()
+    assert resp.headers["location"] == body["status_url"] == f"/api/v1/jobs/{body['job_id']}"
+
+    job = _wait(client, admin_headers, body["job_id"])
+    assert job["status"] == "succeeded" and job["progress"] == 1
+    result = client.get(f"/api/v1/jobs/{body['job_id']}/result", headers=admin_headers).json()
+    assert result["result"]["indexed"] == 250
+    params = {"prefix": "job_doc_249"}
+    listed = client.get("/api/v1/documents/", params=params, headers=admin_headers).json()["docs"]
+    assert listed == ["job_doc_249"]
+
+
+def test_analyze_job_collects_per_address_results(client, admin_headers):
+    resp = client.post("/api/v1/jobs/analyze", json={"addresses": [ADDR, ADDR], "priority": 5}, headers=admin_headers)
+    assert resp.status_code == 202
+    job = _wait(client, admin_headers, resp.json()["job_id"])
+    assert job["status"] == "succeeded"
+    result = client.get(f"/api/v1/jobs/{job['job_id']}/result", headers=admin_headers).json()
+    assert [r["address"] for r in result["result"]["results"]] == [ADDR, ADDR]
+
+
+def test_unfinished_and_foreign_jobs(client, admin_headers):
+    # a job type no worker serves stays queued
+    job = JobRepository().create("unserved", {}, owner=key_owner(admin_headers["X-API-Key"]))
+    resp = client.get(f"/api/v1/jobs/{job['id']}/result", headers=admin_headers)
+    assert resp.status_code == 409
+
+    user_key = client.post("/api/v1/admin/keys", json={"name": "jobs-test"}, headers=admin_headers).json()["key"]
+    assert client.get(f"/api/v1/jobs/{job['id']}", headers={"X-API-Key": user_key}).status_code == 404
+    assert client.get("/api/v1/jobs/nope", headers=admin_headers).status_code == 404
+
+
+def test_interrupted_job_resumes_from_checkpoint(tmp_path):
+    repo = JobRepository(str(tmp_path / "jobs.db"))
+    release = threading.Event()
+    seen = []
+
+    def first_attempt(payload, ctx):
+        ctx.report(0.5, checkpoint=2)
+        release.wait(5)
+
+    def second_attempt(payload, ctx):
+        seen.append((ctx.checkpoint, ctx.attempt))
+        return {"ok": True}
+
+    async def run():
+        manager = JobManager(repo)
+        manager.register("work", first_attempt)
+        await manager.start()
+        job = manager.submit("work", {"n": 4})
+        while repo.get(job["id"])["checkpoint"] != 2:
+            await asyncio.sleep(0.02)
+        await manager.stop()  # graceful restart: the job goes straight back on the queue
+        release.set()
+        assert repo.get(job["id"])["status"] == "queued"
+
+        restarted = JobManager(repo)
+        restarted.register("work", second_attempt)
+        await restarted.start()
+        while repo.get(job["id"])["status"] != "succeeded":
+            await asyncio.sleep(0.02)
+        await restarted.stop()
+
+    asyncio.run(run())
+    assert seen == [(2, 2)]
+
+
+def test_crashed_worker_jobs_are_requeued(tmp_path):
+    repo = JobRepository(str(tmp_path / "jobs.db"))
+    job = repo.create("work", {})
+    assert repo.claim("work", "dead-worker")["status"] == "running"
+    assert repo.claim("work", "other") is None
+    time.sleep(0.01)
+    assert repo.requeue_stale(0.0) == 1
+    assert repo.get(job["id"])["status"] == "queued"
+
+
+def test_job_that_keeps_killing_its_worker_is_failed(tmp_path):
+    repo = JobRepository(str(tmp_path / "jobs.db"))
+    job = repo.create("work", {})
+    repo.claim("work", "dead-worker")
+    time.sleep(0.01)
+    assert repo.requeue_stale(0.0, max_attempts=2) == 1
+    repo.claim("work", "dead-worker")
+    time.sleep(0.01)
+    assert repo.requeue_stale(0.0, max_attempts=2) == 0
+    failed = repo.get(job["id"])
+    assert failed["status"] == "failed" and failed["attempts"] == 2 and "giving up" in failed["error"]
+
+
+def test_worker_survives_repository_errors_and_unstorable_results(tmp_path):
+    import sqlite3
+
+    class FlakyRepository(JobRepository):
+        failures = 1
+
+        def claim(self, job_type, worker):
+            if self.failures:
+                self.failures -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return super().claim(job_type, worker)
+
+    repo = FlakyRepository(str(tmp_path / "jobs.db"))
+
+    async def run():
+        manager = JobManager(repo)
+        manager._poll = 0.01
+        manager.register("work", lambda payload, ctx: object() if payload == "bad" else payload)
+        await manager.start()
+        bad, good = manager.submit("work", "bad"), manager.submit("work", "good")
+        deadline = time.monotonic() + 10
+        while repo.get(good["id"])["status"] != "succeeded" and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        await manager.stop()
+        return repo.get(bad["id"])
+
+    bad = asyncio.run(run())
+    assert bad["status"] == "failed" and bad["error"].startswith("result not stored: TypeError")
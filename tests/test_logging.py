@@ -0,0 +1,46 @@
+"""Tests for structured / queued logging."""
+
+import json
+import logging
+import queue
+
+from app.core.logging import (
+    DroppingQueueHandler,
+    JSONFormatter,
+    RequestContextFilter,
+    SamplingFilter,
+)
+from app.core.tracing import REQUEST_ID_CTX
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord("astra.test", level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_injects_request_id():
+    token = REQUEST_ID_CTX.set("rid-123")
+    try:
+        record = _record()
+        RequestContextFilter().filter(record)
+    finally:
+        REQUEST_ID_CTX.reset(token)
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["request_id"] == "rid-123"
+    assert entry["timestamp"].endswith("+00:00")
+
+
+def test_sampling_keeps_warnings():
+    f = SamplingFilter(rate=0.0001)
+    assert f.filter(_record(level=logging.WARNING))
+    kept = sum(f.filter(_record()) for _ in range(1000))
+    assert kept < 50
+
+
+def test_queue_handler_drops_when_full():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().getMessage() == "hello world"
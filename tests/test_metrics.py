@@ -0,0 +1,46 @@
+"""Tests for the Prometheus metrics endpoint and instrumentation."""
+
+from app.core.metrics import record_cache, stage_timer
+from app.middleware.rate_limiter import SlidingWindowRateLimiter
+
+
+def test_metrics_endpoint_exports_request_counts(client):
+    client.get("/api/v1/health")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'astra_http_requests_total{method="GET",route="/api/v1/health",status="200"}' in body
+    assert "astra_http_request_duration_seconds_bucket" in body
+
+
+def test_metrics_route_label_uses_template(client, admin_headers):
+    client.delete("/api/v1/admin/keys/does-not-exist", headers=admin_headers)
+    body = client.get("/metrics").text
+    assert 'route="/api/v1/admin/keys/{key}"' in body
+    assert "does-not-exist" not in body
+
+
+def test_stage_timer_and_cache_ratio(client):
+    with stage_timer("unit_test_stage"):
+        pass
+    record_cache("unit_test_cache", hit=True)
+    record_cache("unit_test_cache", hit=False)
+    body = client.get("/metrics").text
+    assert 'astra_stage_duration_seconds_count{stage="unit_test_stage"} 1.0' in body
+    assert 'astra_cache_hit_ratio{cache="unit_test_cache"} 0.5' in body
+
+
+def test_rate_limit_rejection_is_counted(client):
+    app = client.app
+    original = app.state.rate_limiter
+    app.state.rate_limiter = SlidingWindowRateLimiter(calls=1, period=60)
+    try:
+        headers = {"X-API-Key": "rate-limit-probe"}
+        assert client.get("/", headers=headers).status_code == 200
+        resp = client.get("/", headers=headers)
+    finally:
+        app.state.rate_limiter = original
+    assert resp.status_code == 429
+    assert resp.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+    assert "astra_rate_limit_rejections_total 1.0" in client.get("/metrics").text
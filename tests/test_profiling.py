@@ -0,0 +1,59 @@
+"""Tests for the admin profiling endpoints."""
+
+import threading
+
+from app.core.profiling import sample_stacks
+
+
+def test_sample_stacks_collapsed_format():
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="sampled-worker")  # the sampler skips its own thread
+    worker.start()
+    try:
+        out = sample_stacks(0.05, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+    line = next(ln for ln in out.splitlines() if ln.startswith("sampled-worker;"))
+    stack, count = line.rsplit(" ", 1)
+    assert int(count) >= 1
+    assert ";" in stack
+
+
+def test_profile_requires_admin(client):
+    resp = client.get("/api/v1/admin/profile/cpu", params={"seconds": 0.1})
+    assert resp.status_code == 403
+
+
+def test_cpu_profile_modes(client, admin_headers):
+    resp = client.get("/api/v1/admin/profile/cpu", params={"seconds": 0.1}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+
+    resp = client.get("/api/v1/admin/profile/cpu", params={"seconds": 0.1, "mode": "cprofile"}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert "function calls" in resp.text
+
+
+def test_memory_profile(client, admin_headers):
+    resp = client.get("/api/v1/admin/profile/memory", params={"seconds": 0.1}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert isinstance(resp.json()["allocations"], list)
+
+
+def test_per_request_profile_header(client, admin_headers):
+    resp = client.get(
+        "/api/v1/documents/search", params={"q": "profiled search"}, headers={**admin_headers, "X-Profile": "1"}
+    )
+    assert resp.status_code == 200
+    profile_id = resp.headers["x-profile-id"]
+
+    resp = client.get(f"/api/v1/admin/profile/requests/{profile_id}", headers=admin_headers)
+    assert resp.status_code == 200
+    assert "function calls" in resp.text
+    assert "search" in resp.text  # the worker-thread call, not just the event loop
+
+
+def test_profile_header_ignored_without_admin_key(client):
+    resp = client.get("/api/v1/health", headers={"X-Profile": "1"})
+    assert "x-profile-id" not in resp.headers
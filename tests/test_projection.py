@@ -0,0 +1,125 @@
+"""Tests for PCA / truncation projections of stored embeddings."""
+
+import numpy as np
+import pytest
+
+from app.core.config import get_settings
+from app.services.index_snapshot import load_snapshot, write_snapshot
+from app.services.indexer_service import IndexerService
+from app.services.projection import Projection
+
+
+def _structured(n, dim=128, rank=16, seed=0):
+    """Vectors whose variance sits in a few directions, like real embeddings."""
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((rank, dim))
+    x = rng.standard_normal((n, rank)) @ basis + 0.05 * rng.standard_normal((n, dim))
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _recall_at_10(full, reduced, queries_full, queries_reduced):
+    truth = np.argsort(-(queries_full @ full.T), axis=1)[:, :10]
+    got = np.argsort(-(queries_reduced @ reduced.T), axis=1)[:, :10]
+    return np.mean([len(set(t) & set(g)) / 10 for t, g in zip(truth, got, strict=True)])
+
+
+def test_pca_keeps_neighbours_at_a_quarter_of_the_dimensions():
+    data = _structured(2050)
+    vectors, queries = data[:2000], data[2000:]
+    projection = Projection.create("pca", vectors, 32, sample_size=500)
+    reduced = projection.apply(vectors)
+    assert reduced.shape == (2000, 32)
+    np.testing.assert_allclose(np.linalg.norm(reduced, axis=1), 1.0, rtol=1e-5)
+    assert _recall_at_10(vectors, reduced, queries, projection.apply(queries)) > 0.9
+
+
+def test_truncate_renormalises_the_leading_dimensions(tmp_path):
+    projection = Projection.truncate(8, 3)
+    out = projection.apply(np.array([[3.0, 0.0, 4.0, 9.0, 9.0, 9.0, 9.0, 9.0]]))
+    np.testing.assert_allclose(out, [[0.6, 0.0, 0.8]])
+    projection.save(str(tmp_path / "p.npz"))
+    loaded = Projection.load(str(tmp_path / "p.npz"))
+    assert repr(loaded) == "truncate-8to3" and loaded.mean is None
+    with pytest.raises(ValueError):
+        projection.apply(np.zeros((1, 4)))
+
+
+@pytest.fixture
+def projected_settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "hash")
+    monkeypatch.setattr(settings, "EMBEDDING_HASH_DIM", 128)
+    monkeypatch.setattr(settings, "EMBEDDING_PROJECTION", "pca")
+    monkeypatch.setattr(settings, "EMBEDDING_PROJECTION_DIM", 32)
+    monkeypatch.setattr(settings, "EMBEDDING_PROJECTION_FIT_MIN", 100)
+    return settings
+
+
+def _docs(start, n):
+    return [f"doc {i} owner mint w{i % 17} fee w{i % 29} burn w{i % 7}" for i in range(start, start + n)]
+
+
+def test_index_fits_pca_once_enough_vectors_exist(projected_settings, tmp_path):
+    path = str(tmp_path / "pca.index")
+    indexer = IndexerService(index_path=path, load_persisted=False)
+    indexer.add_texts(_docs(0, 60), [f"d{i}" for i in range(60)])
+    assert indexer.projection is None and indexer.dim == 128  # too few to fit on yet
+
+    indexer.add_texts(_docs(60, 60), [f"d{i}" for i in range(60, 120)])
+    assert repr(indexer.projection) == "pca-128to32"
+    assert indexer.dim == 32 and indexer.vector_count == 120
+    assert indexer.memory_bytes == 120 * 32 * 4
+    assert indexer.search(_docs(5, 1)[0], k=1)[0][0] == "d5"  # earlier vectors were projected in place
+
+    reloaded = IndexerService(index_path=path)
+    assert repr(reloaded.projection) == "pca-128to32"
+    assert reloaded.search(_docs(77, 1)[0], k=1)[0][0] == "d77"
+
+
+def test_snapshots_carry_their_projection(projected_settings, tmp_path):
+    indexer = IndexerService(index_path=str(tmp_path / "a.index"), load_persisted=False)
+    indexer.add_texts(_docs(0, 150), [f"d{i}" for i in range(150)])
+    manifest = write_snapshot(indexer, str(tmp_path / "snaps"), "projected")
+    assert manifest["projection"] == "pca-128to32" and manifest["dim"] == 32
+
+    projected_settings.EMBEDDING_PROJECTION = "none"  # the snapshot's projection wins over the config
+    plain = IndexerService(index_path=str(tmp_path / "b.index"), load_persisted=False)
+    loaded = load_snapshot(str(tmp_path / "snaps" / "projected"), plain)
+    assert repr(loaded.projection) == "pca-128to32"
+    assert loaded.search(_docs(42, 1)[0], k=1)[0][0] == "d42"
+
+
+class _SearchOnPublish(IndexerService):
+    """Searches the moment a new index is published, as a lock-free reader racing the write could."""
+
+    searched = 0
+
+    @property
+    def faiss_index(self):
+        return self.__dict__.get("faiss_index")
+
+    @faiss_index.setter
+    def faiss_index(self, value):
+        self.__dict__["faiss_index"] = value
+        self._search_now(value)
+
+    @property
+    def vectors(self):
+        return self.__dict__.get("vectors")
+
+    @vectors.setter
+    def vectors(self, value):
+        self.__dict__["vectors"] = value
+        self._search_now(value)
+
+    def _search_now(self, published):
+        if published is not None and self.ids:
+            self.search("owner mint", k=1)
+            self.searched += 1
+
+
+def test_search_racing_the_first_fit_sees_a_consistent_index(projected_settings, tmp_path):
+    indexer = _SearchOnPublish(index_path=str(tmp_path / "race.index"), load_persisted=False)
+    indexer.add_texts(_docs(0, 60), [f"d{i}" for i in range(60)])
+    indexer.add_texts(_docs(60, 60), [f"d{i}" for i in range(60, 120)])  # fits and swaps in the projected index
+    assert indexer.dim == 32 and indexer.searched >= 1
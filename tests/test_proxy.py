@@ -0,0 +1,80 @@
+"""Tests for proxy resolution and the implementation cache."""
+
+import threading
+import time
+
+from app.services.contract_service import ContractService
+
+PROXY = "0x" + "aa" * 20
+IMPL = "0x" + "bb" * 20
+IMPL_V2 = "0x" + "cc" * 20
+
+PROXY_SOURCE = "contract Proxy { fallback() external { /* delegatecall */ } }"
+IMPL_SOURCE = (
+    "contract Impl { address owner; function mint(address to) external {} function setFee(uint f) external {} }"
+)
+
+
+class _FakeEtherscan(ContractService):
+    """Serves canned getsourcecode results with a fixed latency and records calls."""
+
+    def __init__(self, metas, slot=None, latency=0.0):
+        super().__init__()
+        self.metas = metas
+        self.slot = slot
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_source(self, address):
+        with self._lock:
+            self.calls.append(address)
+        time.sleep(self.latency)
+        return dict(self.metas.get(address, {}))
+
+    def _implementation_from_slot(self, address):
+        return self.slot
+
+
+def _proxy_meta(impl):
+    return {"SourceCode": PROXY_SOURCE, "Proxy": "1", "Implementation": impl}
+
+
+def test_etherscan_proxy_fields_analyse_implementation():
+    svc = _FakeEtherscan({PROXY: _proxy_meta(IMPL), IMPL: {"SourceCode": IMPL_SOURCE}})
+    result = svc.analyze_contract(PROXY)
+    impl = result["implementation"]
+    assert impl["address"] == IMPL and impl["source_available"] is True
+    assert {"owner", "owner-mint"} <= {f["pattern"] for f in impl["analysis"]["findings"]}
+    assert result["analysis"]["score"] == impl["analysis"]["score"] > 0
+
+
+def test_eip1967_slot_used_when_etherscan_has_no_proxy_fields():
+    svc = _FakeEtherscan({PROXY: {"SourceCode": PROXY_SOURCE}, IMPL: {"SourceCode": IMPL_SOURCE}}, slot=IMPL)
+    assert svc.analyze_contract(PROXY)["implementation"]["address"] == IMPL
+
+
+def test_cached_implementation_is_fetched_concurrently():
+    svc = _FakeEtherscan({PROXY: _proxy_meta(IMPL), IMPL: {"SourceCode": IMPL_SOURCE}}, latency=0.2)
+    svc.analyze_contract(PROXY)  # cold: proxy, then implementation
+    svc.calls.clear()
+    start = time.monotonic()
+    svc.analyze_contract(PROXY)
+    assert sorted(svc.calls) == sorted([PROXY, IMPL])
+    assert time.monotonic() - start < 0.35  # one round trip, not two
+
+
+def test_upgrade_within_ttl_follows_etherscan():
+    metas = {PROXY: _proxy_meta(IMPL), IMPL: {"SourceCode": IMPL_SOURCE}, IMPL_V2: {"SourceCode": "contract V2 {}"}}
+    svc = _FakeEtherscan(metas)
+    svc.analyze_contract(PROXY)
+    metas[PROXY] = _proxy_meta(IMPL_V2)
+    assert svc.analyze_contract(PROXY)["implementation"]["address"] == IMPL_V2
+
+
+def test_non_proxy_is_negatively_cached():
+    svc = _FakeEtherscan({PROXY: {"SourceCode": IMPL_SOURCE}})
+    first = svc.analyze_contract(PROXY)
+    assert "implementation" not in first
+    svc.slot = IMPL  # would now resolve — but the negative result is still cached
+    assert "implementation" not in svc.analyze_contract(PROXY)
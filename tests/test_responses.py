@@ -0,0 +1,42 @@
+"""Tests for the single-pass JSON response path."""
+
+import json
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse, dump_json
+from app.models.schemas import ContractAnalyzeResponse, JobStatusResponse, RAGQueryResponse
+
+
+def test_output_matches_default_json_response():
+    status = JobStatusResponse(
+        job_id="j1",
+        type="analyze",
+        status="running",
+        priority=0,
+        progress=0.5,
+        attempts=1,
+        created_at=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    )
+    assert json.loads(dump_json(status)) == json.loads(JSONResponse(status.model_dump(mode="json")).body)
+    content = {"query": "ünïcode", "results": [{"doc_id": "a", "score": 0.25}], "nested": [status]}
+    assert FastJSONResponse(content).body == JSONResponse(json.loads(dump_json(content))).body
+
+
+def test_trusted_endpoints_still_match_their_response_models(client):
+    resp = client.get("/api/v1/documents/search", params={"q": "owner drain", "k": 100})
+    assert resp.headers["content-type"] == "application/json"
+    data = resp.json()
+    assert RAGQueryResponse.model_validate(data).model_dump() == data
+    assert data["results"] and all(set(r) == {"doc_id", "score"} for r in data["results"])
+
+    resp = client.get("/api/v1/contracts/analyze", params={"address": "0x" + "12" * 20})
+    data = resp.json()
+    assert ContractAnalyzeResponse.model_validate(data).model_dump() == data
+
+
+def test_errors_use_the_default_response_class(client):
+    resp = client.get("/api/v1/documents/search", params={"q": ""})
+    assert resp.status_code == 422
+    assert resp.json()["error_code"] == "VALIDATION_ERROR"
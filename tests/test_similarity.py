@@ -0,0 +1,142 @@
+"""Tests for MinHash/LSH clone detection and analysis enrichment."""
+
+import json
+
+import numpy as np
+
+from app.repositories.similarity_repository import SimilarityRepository
+from app.services.contract_service import ContractService
+from app.services.known_libraries import KnownLibraries
+from app.services.minhash import LSHIndex, MinHasher, jaccard, shingle_hashes
+from app.services.rpc_client import RPCClient
+from app.services.similarity_service import SimilarityService
+from app.services.source_files import file_hash
+
+HONEYPOT = "\n".join(
+    f"    function drain{i}(address victim, uint256 amount{i}) external onlyOwner {{\n"
+    f'        require(balances[victim] >= amount{i}, "insufficient");\n'
+    f"        balances[victim] -= amount{i};\n"
+    f"        balances[owner] += amount{i} * {i + 3};\n"
+    f"        emit Transfer(victim, owner, amount{i});\n"
+    f"    }}"
+    for i in range(12)
+)
+SCAM = f"// SPDX-License-Identifier: MIT\ncontract HoneyPot {{\n{HONEYPOT}\n}}\n"
+UNRELATED = (
+    "contract Vault {\n"
+    + "\n".join(f"    uint256 public reserve{i}; mapping(address => uint256) deposits{i};" for i in range(40))
+    + "\n}\n"
+)
+
+
+def _similarity(tmp_path, libraries=None):
+    return SimilarityService(SimilarityRepository(str(tmp_path / "similarity.db")), libraries or KnownLibraries())
+
+
+def test_minhash_estimates_jaccard_and_lsh_finds_near_duplicates():
+    rng = np.random.default_rng(0)
+    base = rng.integers(1, 2**63, 4000, dtype=np.uint64)
+    near = np.concatenate([base[:3600], rng.integers(1, 2**63, 400, dtype=np.uint64)])
+    hasher = MinHasher(128)
+    a, b = hasher.signature(shingle_hashes(base, 1)), hasher.signature(shingle_hashes(near, 1))
+    assert abs(jaccard(a, b) - 3600 / 4400) < 0.12
+
+    index = LSHIndex(128, 32)
+    index.add("near", b)
+    for i in range(200):
+        index.add(f"noise{i}", hasher.signature(shingle_hashes(rng.integers(1, 2**63, 500, dtype=np.uint64), 1)))
+    # only bucket-mates are compared, not the whole corpus
+    assert len(index.candidates(a)) < 10
+    assert index.query(a, k=1)[0][0] == "near"
+
+
+def test_copied_scam_is_matched_despite_renames_and_comments(tmp_path):
+    similarity = _similarity(tmp_path)
+    entry = similarity.add("source", "honeypot", SCAM, address="0x" + "AB" * 20)
+    svc = ContractService(cache=None, similarity=similarity)
+
+    copy = "/* totally new token */\n" + SCAM.replace("HoneyPot", "SafeMoonInu").replace("drain3", "claim3")
+    result = svc.analyze_source(copy)
+    assert [m["id"] for m in result["similar"]] == [entry["id"]]
+    assert result["similar"][0]["address"] == "0x" + "ab" * 20
+    assert 0.7 < result["similar"][0]["similarity"] <= 1.0
+    assert "signature" not in result
+    assert svc.analyze_source(UNRELATED)["similar"] == []
+
+
+def test_shared_library_files_do_not_make_contracts_similar(tmp_path):
+    def bundle(main):
+        return json.dumps({"main.sol": {"content": main}, "lib.sol": {"content": SCAM}})
+
+    harvests = (f"    function harvest{i}() external {{ pending[msg.sender] = 0; }}" for i in range(30))
+    other = "contract Farm {\n" + "\n".join(harvests) + "\n}\n"
+    libraries = KnownLibraries({file_hash(SCAM): "vendored:HoneyPot.sol"})
+    similarity = _similarity(tmp_path, libraries)
+    similarity.add("source", "vault", bundle(UNRELATED))
+    svc = ContractService(cache=None, libraries=libraries, similarity=similarity)
+    result = svc.analyze_source(bundle(other))
+    assert result["files_skipped"] == ["lib.sol"]
+    assert result["similar"] == []
+
+
+def test_cache_hit_reuses_stored_signature(tmp_path, monkeypatch):
+    from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+    from app.services.analysis_cache import AnalysisCache
+
+    similarity = _similarity(tmp_path)
+    svc = ContractService(
+        cache=AnalysisCache("v1", AnalysisCacheRepository(str(tmp_path / "analysis.db"))), similarity=similarity
+    )
+    svc.analyze_source(SCAM)
+    entry = similarity.add("source", "honeypot", SCAM)
+
+    def fail(_):
+        raise AssertionError("cache hit re-shingled the source")
+
+    monkeypatch.setattr(similarity, "source_signature", fail)
+    hit = svc.analyze_source(SCAM)
+    assert hit["cached"] is True
+    assert hit["similar"][0]["id"] == entry["id"] and hit["similar"][0]["similarity"] == 1.0
+
+
+def test_other_workers_pick_up_corpus_changes(tmp_path):
+    mine, theirs = _similarity(tmp_path), _similarity(tmp_path)
+    theirs._refresh_every = 0
+    sig = theirs.source_signature([SCAM.lower()])
+    assert theirs.match("source", sig) == []
+
+    entry = mine.add("source", "honeypot", SCAM)
+    assert [m["id"] for m in theirs.match("source", sig)] == [entry["id"]]
+    mine.remove(entry["id"])
+    assert theirs.match("source", sig) == []
+
+
+def test_bytecode_clone_of_implementation_is_reported(tmp_path, node):
+    body = bytes.fromhex("60003560e01c" + "8063a9059cbb14610100578063095ea7b314610200575b")
+    scam_code = body * 20 + bytes.fromhex("00")
+    proxy, impl = "0x" + "77" * 20, "0x" + "88" * 20
+    node.code[proxy] = bytes.fromhex("363d3d373d3d3d363d73" + impl[2:] + "5af43d82803e903d91602b57fd5bf3")
+    # same opcodes, different embedded constants
+    node.code[impl] = scam_code.replace(bytes.fromhex("a9059cbb"), bytes.fromhex("deadbeef"))
+
+    similarity = _similarity(tmp_path)
+    entry = similarity.add("bytecode", "drainer", "0x" + scam_code.hex())
+    svc = ContractService(cache=None, rpc=RPCClient(node.url), similarity=similarity)
+    result = svc.analyze_bytecode(proxy)
+    assert [(m["id"], m["similarity"]) for m in result["similar"]] == [(entry["id"], 1.0)]
+
+
+def test_admin_corpus_endpoints(client, admin_headers):
+    resp = client.post("/api/v1/admin/similarity", json={"label": "honeypot", "content": SCAM}, headers=admin_headers)
+    assert resp.status_code == 201
+    entry_id = resp.json()["id"]
+    listed = client.get("/api/v1/admin/similarity", headers=admin_headers).json()
+    assert entry_id in [c["id"] for c in listed["contracts"]]
+    assert (
+        client.post(
+            "/api/v1/admin/similarity", json={"label": "empty", "content": "// nothing"}, headers=admin_headers
+        ).status_code
+        == 422
+    )
+    assert client.delete(f"/api/v1/admin/similarity/{entry_id}", headers=admin_headers).status_code == 204
+    assert client.delete(f"/api/v1/admin/similarity/{entry_id}", headers=admin_headers).status_code == 404
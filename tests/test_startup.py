@@ -0,0 +1,46 @@
+"""Tests for lazy imports and background index warm-up."""
+
+import os
+import subprocess
+import sys
+
+
+def test_indexer_module_import_is_lazy():
+    code = (
+        "import sys, app.services.indexer_service; "
+        "print(any(m in sys.modules for m in ('faiss', 'sentence_transformers', 'openai')))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_search_returns_503_while_warming(client):
+    app = client.app
+    indexer = app.state.indexer
+    app.state.indexer = None
+    try:
+        resp = client.get("/api/v1/documents/search", params={"q": "owner"})
+    finally:
+        app.state.indexer = indexer
+        # a monitor round in that window saw a finished warm-up without an index, i.e. "down"
+        app.state.health.run_check("indexer")
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "5"
+    assert resp.json()["error_code"] == "SERVICE_UNAVAILABLE"
+
+
+def test_readiness_ok_after_warmup(client):
+    resp = client.get("/api/v1/readiness")
+    assert resp.status_code == 200
+    indexer_check = next(c for c in resp.json()["checks"] if c["name"] == "indexer")
+    assert indexer_check["status"] == "ok"
+
+
+def test_app_import_opens_no_contract_stores(tmp_path):
+    env = {
+        "ANALYSIS_CACHE_DB_PATH": str(tmp_path / "cache.db"),
+        "SIMILARITY_DB_PATH": str(tmp_path / "similarity.db"),
+    }
+    code = "import app.main"
+    subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, **env})
+    assert not any(tmp_path.iterdir())  # the contract service is built in lifespan, not at import
@@ -0,0 +1,55 @@
+"""Tests for per-request spans, Server-Timing and slow-request capture."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import tracing
+from app.core.config import get_settings
+from app.core.tracing import TRACE_CTX, Trace, carry_context, span
+
+
+def _record(name: str) -> None:
+    with span(name):
+        pass
+
+
+def test_spans_nest_across_threads():
+    trace = Trace("rid", "GET", "/x")
+
+    async def request():
+        TRACE_CTX.set(trace)
+        with span("outer"):
+            await asyncio.to_thread(_record, "in_thread")
+            with ThreadPoolExecutor(1) as pool:
+                pool.submit(carry_context(_record), "in_pool").result()
+
+    asyncio.run(request())
+    with span("no_request"):  # outside a request nothing is recorded
+        pass
+    (outer,) = trace.tree()
+    assert outer["name"] == "outer" and outer["duration_ms"] >= 0
+    assert [c["name"] for c in outer["children"]] == ["in_thread", "in_pool"]
+    timing = trace.server_timing(12.5)
+    assert timing.startswith("outer;dur=") and "in_pool;dur=" in timing and timing.endswith("total;dur=12.50")
+
+
+def test_server_timing_breaks_down_search(client):
+    resp = client.get("/api/v1/documents/search", params={"q": "timing breakdown"})
+    assert resp.status_code == 200
+    names = [part.split(";")[0] for part in resp.headers["server-timing"].split(", ")]
+    for name in ("rate_limit", "index_search", "embed", "serialize", "total"):
+        assert name in names
+
+
+def test_slow_requests_keep_their_span_tree(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "TRACE_SLOW_MS", 0.0)
+    tracing.clear_slow_requests()
+    resp = client.get("/api/v1/documents/search", params={"q": "slow capture"}, headers={"X-Request-ID": "slow-1"})
+    assert resp.status_code == 200
+
+    resp = client.get("/api/v1/admin/traces/slow", headers=admin_headers)
+    assert resp.status_code == 200
+    captured = next(r for r in resp.json()["requests"] if r["request_id"] == "slow-1")
+    assert captured["path"] == "/api/v1/documents/search" and captured["status"] == 200
+    search = next(s for s in captured["spans"] if s["name"] == "index_search")
+    assert "embed" in [c["name"] for c in search["children"]]
@@ -0,0 +1,75 @@
+"""Tests for API-key usage metering and monthly quotas."""
+
+from datetime import datetime, timezone
+
+from app.core.pagination import encode_cursor
+from app.core.usage import UsageMeter, period_end, period_of
+from app.repositories.apikey_repository import APIKeyRepository
+
+MAY = datetime(2024, 5, 31, 23, 59, tzinfo=timezone.utc).timestamp()
+JUNE = datetime(2024, 6, 1, 0, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_counts_are_written_behind_and_shared_between_workers(tmp_path):
+    repo = APIKeyRepository(str(tmp_path / "keys.db"))
+    key = repo.create("metered", monthly_quota=5)["key"]
+    first, second = UsageMeter(repo), UsageMeter(repo)
+
+    assert all(first.record(key, MAY) for _ in range(3))
+    assert repo.usage_of(key) == []  # nothing written on the request path
+    assert first.flush() == 1
+    assert repo.usage_of(key)[0]["requests"] == 3
+
+    # a second worker starts from the flushed total and stops at the quota
+    assert [second.record(key, MAY) for _ in range(3)] == [True, True, False]
+    second.flush()
+    assert repo.usage_of(key)[0]["requests"] == 5
+    first.flush()  # refresh picks up the other worker's counts
+    assert first.record(key, MAY) is False
+
+
+def test_quota_resets_with_the_month(tmp_path):
+    repo = APIKeyRepository(str(tmp_path / "keys.db"))
+    key = repo.create("monthly", monthly_quota=1)["key"]
+    meter = UsageMeter(repo)
+
+    assert meter.record(key, MAY) is True
+    assert meter.record(key, MAY) is False
+    assert meter.retry_after(MAY) == 60
+    assert meter.record(key, JUNE) is True
+    meter.flush()
+    assert [(r["period"], r["requests"]) for r in repo.usage_of(key)] == [("2024-06", 1), ("2024-05", 1)]
+    assert period_of(MAY) == "2024-05" and period_end(MAY) == datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_quota_enforced_and_reported(client, admin_headers):
+    resp = client.post("/api/v1/admin/keys", json={"name": "quota", "monthly_quota": 2}, headers=admin_headers)
+    assert resp.json()["monthly_quota"] == 2
+    key = resp.json()["key"]
+    user = {"X-API-Key": key}
+
+    assert [client.get("/api/v1/documents/", headers=user).status_code for _ in range(2)] == [200, 200]
+    resp = client.get("/api/v1/documents/", headers=user)
+    assert resp.status_code == 429
+    assert resp.json()["error_code"] == "QUOTA_EXCEEDED"
+    assert int(resp.headers["Retry-After"]) > 0
+
+    usage = client.get(f"/api/v1/admin/keys/{key}/usage", headers=admin_headers).json()
+    assert usage["monthly_quota"] == 2
+    assert usage["periods"][0]["requests"] == 2 and usage["periods"][0]["remaining"] == 0
+
+    # keys sort after their prefix's predecessor, so a cursor just before this key lands on it
+    params = {"limit": 1, "cursor": encode_cursor(key[:-1])}
+    report = client.get("/api/v1/admin/usage", params=params, headers=admin_headers).json()
+    assert [(u["key"], u["requests"]) for u in report["usage"]] == [(key, 2)]
+
+    resp = client.put(f"/api/v1/admin/keys/{key}/quota", json={"monthly_quota": 0}, headers=admin_headers)
+    assert resp.status_code == 200 and resp.json()["monthly_quota"] == 0
+    assert client.get("/api/v1/documents/", headers=user).status_code == 200
+
+
+def test_usage_of_unknown_key_is_404(client, admin_headers):
+    assert client.get("/api/v1/admin/keys/no-such-key/usage", headers=admin_headers).status_code == 404
+    resp = client.put("/api/v1/admin/keys/no-such-key/quota", json={"monthly_quota": 1}, headers=admin_headers)
+    assert resp.status_code == 404
+    assert client.get("/api/v1/admin/usage", params={"period": "2024-13"}, headers=admin_headers).status_code == 422
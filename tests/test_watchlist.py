@@ -0,0 +1,182 @@
+"""Tests for the watchlist API and its change-detecting scheduler."""
+
+import time
+
+from app.core.config import get_settings
+from app.core.security import key_owner
+from app.repositories.watchlist_repository import WatchlistRepository
+from app.services.bytecode import EIP1967_IMPLEMENTATION_SLOT
+from app.services.contract_service import ContractService
+from app.services.rpc_client import RPCClient
+from app.services.watchlist_service import TokenBucket, WatchlistScheduler
+
+TOKEN = "0x" + "44" * 20
+OTHER = "0x" + "55" * 20
+IMPL = "0x" + "66" * 20
+
+
+class _CountingService(ContractService):
+    """Real RPC fingerprinting; analysis returns a settable score and is counted."""
+
+    def __init__(self, node):
+        super().__init__(rpc=RPCClient(node.url))
+        self.score = 10
+        self.analyzed = []
+
+    def fetch_source(self, address):
+        return {}
+
+    def analyze_contract(self, address):
+        self.analyzed.append(address)
+        return {"address": address, "source_available": False, "analysis": {"score": self.score}}
+
+
+def _scheduler(tmp_path, node, rate=100.0):
+    repo = WatchlistRepository(str(tmp_path / "watchlist.db"))
+    service = _CountingService(node)
+    return repo, service, WatchlistScheduler(service, repo, TokenBucket(rate, 50))
+
+
+def test_watchlist_crud_is_scoped_by_key(client, admin_headers):
+    resp = client.post(
+        "/api/v1/watchlist",
+        json={"address": TOKEN.upper().replace("0X", "0x"), "label": "token"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 201
+    assert resp.json()["address"] == TOKEN and resp.json()["interval_s"] == get_settings().WATCHLIST_DEFAULT_INTERVAL
+    assert (
+        client.post("/api/v1/watchlist", json={"address": OTHER, "interval_s": 1}, headers=admin_headers).status_code
+        == 422
+    )
+
+    user = {
+        "X-API-Key": client.post("/api/v1/admin/keys", json={"name": "watch-test"}, headers=admin_headers).json()["key"]
+    }
+    assert client.get("/api/v1/watchlist", headers=user).json()["entries"] == []
+    assert client.delete(f"/api/v1/watchlist/{TOKEN}", headers=user).status_code == 404
+
+    addresses = [e["address"] for e in client.get("/api/v1/watchlist", headers=admin_headers).json()["entries"]]
+    assert TOKEN in addresses
+    assert client.delete(f"/api/v1/watchlist/{TOKEN}", headers=admin_headers).status_code == 204
+
+
+def test_unchanged_contracts_skip_reanalysis(tmp_path, node):
+    repo, service, scheduler = _scheduler(tmp_path, node)
+    node.code[TOKEN] = b"\x60\x80"
+    repo.add("alice", TOKEN, None, 3600)
+
+    now = time.time()
+    assert scheduler.run_once(now) == {"checked": 1, "analyzed": 1, "events": 0}
+    (entry,) = repo.list_for("alice")
+    assert entry["last_score"] == 10
+    assert now + 3600 * 0.8 <= entry["next_check_at"] <= now + 3600 * 1.2
+
+    # not due yet, then due but unchanged: fingerprinted, not analysed
+    assert scheduler.run_once(now + 1)["checked"] == 0
+    assert scheduler.run_once(now + 10_000) == {"checked": 1, "analyzed": 0, "events": 0}
+    assert service.analyzed == [TOKEN]
+
+
+def test_upgrade_triggers_analysis_event_and_webhook(tmp_path, node, json_server, monkeypatch):
+    delivered = []
+    monkeypatch.setattr(
+        get_settings(), "WATCHLIST_WEBHOOK_URL", json_server(lambda body: delivered.extend(body["events"]))
+    )
+    repo, service, scheduler = _scheduler(tmp_path, node)
+    node.code[TOKEN] = b"\x60\x80"
+    repo.add("alice", TOKEN, None, 3600)
+    repo.add("bob", TOKEN, None, 3600)
+    now = time.time()
+    scheduler.run_once(now)
+
+    node.storage[(TOKEN, EIP1967_IMPLEMENTATION_SLOT)] = "0x" + "00" * 12 + IMPL[2:]
+    service.score = 40
+    # both owners' entries share one fingerprint batch and one analysis
+    requests_before = len(node.requests)
+    assert scheduler.run_once(now + 10_000) == {"checked": 2, "analyzed": 1, "events": 2}
+    assert len(node.requests) == requests_before + 1
+
+    events = repo.events_for("alice")
+    assert [(e["old_score"], e["new_score"], e["changes"]) for e in events] == [(10, 40, ["implementation"])]
+    assert sorted(e["owner"] for e in delivered) == ["alice", "bob"]
+    assert repo.undelivered() == []
+
+
+def test_fingerprints_are_compared_per_entry(tmp_path, node):
+    repo, service, scheduler = _scheduler(tmp_path, node)
+    node.code[TOKEN] = b"\x60\x80"
+    repo.add("alice", TOKEN, None, 3600)
+    now = time.time()
+    scheduler.run_once(now)
+
+    # bob starts watching an unchanged contract: his entry still needs its first analysis, alice's does not
+    service.score = 40
+    repo.add("bob", TOKEN, None, 3600)
+    assert scheduler.run_once(now + 10_000) == {"checked": 2, "analyzed": 1, "events": 0}
+    assert {e["owner"]: e["last_score"] for e in repo.list_for("alice") + repo.list_for("bob")} == {
+        "alice": 10,
+        "bob": 40,
+    }
+
+
+def test_rate_budget_limits_checks_per_tick(tmp_path, node):
+    clock = [0.0]
+    repo = WatchlistRepository(str(tmp_path / "watchlist.db"))
+    scheduler = WatchlistScheduler(_CountingService(node), repo, TokenBucket(1.0, 3, clock=lambda: clock[0]))
+    for i in range(10):
+        repo.add("alice", "0x" + f"{i:02x}" * 20, None, 3600)
+
+    now = time.time()
+    assert scheduler.run_once(now)["checked"] == 3
+    assert scheduler.run_once(now)["checked"] == 0
+    clock[0] += 2
+    assert scheduler.run_once(now)["checked"] == 2
+
+
+def test_events_endpoint_pages_by_id(client, admin_headers):
+    repo = WatchlistRepository()
+    owner = key_owner(admin_headers["X-API-Key"])
+    first = repo.add_event(owner, OTHER, 10, 20, ["code_hash"])
+    repo.add_event(owner, OTHER, 20, 30, ["verified"])
+
+    page = client.get(f"/api/v1/watchlist/events?after={first['id'] - 1}&limit=1", headers=admin_headers).json()
+    assert [e["new_score"] for e in page["events"]] == [20]
+    page = client.get(f"/api/v1/watchlist/events?after={page['next_after']}", headers=admin_headers).json()
+    assert [e["changes"] for e in page["events"]] == [["verified"]]
+
+
+def test_each_event_is_posted_by_one_worker(tmp_path, node, json_server, monkeypatch):
+    posted = []
+    other = []
+
+    def webhook(body):
+        posted.extend(e["id"] for e in body["events"])
+        if len(posted) == 1:
+            other[0]._deliver(url, time.time())  # a second worker's tick while the first POST is in flight
+        return {}
+
+    url = json_server(webhook)
+    monkeypatch.setattr(get_settings(), "WATCHLIST_WEBHOOK_URL", url)
+    repo, _, scheduler = _scheduler(tmp_path, node)
+    other.append(_scheduler(tmp_path, node)[2])
+    repo.add_event("alice", TOKEN, 10, 40, ["implementation"])
+    scheduler.run_once(time.time())
+    assert len(posted) == 1
+    assert repo.undelivered() == []
+
+
+def test_analysis_without_a_score_is_retried(tmp_path, node):
+    repo, service, scheduler = _scheduler(tmp_path, node)
+    node.code[TOKEN] = b"\x60\x80"
+    repo.add("alice", TOKEN, None, 3600)
+    service.score = None  # an error payload, e.g. the analysis itself failed
+
+    now = time.time()
+    assert scheduler.run_once(now)["analyzed"] == 1
+    assert repo.list_for("alice")[0]["fingerprint"] is None  # the change is not treated as seen
+
+    service.score = 10
+    assert scheduler.run_once(now + 10_000)["analyzed"] == 1
+    (entry,) = repo.list_for("alice")
+    assert entry["last_score"] == 10 and entry["fingerprint"] is not None